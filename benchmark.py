@@ -0,0 +1,1040 @@
+#!/usr/bin/env python3
+"""
+ClickFix Wiki Build Benchmarks
+Measures build performance against the real or an enlarged technique corpus
+"""
+
+import os
+import sys
+import json
+import pickle
+import time
+import resource
+import subprocess
+import shutil
+import argparse
+import tempfile
+import contextlib
+import filecmp
+import platform
+import random
+import datetime
+import tracemalloc
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, List, Any
+
+import yaml
+from build import ClickFixWikiBuilder
+from src.cache import ParseCache, SafeLoader
+from src.manifest import BuildManifest
+from src.output import OutputWriter
+from src.pages import PageProcessor
+from src.search import search_record, build_facets
+from src.synthetic import generate_corpus, generate_technique
+from src.fulltext import FullTextIndexer, FullTextIndex
+from src.watcher import InotifyWatcher, create_watcher, wait_for_changes
+from src.devserver import DevSite, create_dev_server
+from src.compress import compressed_formats
+from src.utils import get_markdown_stats, configure_markdown_cache
+from src.models import load_technique, summarize_entry
+from src.validation import VALIDATION_VERSION, validate_files
+from src.pack import TechniquePack
+from src.cache import load_yaml
+from src.publish import DeltaDeployer, git
+from src.daemon import request
+
+SUITE_FORMAT_VERSION = 3
+# The phases build_site records in its profiler
+PHASES = ['setup', 'load', 'entries', 'pages', 'index', 'search', 'assets', 'precompress', 'cleanup', 'verify']
+
+def replicate_corpus(source_dir: Path, target_dir: Path, copies: int) -> int:
+    """Copy every parseable technique file `copies` times under distinct ids"""
+    target_dir.mkdir(parents=True, exist_ok=True)
+    count = 0
+    for yaml_file in sorted(source_dir.glob("*.yml")):
+        try:
+            with open(yaml_file, 'rb') as f:
+                yaml.load(f, Loader=SafeLoader)
+        except yaml.YAMLError:
+            continue
+        for i in range(copies):
+            shutil.copy(yaml_file, target_dir / f"{yaml_file.stem}-{i}.yml")
+            count += 1
+    return count
+
+def timed_build(techniques_dir: Path, output_dir: Path, **options) -> float:
+    """Run a full build with console output suppressed and return the elapsed seconds"""
+    start = time.perf_counter()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        builder = ClickFixWikiBuilder(techniques_dir=techniques_dir, output_dir=output_dir,
+                                      cache_dir=output_dir.with_name(output_dir.name + "-cache"))
+        builder.build_site(**options)
+    return time.perf_counter() - start
+
+def trees_identical(left: Path, right: Path) -> bool:
+    """Compare two output trees byte for byte"""
+    comparison = filecmp.dircmp(left, right)
+    pending = [comparison]
+    while pending:
+        current = pending.pop()
+        if current.left_only or current.right_only or current.funny_files:
+            return False
+        _, mismatch, errors = filecmp.cmpfiles(current.left, current.right, current.common_files, shallow=False)
+        if mismatch or errors:
+            return False
+        pending.extend(current.subdirs.values())
+    return True
+
+def bench_parallel(args: argparse.Namespace) -> int:
+    """Compare serial and process-pool rendering of the same corpus"""
+    jobs = args.jobs or os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        techniques_dir = tmp_path / "techniques"
+        count = replicate_corpus(Path("techniques"), techniques_dir, args.copies)
+        print(f"Corpus: {count} technique files")
+
+        serial = timed_build(techniques_dir, tmp_path / "serial", jobs=1)
+        print(f"Serial build:        {serial:.2f}s")
+        parallel = timed_build(techniques_dir, tmp_path / "parallel", jobs=jobs)
+        print(f"Parallel build (-j{jobs}): {parallel:.2f}s  speedup {serial / parallel:.2f}x")
+
+        if not trees_identical(tmp_path / "serial", tmp_path / "parallel"):
+            print("❌ Parallel output differs from serial output")
+            return 1
+        print("✅ Parallel output is byte-identical to serial output")
+    return 0
+
+def bench_parse_cache(args: argparse.Namespace) -> int:
+    """Compare uncached, cold-cache and warm-cache corpus loading"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        techniques_dir = tmp_path / "techniques"
+        count = replicate_corpus(Path("techniques"), techniques_dir, args.copies)
+        yaml_files = sorted(techniques_dir.glob("*.yml"))
+        print(f"Corpus: {count} technique files (loader: {SafeLoader.__name__})")
+
+        start = time.perf_counter()
+        for yaml_file in yaml_files:
+            with open(yaml_file, 'r', encoding='utf-8') as f:
+                yaml.safe_load(f)
+        uncached = time.perf_counter() - start
+        print(f"yaml.safe_load (no cache): {uncached * 1000:8.1f} ms")
+
+        cache_path = tmp_path / "techniques.pickle"
+        for label in ("cold cache", "warm cache"):
+            start = time.perf_counter()
+            cache = ParseCache(cache_path)
+            for yaml_file in yaml_files:
+                cache.get(yaml_file)
+            cache.prune(yaml_files)
+            cache.save()
+            elapsed = time.perf_counter() - start
+            print(f"{label + ':':26}{elapsed * 1000:8.1f} ms  "
+                  f"({cache.hits} hits, {cache.misses} misses, {uncached / elapsed:.1f}x)")
+    return 0
+
+def bench_pages(args: argparse.Namespace) -> int:
+    """Count Markdown conversions done by PageProcessor over a simulated build"""
+    processor = PageProcessor(Path("pages"))
+    before = get_markdown_stats()['conversions']
+    start = time.perf_counter()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        pages = processor.get_all_pages()
+        processor.get_navigation_html()
+        for _ in range(args.entries):
+            processor.get_navigation_html_relative()
+        for page in pages:
+            processor.generate_page_html(page)
+    elapsed = time.perf_counter() - start
+    conversions = get_markdown_stats()['conversions'] - before
+
+    print(f"Pages: {len(pages)}, simulated entry pages: {args.entries}")
+    print(f"Markdown conversions: {conversions} in {elapsed * 1000:.1f} ms")
+    if conversions != len(pages):
+        print("❌ Pages were rendered more than once")
+        return 1
+    print("✅ Each page was rendered exactly once")
+    return 0
+
+def bench_markdown(args: argparse.Namespace) -> int:
+    """Render every entry page with and without the Markdown fragment cache"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        techniques_dir = tmp_path / "techniques"
+        replicate_corpus(Path("techniques"), techniques_dir, args.copies)
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            builder = ClickFixWikiBuilder(techniques_dir=techniques_dir, output_dir=tmp_path / "site",
+                                          cache_dir=tmp_path / "cache")
+            entries = builder.get_all_entries()
+        print(f"Corpus: {len(entries)} entries")
+
+        results = {}
+        for label, max_bytes in (("uncached", 0), ("cached", args.max_bytes)):
+            cache = configure_markdown_cache(max_bytes)
+            start = time.perf_counter()
+            results[label] = [builder.generate_entry_page(entry) for entry in entries]
+            elapsed = time.perf_counter() - start
+            print(f"{label + ':':10}{elapsed * 1000:8.1f} ms  "
+                  f"({cache.hits} hits, {cache.misses} misses, {cache.evictions} evictions, "
+                  f"{cache.size / 1024:.0f} KiB)")
+
+    if results["uncached"] != results["cached"]:
+        print("❌ Cached output differs from uncached output")
+        return 1
+    print("✅ Cached output is identical to uncached output")
+    return 0
+
+def measure(render) -> tuple:
+    """Run render() and return (seconds, peak traced bytes allocated during it)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    render()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+def bench_streaming(args: argparse.Namespace) -> int:
+    """Compare materialized and streamed page output on a synthetic corpus"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        generate_corpus(tmp_path / "techniques", args.size, seed=args.seed)
+        output_dir = tmp_path / "site"
+        (output_dir / "pages").mkdir(parents=True)
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            builder = ClickFixWikiBuilder(techniques_dir=tmp_path / "techniques", output_dir=output_dir,
+                                          cache_dir=tmp_path / "cache")
+            entries = builder.get_all_entries()
+            builder.page_processor.get_all_pages()
+        print(f"Corpus: {len(entries)} synthetic entries")
+        # Both index variants get the same summaries and facets: only how the page reaches the file differs
+        summaries = [summarize_entry(entry) for entry in entries]
+        facets = build_facets([search_record(entry) for entry in entries])
+
+        def materialized_index():
+            html = "".join(builder.stream_index_html(summaries, facets))
+            with open(output_dir / "index.html", 'w', encoding='utf-8') as f:
+                f.write(html)
+
+        def streamed_index():
+            with open(output_dir / "index.html", 'w', encoding='utf-8') as f:
+                f.writelines(builder.stream_index_html(summaries, facets))
+
+        def materialized_entries():
+            for entry in entries:
+                html = builder.generate_entry_page(entry)
+                with open(output_dir / "pages" / f"{entry.id}.html", 'w', encoding='utf-8') as f:
+                    f.write(html)
+
+        def streamed_entries():
+            for entry in entries:
+                with open(output_dir / "pages" / f"{entry.id}.html", 'w', encoding='utf-8') as f:
+                    f.writelines(builder.stream_entry_page(entry))
+
+        # Warm the template and Markdown caches so both modes do the same work
+        materialized_entries()
+        for label, render in (("index (materialized)", materialized_index),
+                              ("index (streamed)", streamed_index),
+                              ("entries (materialized)", materialized_entries),
+                              ("entries (streamed)", streamed_entries)):
+            elapsed, peak = measure(render)
+            print(f"{label + ':':26}{elapsed * 1000:9.1f} ms  peak {peak / 1024 / 1024:7.2f} MiB")
+    return 0
+
+def bench_build_once(args: argparse.Namespace) -> int:
+    """Run one build in this process and print its peak RSS as JSON (used by the memory benchmark)"""
+    elapsed = timed_build(args.techniques, args.output, streaming=args.streaming)
+    # ru_maxrss is reported in KiB on Linux
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    print(json.dumps({'seconds': elapsed, 'peak_rss': peak_rss}))
+    return 0
+
+def bench_memory(args: argparse.Namespace) -> int:
+    """Peak RSS of full and streaming builds as the synthetic corpus grows"""
+    sizes = [int(size) for size in args.sizes.split(",")]
+    print(f"{'size':>8} {'mode':>10} {'seconds':>9} {'peak RSS':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        for size in sizes:
+            techniques_dir = tmp_path / f"techniques-{size}"
+            generate_corpus(techniques_dir, size, seed=args.seed)
+            for mode in ("full", "streaming"):
+                command = [sys.executable, __file__, "build-once", "--techniques", str(techniques_dir),
+                           "--output", str(tmp_path / f"site-{size}-{mode}")]
+                if mode == "streaming":
+                    command.append("--streaming")
+                result = subprocess.run(command, check=True, capture_output=True, text=True)
+                stats = json.loads(result.stdout.strip().splitlines()[-1])
+                print(f"{size:>8} {mode:>10} {stats['seconds']:>9.2f} {stats['peak_rss'] / 1024 / 1024:>7.1f} MiB")
+            shutil.rmtree(techniques_dir)
+    return 0
+
+class DomCounter(HTMLParser):
+    """Count the element nodes a browser would create for a document"""
+
+    def __init__(self):
+        super().__init__()
+        self.elements = 0
+
+    def handle_starttag(self, tag, attrs):
+        self.elements += 1
+
+def count_dom_nodes(html_path: Path) -> int:
+    """Number of elements in an HTML file"""
+    counter = DomCounter()
+    with open(html_path, 'r', encoding='utf-8') as f:
+        counter.feed(f.read())
+    counter.close()
+    return counter.elements
+
+def bench_index(args: argparse.Namespace) -> int:
+    """HTML bytes and DOM nodes of the single-page index vs the paginated index"""
+    sizes = [int(size) for size in args.sizes.split(",")]
+    print(f"{'size':>8} {'mode':>12} {'index bytes':>12} {'DOM nodes':>10} {'pages':>6} {'shard bytes':>12} {'ms':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        for size in sizes:
+            techniques_dir = tmp_path / f"techniques-{size}"
+            generate_corpus(techniques_dir, size, seed=args.seed)
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                builder = ClickFixWikiBuilder(techniques_dir=techniques_dir, output_dir=tmp_path / "site",
+                                              cache_dir=tmp_path / "cache", quiet=True)
+                entries = builder.get_all_entries()
+            summaries = [summarize_entry(entry) for entry in entries]
+            facets = build_facets([search_record(entry) for entry in entries])
+
+            for mode, page_size in (("full", 0), (f"paged/{args.page_size}", args.page_size)):
+                output_dir = tmp_path / f"site-{size}-{page_size}"
+                output_dir.mkdir()
+                builder.output_dir = output_dir
+                builder.writer = OutputWriter(output_dir)
+                manifest = BuildManifest(tmp_path / f"manifest-{size}-{page_size}.json", output_dir)
+                start = time.perf_counter()
+                if page_size:
+                    pages = builder.write_index_pages(manifest, summaries, facets, page_size, "")
+                else:
+                    pages = 1
+                    builder.write_html(manifest, "index.html", builder.stream_index_html(summaries, facets))
+                elapsed = time.perf_counter() - start
+                index_path = output_dir / "index.html"
+                shard_bytes = sum(path.stat().st_size for path in output_dir.glob("cards/*.json"))
+                print(f"{size:>8} {mode:>12} {index_path.stat().st_size:>12,} {count_dom_nodes(index_path):>10,} "
+                      f"{pages:>6} {shard_bytes:>12,} {elapsed * 1000:>8.1f}")
+            shutil.rmtree(techniques_dir)
+    return 0
+
+FULLTEXT_QUERIES = ["press", "graphics driver", "verify human", "paste configuration", "activ",
+                    "win", "explorer", "tool000123", "refresh automatic", "powershell mshta",
+                    "ctrl", "confirm identity", "group policy", "logs corrupted", "enter submit"]
+
+def bench_fulltext(args: argparse.Namespace) -> int:
+    """Full-text index build time, size and query latency over a synthetic lure corpus"""
+    rng = random.Random(args.seed)
+    indexer = FullTextIndexer(Path(os.devnull))
+    ids = []
+    lures = 0
+    start = time.perf_counter()
+    while lures < args.lures:
+        technique = generate_technique(rng, len(ids))
+        entry = load_technique(technique, technique['name'])
+        ids.append(entry.id)
+        indexer.add(entry)
+        lures += entry.lure_count
+    shards = {key: data for key, (_, data) in indexer.outputs().items()}
+    print(f"Corpus: {len(ids)} tools, {sum(shards['docs']['counts'])} lures "
+          f"(terms extracted and sharded in {time.perf_counter() - start:.2f}s)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        site_dir = Path(tmp)
+        (site_dir / "search").mkdir()
+        with open(site_dir / "search-index.json", 'w', encoding='utf-8') as f:
+            json.dump({'ids': ids}, f)
+        total_bytes = 0
+        for key, shard in shards.items():
+            shard_path = site_dir / "search" / f"{key}.json"
+            with open(shard_path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps(shard, separators=(',', ':')))
+            total_bytes += shard_path.stat().st_size
+        print(f"Index: {len(shards) - 1} shards + docs.json, {total_bytes / 1024 / 1024:.1f} MiB")
+
+        # cold: shard files not read yet; decode: shards parsed but postings not decoded;
+        # cached: the postings of every query term are already decoded
+        index = FullTextIndex(site_dir)
+        print(f"{'query':>22} {'results':>8} {'cold ms':>9} {'decode ms':>10} {'cached ms':>10}")
+        columns = {'decode': [], 'cached': []}
+        for query in FULLTEXT_QUERIES:
+            start = time.perf_counter()
+            results = index.search(query)
+            cold = time.perf_counter() - start
+            runs = {'decode': [], 'cached': []}
+            for _ in range(args.repeat):
+                index.postings.clear()
+                for column in ('decode', 'cached'):
+                    start = time.perf_counter()
+                    index.search(query)
+                    runs[column].append(time.perf_counter() - start)
+            medians = {column: sorted(times)[len(times) // 2] for column, times in runs.items()}
+            for column, median in medians.items():
+                columns[column].append(median)
+            print(f"{query:>22} {len(results):>8} {cold * 1000:>9.2f} {medians['decode'] * 1000:>10.2f} "
+                  f"{medians['cached'] * 1000:>10.2f}")
+        for column, times in columns.items():
+            times.sort()
+            print(f"{column.capitalize()} query latency: p50 {times[len(times) // 2] * 1000:.2f} ms, "
+                  f"max {times[-1] * 1000:.2f} ms")
+    return 0
+
+def edit_technique(path: Path, marker: str) -> None:
+    """Prefix the first lure nickname in a technique file with marker"""
+    text = path.read_text(encoding='utf-8')
+    path.write_text(text.replace("nickname: ", f"nickname: {marker} ", 1), encoding='utf-8')
+
+def bench_watch(args: argparse.Namespace) -> int:
+    """Edit-to-output latency of the dev.py watcher (warm builder) vs a cold subprocess rebuild"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        techniques_dir = tmp_path / "techniques"
+        paths = generate_corpus(techniques_dir, args.size, seed=args.seed)
+        output_dir = tmp_path / "site"
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            builder = ClickFixWikiBuilder(techniques_dir=techniques_dir, output_dir=output_dir,
+                                          cache_dir=tmp_path / "cache", quiet=True)
+            builder.build_site()
+        print(f"Corpus: {args.size} synthetic techniques, {args.edits} edits per mode")
+
+        start = time.perf_counter()
+        subprocess.run([sys.executable, __file__, "build-once", "--techniques", str(techniques_dir),
+                        "--output", str(tmp_path / "cold")], check=True, capture_output=True)
+        print(f"{'subprocess':>10}: {(time.perf_counter() - start) * 1000:8.1f} ms  (python build.py, as before)")
+
+        rng = random.Random(args.seed)
+        for mode in ("inotify", "polling"):
+            watcher = create_watcher([(techniques_dir, True)], polling=mode == "polling")
+            if mode == "inotify" and not isinstance(watcher, InotifyWatcher):
+                print(f"{mode:>10}: unavailable on this platform")
+                continue
+            latencies = []
+            for edit in range(args.edits):
+                path = rng.choice(paths)
+                marker = f"{mode}{edit}"
+                start = time.perf_counter()
+                edit_technique(path, marker)
+                wait_for_changes(watcher)
+                with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                    builder.build_site(incremental=True)
+                latencies.append(time.perf_counter() - start)
+                page = output_dir / "pages" / f"{path.stem}.html"
+                if marker not in page.read_text(encoding='utf-8'):
+                    print(f"❌ {page.name} was not rebuilt after editing {path.name}")
+                    return 1
+            watcher.close()
+            latencies.sort()
+            print(f"{mode:>10}: {latencies[len(latencies) // 2] * 1000:8.1f} ms median, "
+                  f"{latencies[-1] * 1000:.1f} ms max (edit to rebuilt output)")
+    return 0
+
+def bench_live(args: argparse.Namespace) -> int:
+    """Edit-to-rendered-page latency and request throughput of the in-memory dev server"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        techniques_dir = tmp_path / "techniques"
+        paths = generate_corpus(techniques_dir, args.size, seed=args.seed)
+        output_dir = tmp_path / "site"
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            start = time.perf_counter()
+            site = DevSite(ClickFixWikiBuilder(techniques_dir=techniques_dir, output_dir=output_dir,
+                                               cache_dir=tmp_path / "cache", quiet=True))
+            startup = time.perf_counter() - start
+            route = f"/pages/{paths[0].stem}.html"
+            start = time.perf_counter()
+            site.get(route)
+            first = time.perf_counter() - start
+            start = time.perf_counter()
+            site.get(route)
+            cached = time.perf_counter() - start
+        print(f"Corpus: {args.size} synthetic techniques")
+        print(f"Startup: {startup * 1000:.0f} ms, first render of a page {first * 1000:.1f} ms, "
+              f"cached {cached * 1000:.3f} ms")
+
+        watcher = create_watcher([(techniques_dir, True)])
+        rng = random.Random(args.seed)
+        latencies = []
+        for edit in range(args.edits):
+            path = rng.choice(paths)
+            marker = f"live{edit}"
+            start = time.perf_counter()
+            edit_technique(path, marker)
+            wait_for_changes(watcher)
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                site.refresh()
+                body, _ = site.get(f"/pages/{path.stem}.html")
+            latencies.append(time.perf_counter() - start)
+            if marker.encode('utf-8') not in body:
+                print(f"❌ {path.stem}.html was not re-rendered after editing {path.name}")
+                return 1
+        watcher.close()
+        latencies.sort()
+        print(f"Edit to re-rendered page: {latencies[len(latencies) // 2] * 1000:.1f} ms median, "
+              f"{latencies[-1] * 1000:.1f} ms max")
+
+        # Concurrent requests over HTTP while a reload stream is held open
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            httpd = create_dev_server(site, 0)
+            threading.Thread(target=httpd.serve_forever, daemon=True).start()
+            base = f"http://localhost:{httpd.server_address[1]}"
+            stream = urllib.request.urlopen(base + "/__livereload")
+            routes = [f"/pages/{path.stem}.html" for path in paths[:args.requests]]
+
+            def fetch(route):
+                with urllib.request.urlopen(base + route) as response:
+                    return len(response.read())
+
+            with ThreadPoolExecutor(max_workers=args.clients) as pool:
+                list(pool.map(fetch, routes))
+                start = time.perf_counter()
+                list(pool.map(fetch, routes))
+                elapsed = time.perf_counter() - start
+            stream.close()
+            httpd.shutdown()
+            httpd.server_close()
+        print(f"{len(routes)} cached page requests from {args.clients} clients: {elapsed * 1000:.0f} ms "
+              f"({len(routes) / elapsed:.0f} requests/s)")
+        print(f"Output directory written: {'yes' if output_dir.exists() else 'no'}")
+    return 0
+
+def bench_precompress(args: argparse.Namespace) -> int:
+    """Post-build precompression: serial vs all cores, then a rebuild with one edited technique"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        techniques_dir = tmp_path / "techniques"
+        paths = generate_corpus(techniques_dir, args.size, seed=args.seed)
+        print(f"Corpus: {args.size} synthetic techniques, formats: {', '.join(compressed_formats())}")
+
+        for label, jobs in (("serial", 1), (f"{os.cpu_count()} cores", None)):
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                builder = ClickFixWikiBuilder(techniques_dir=techniques_dir, output_dir=tmp_path / "site",
+                                              cache_dir=tmp_path / "cache", quiet=True)
+                builder.build_site()
+                manifest = BuildManifest(builder.cache_dir / "build-manifest.json", builder.output_dir)
+                manifest.current = dict(manifest.previous)
+                start = time.perf_counter()
+                totals = builder.precompress_outputs(manifest, jobs)
+                elapsed = time.perf_counter() - start
+            savings = ", ".join(f"{fmt} {totals[fmt] / 1024 / 1024:.1f} MiB" for fmt in compressed_formats())
+            print(f"{label:>10}: {elapsed * 1000:8.1f} ms for {totals['compressed']} files, "
+                  f"{totals['bytes'] / 1024 / 1024:.1f} MiB -> {savings}")
+
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            builder.build_site(incremental=True, precompress=True)
+            edit_technique(paths[0], "precompressed")
+            builder.build_site(incremental=True, precompress=True)
+        counters = builder.profiler.counters['precompress']
+        print(f"{'rebuild':>10}: {builder.profiler.phases['precompress'] * 1000:8.1f} ms, "
+              f"{counters['compressed']} of {counters['files']} files recompressed after one edit")
+    return 0
+
+def run_build_phases(builder: ClickFixWikiBuilder, **options) -> Dict[str, float]:
+    """Run a full build_site and return the seconds spent in each of its profiled phases"""
+    builder.build_site(**options)
+    return {name: builder.profiler.phases.get(name, 0.0) for name in PHASES}
+
+def git_commit() -> str:
+    """Current commit of the working tree, for labelling results"""
+    result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True)
+    return result.stdout.strip() or "unknown"
+
+def print_comparison(previous: Dict[str, Any], current: Dict[str, Any]) -> None:
+    """Print per-phase changes between two suite reports"""
+    previous_by_size = {result['size']: result for result in previous.get('results', [])}
+    print(f"\nCompared with {previous.get('commit', 'unknown')} ({previous.get('timestamp', '?')}):")
+    for result in current['results']:
+        before = previous_by_size.get(result['size'])
+        if before is None:
+            continue
+        changes = []
+        for name in PHASES + ['total']:
+            old = before['total_seconds'] if name == 'total' else before['phases'].get(name)
+            new = result['total_seconds'] if name == 'total' else result['phases'][name]
+            if old:
+                changes.append(f"{name} {(new - old) / old * 100:+.0f}%")
+        print(f"{result['size']:>8}: " + ", ".join(changes))
+
+def extract_revision(revision: str, target_dir: Path) -> None:
+    """Write the files of a git revision to target_dir, leaving the repository untouched"""
+    archive = subprocess.run(["git", "archive", "--format=tar", revision], capture_output=True, check=True).stdout
+    target_dir.mkdir(parents=True)
+    subprocess.run(["tar", "-x", "-C", str(target_dir)], input=archive, check=True)
+
+def time_revision_builds(revisions: List[str], techniques_dir: Path, work_dir: Path, repeat: int) -> Dict[str, float]:
+    """Best cold `python build.py` wall time of each git revision over the same techniques"""
+    times = {}
+    for revision in revisions:
+        tree = work_dir / f"tree-{len(times)}"
+        extract_revision(revision, tree)
+        shutil.rmtree(tree / "techniques")
+        (tree / "techniques").symlink_to(techniques_dir.resolve(), target_is_directory=True)
+        best = None
+        for _ in range(repeat):
+            for generated in (tree / "_site", tree / ".cache"):
+                shutil.rmtree(generated, ignore_errors=True)
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "build.py"], cwd=tree, check=True, capture_output=True)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        times[revision] = best
+    return times
+
+def bench_model(args: argparse.Namespace) -> int:
+    """Memory and load time of the corpus as raw YAML dicts vs Technique records
+
+    With --baseline, also the end-to-end build time of a revision still on the dict loader
+    against --revision, since records move work from rendering into loading.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        yaml_files = generate_corpus(Path(tmp) / "techniques", args.size, seed=args.seed)
+        print(f"Corpus: {args.size} synthetic techniques")
+
+        def load_dicts():
+            entries = []
+            for yaml_file in yaml_files:
+                with open(yaml_file, 'rb') as f:
+                    entry = yaml.load(f, Loader=SafeLoader)
+                entry['id'] = yaml_file.stem
+                entries.append(entry)
+            return entries
+
+        def load_records():
+            entries = []
+            for yaml_file in yaml_files:
+                with open(yaml_file, 'rb') as f:
+                    entries.append(load_technique(yaml.load(f, Loader=SafeLoader), yaml_file.stem))
+            return entries
+
+        for label, load in (("dicts", load_dicts), ("records", load_records)):
+            start = time.perf_counter()
+            load()
+            elapsed = time.perf_counter() - start
+            # Measured on a second load, so timings are not skewed by tracing
+            tracemalloc.start()
+            entries = load()
+            size = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+
+            start = time.perf_counter()
+            if label == "records":
+                for entry in entries:
+                    summarize_entry(entry)
+                    search_record(entry)
+            derive = time.perf_counter() - start
+            pickled = len(pickle.dumps(entries, protocol=pickle.HIGHEST_PROTOCOL))
+            print(f"{label + ':':9}{size / len(entries):8.0f} bytes/entry in memory, "
+                  f"{pickled / len(entries):6.0f} bytes/entry pickled, load {elapsed * 1000:7.1f} ms"
+                  + (f", summaries and search records {derive * 1000:.1f} ms" if label == "records" else ""))
+            del entries
+
+        if args.baseline:
+            times = time_revision_builds([args.baseline, args.revision], Path(tmp) / "techniques",
+                                         Path(tmp), args.repeat)
+            print(f"Cold build, best of {args.repeat}:")
+            for revision, elapsed in times.items():
+                print(f"  {revision:>20}: {elapsed:7.2f}s")
+    return 0
+
+def bench_validate(args: argparse.Namespace) -> int:
+    """Schema validation of a synthetic corpus: serial, all cores, and with a warm result cache"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        yaml_files = generate_corpus(tmp_path / "techniques", args.size, seed=args.seed)
+        print(f"Corpus: {args.size} synthetic techniques")
+
+        cache_path = tmp_path / "validation.pickle"
+        for label, jobs, cached in (("serial", 1, False), (f"{os.cpu_count()} cores", None, False),
+                                    ("cold cache", None, True), ("warm cache", None, True)):
+            cache = ParseCache(cache_path, version=VALIDATION_VERSION) if cached else None
+            start = time.perf_counter()
+            issues = validate_files(yaml_files, jobs, cache)
+            if cache is not None:
+                cache.save()
+            elapsed = time.perf_counter() - start
+            print(f"{label + ':':12}{elapsed * 1000:8.1f} ms, {len(issues)} issues")
+
+        # One broken file among thousands: only it is read again, and located line by line
+        with open(yaml_files[0], 'a', encoding='utf-8') as f:
+            f.write("platform_typo: windows\n")
+        cache = ParseCache(cache_path, version=VALIDATION_VERSION)
+        start = time.perf_counter()
+        issues = validate_files(yaml_files, None, cache)
+        elapsed = time.perf_counter() - start
+        print(f"{'one edit:':12}{elapsed * 1000:8.1f} ms, {len(issues)} issues ({issues[0]})")
+    return 0
+
+def bench_pack(args: argparse.Namespace) -> int:
+    """Open-and-read-one and full-scan latency: YAML directory vs parse cache vs pack"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        techniques_dir = tmp_path / "techniques"
+        yaml_files = generate_corpus(techniques_dir, args.size, seed=args.seed)
+        pack_path = tmp_path / "techniques.pack"
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            builder = ClickFixWikiBuilder(techniques_dir=techniques_dir, cache_dir=tmp_path / "cache", quiet=True)
+            start = time.perf_counter()
+            builder.pack_techniques(pack_path)
+            packed = time.perf_counter() - start
+        yaml_bytes = sum(path.stat().st_size for path in yaml_files)
+        print(f"Corpus: {args.size} synthetic techniques, {yaml_bytes / 1024 / 1024:.1f} MiB of YAML; "
+              f"pack {pack_path.stat().st_size / 1024 / 1024:.1f} MiB written in {packed * 1000:.0f} ms")
+
+        ids = [path.stem for path in random.Random(args.seed).sample(yaml_files, min(args.reads, len(yaml_files)))]
+
+        def read_yaml(technique_id):
+            with open(techniques_dir / f"{technique_id}.yml", 'rb') as f:
+                return load_technique(load_yaml(f), technique_id)
+
+        def read_pack(technique_id):
+            with TechniquePack(pack_path) as pack:
+                return pack.get(technique_id)
+
+        print("Open and read one technique (median of a fresh open per read):")
+        for label, read in (("YAML file", read_yaml), ("pack", read_pack)):
+            timings = []
+            for technique_id in ids:
+                start = time.perf_counter()
+                entry = read(technique_id)
+                timings.append(time.perf_counter() - start)
+                assert entry.id == technique_id
+            timings.sort()
+            print(f"  {label + ':':22}{timings[len(timings) // 2] * 1000000:8.0f} us")
+
+        def scan_yaml():
+            return list(ClickFixWikiBuilder(techniques_dir=techniques_dir, cache_dir=tmp_path / "cache",
+                                            quiet=True).iter_entries(use_parse_cache=False))
+
+        def scan_parse_cache():
+            return ClickFixWikiBuilder(techniques_dir=techniques_dir, cache_dir=tmp_path / "cache",
+                                       quiet=True).get_all_entries()
+
+        def scan_pack():
+            return ClickFixWikiBuilder(techniques_dir=techniques_dir, cache_dir=tmp_path / "cache",
+                                       quiet=True, pack_path=pack_path).get_all_entries()
+
+        print("Full scan:")
+        for label, scan in (("YAML directory", scan_yaml), ("warm parse cache", scan_parse_cache),
+                            ("pack", scan_pack)):
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                start = time.perf_counter()
+                entries = scan()
+                elapsed = time.perf_counter() - start
+            print(f"  {label + ':':22}{elapsed * 1000:8.1f} ms for {len(entries)} techniques")
+    return 0
+
+def bench_deploy(args: argparse.Namespace) -> int:
+    """Full re-publish (an orphan commit of every file) vs a delta deploy after one edit, to a local bare repo"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        techniques_dir = tmp_path / "techniques"
+        paths = generate_corpus(techniques_dir, args.size, seed=args.seed)
+        output_dir = tmp_path / "site"
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            builder = ClickFixWikiBuilder(techniques_dir=techniques_dir, output_dir=output_dir,
+                                          cache_dir=tmp_path / "cache", quiet=True)
+            builder.build_site()
+        files = sum(1 for path in output_dir.rglob("*") if path.is_file())
+        print(f"Corpus: {args.size} synthetic techniques, {files} output files")
+
+        repo_dir = tmp_path / "repo"
+        remote = tmp_path / "remote.git"
+        for command in (['init', '-q', str(repo_dir)], ['init', '-q', '--bare', str(remote)]):
+            git(command, tmp_path)
+        for command in (['config', 'user.name', 'benchmark'], ['config', 'user.email', 'benchmark@localhost'],
+                        ['remote', 'add', 'origin', str(remote)]):
+            git(command, repo_dir)
+        deployer = DeltaDeployer(output_dir, repo_dir=repo_dir)
+
+        def deploy(full):
+            start = time.perf_counter()
+            parent = None if full else deployer.fetch()
+            site = deployer.site_manifest()
+            plan = deployer.plan(deployer.deployed_manifest(parent), site)
+            if any(plan.values()):
+                commit = deployer.commit(parent, site, plan, "benchmark deploy")
+                if full:
+                    git(['push', '--quiet', '--force', 'origin', f"{commit}:refs/heads/{deployer.branch}"], repo_dir)
+                else:
+                    deployer.push(commit)
+            return time.perf_counter() - start, plan
+
+        def report(label, elapsed, plan):
+            counts = ", ".join(f"{len(paths)} {change}" for change, paths in plan.items())
+            print(f"{label:>16}: {elapsed * 1000:8.1f} ms ({counts})")
+
+        report("full publish", *deploy(full=True))
+        report("delta, no edit", *deploy(full=False))
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            edit_technique(paths[0], "deployed")
+            builder.build_site(incremental=True)
+        report("delta, one edit", *deploy(full=False))
+    return 0
+
+# What a copy of the project needs to build from (the techniques are generated)
+PROJECT_FILES = ["build.py", "dev.py", "config.yml", "script.js", "src", "templates", "pages", "assets"]
+
+def first_output_latency(command: List[str], cwd: Path) -> Dict[str, float]:
+    """Seconds from starting a command to its first line of output, and to its exit"""
+    start = time.perf_counter()
+    process = subprocess.Popen(command, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    process.stdout.readline()
+    first = time.perf_counter() - start
+    process.stdout.read()
+    process.wait()
+    return {'first': first, 'total': time.perf_counter() - start}
+
+def bench_daemon(args: argparse.Namespace) -> int:
+    """Startup-to-first-output and total latency: python build.py (dev.py build) vs the daemon client"""
+    with tempfile.TemporaryDirectory() as tmp:
+        project = Path(tmp)
+        for name in PROJECT_FILES:
+            source = Path(name)
+            if source.is_dir():
+                shutil.copytree(source, project / name, ignore=shutil.ignore_patterns("__pycache__"))
+            else:
+                shutil.copy(source, project / name)
+        paths = generate_corpus(project / "techniques", args.size, seed=args.seed)
+        technique_id = paths[0].stem
+        subprocess.run([sys.executable, "build.py", "-q"], cwd=project, check=True, capture_output=True)
+        print(f"Corpus: {args.size} synthetic techniques, median of {args.runs} runs")
+
+        requests = [
+            ("build", ["build.py", "-q"], ["build", "-q"]),
+            ("build --incremental", ["build.py", "--incremental", "-q"], ["build", "--incremental", "-q"]),
+            ("render one", None, ["render", technique_id]),
+            ("validate", ["dev.py", "validate"], ["validate"])
+        ]
+        daemon = subprocess.Popen([sys.executable, "dev.py", "daemon"], cwd=project,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            socket_path = project / ".cache" / "build.sock"
+            with open(os.devnull, 'w') as devnull:
+                while request("ping", socket_path=socket_path, output=devnull) is None:
+                    time.sleep(0.05)
+
+            def median(command):
+                results = sorted((first_output_latency(command, project) for _ in range(args.runs)),
+                                 key=lambda result: result['total'])
+                return results[len(results) // 2]
+
+            for label, script, client_args in requests:
+                print(f"{label}:")
+                modes = [("subprocess", [sys.executable, *script])] if script else []
+                modes.append(("client", [sys.executable, "dev.py", "client", *client_args]))
+                for mode, command in modes:
+                    result = median(command)
+                    print(f"  {mode + ':':12}{result['first'] * 1000:8.1f} ms to first output, "
+                          f"{result['total'] * 1000:8.1f} ms total")
+        finally:
+            with open(os.devnull, 'w') as devnull:
+                request("stop", socket_path=socket_path, output=devnull)
+            daemon.wait()
+    return 0
+
+def bench_suite(args: argparse.Namespace) -> int:
+    """Time every build phase across synthetic corpus sizes and emit a JSON report"""
+    sizes = [int(size) for size in args.sizes.split(",")]
+    report = {
+        'format': SUITE_FORMAT_VERSION,
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'loader': SafeLoader.__name__,
+        'seed': args.seed,
+        'precompress': args.precompress,
+        'results': []
+    }
+
+    print(f"{'size':>8} " + " ".join(f"{name:>12}" for name in PHASES) + f" {'total':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        for size in sizes:
+            techniques_dir = tmp_path / f"techniques-{size}"
+            output_dir = tmp_path / f"site-{size}"
+            generate_corpus(techniques_dir, size, seed=args.seed)
+
+            # Every size starts from cold caches
+            configure_markdown_cache(32 * 1024 * 1024)
+            conversions_before = get_markdown_stats()['conversions']
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                builder = ClickFixWikiBuilder(techniques_dir=techniques_dir, output_dir=output_dir,
+                                              cache_dir=tmp_path / f"cache-{size}")
+                phases = run_build_phases(builder, precompress=args.precompress)
+
+            bytes_written = sum(path.stat().st_size for path in output_dir.rglob("*") if path.is_file())
+            markdown_stats = get_markdown_stats()
+            markdown_stats['conversions'] -= conversions_before
+            result = {
+                'size': size,
+                'phases': phases,
+                'total_seconds': sum(phases.values()),
+                'bytes_written': bytes_written,
+                'markdown': markdown_stats
+            }
+            report['results'].append(result)
+            print(f"{size:>8} " + " ".join(f"{phases[name]:>11.3f}s" for name in PHASES)
+                  + f" {result['total_seconds']:>8.2f}s")
+
+            shutil.rmtree(techniques_dir)
+            shutil.rmtree(output_dir)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.json}")
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            print_comparison(json.load(f), report)
+    return 0
+
+def bench_corpus(args: argparse.Namespace) -> int:
+    """Write a synthetic technique corpus for manual experiments"""
+    paths = generate_corpus(args.output, args.size, seed=args.seed)
+    print(f"Wrote {len(paths)} synthetic techniques to {args.output}")
+    return 0
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    """Parse benchmark command line options"""
+    parser = argparse.ArgumentParser(description="Benchmark the ClickFix Wiki build")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    parallel = commands.add_parser("parallel", help="serial vs process-pool rendering")
+    parallel.add_argument("--jobs", "-j", type=int, default=0, metavar="N",
+                          help="worker processes for the parallel run (default: all cores)")
+    parallel.add_argument("--copies", type=int, default=100,
+                          help="copies of each technique in the benchmark corpus")
+    parallel.set_defaults(func=bench_parallel)
+
+    parse_cache = commands.add_parser("parse-cache", help="technique loading with and without the parse cache")
+    parse_cache.add_argument("--copies", type=int, default=200,
+                             help="copies of each technique in the benchmark corpus")
+    parse_cache.set_defaults(func=bench_parse_cache)
+
+    pages = commands.add_parser("pages", help="Markdown conversions done for static pages and navigation")
+    pages.add_argument("--entries", type=int, default=10000,
+                       help="number of entry pages requesting navigation HTML")
+    pages.set_defaults(func=bench_pages)
+
+    markdown_cache = commands.add_parser("markdown", help="entry rendering with and without the Markdown cache")
+    markdown_cache.add_argument("--copies", type=int, default=100,
+                                help="copies of each technique in the benchmark corpus")
+    markdown_cache.add_argument("--max-bytes", type=int, default=32 * 1024 * 1024,
+                                help="fragment cache budget for the cached run")
+    markdown_cache.set_defaults(func=bench_markdown)
+
+    streaming = commands.add_parser("streaming", help="peak memory of materialized vs streamed page output")
+    streaming.add_argument("--size", type=int, default=10000, help="synthetic techniques to generate")
+    streaming.add_argument("--seed", type=int, default=0, help="synthetic corpus seed")
+    streaming.set_defaults(func=bench_streaming)
+
+    memory = commands.add_parser("memory", help="peak RSS of full vs streaming builds across corpus sizes")
+    memory.add_argument("--sizes", default="100,1000,10000",
+                        help="comma-separated synthetic corpus sizes (e.g. 100,1000,10000,100000)")
+    memory.add_argument("--seed", type=int, default=0, help="synthetic corpus seed")
+    memory.set_defaults(func=bench_memory)
+
+    suite = commands.add_parser("suite", help="per-phase build timings across corpus sizes, as JSON")
+    suite.add_argument("--sizes", default="10,100,1000,10000",
+                       help="comma-separated synthetic corpus sizes (up to 100000)")
+    suite.add_argument("--seed", type=int, default=0, help="synthetic corpus seed")
+    suite.add_argument("--precompress", action="store_true", help="include the precompression phase")
+    suite.add_argument("--json", type=Path, metavar="FILE", help="write the report to FILE instead of stdout")
+    suite.add_argument("--compare", type=Path, metavar="FILE", help="print changes against an earlier report")
+    suite.set_defaults(func=bench_suite)
+
+    index = commands.add_parser("index", help="index page bytes and DOM nodes, single page vs paginated")
+    index.add_argument("--sizes", default="1000,10000", help="comma-separated synthetic corpus sizes")
+    index.add_argument("--page-size", type=int, default=100, help="tools per page of the paginated index")
+    index.add_argument("--seed", type=int, default=0, help="synthetic corpus seed")
+    index.set_defaults(func=bench_index)
+
+    fulltext = commands.add_parser("fulltext", help="full-text index size and query latency")
+    fulltext.add_argument("--lures", type=int, default=100000, help="synthetic lures to index")
+    fulltext.add_argument("--repeat", type=int, default=20, help="warm runs per query")
+    fulltext.add_argument("--seed", type=int, default=0, help="synthetic corpus seed")
+    fulltext.set_defaults(func=bench_fulltext)
+
+    watch = commands.add_parser("watch", help="edit-to-output latency of the dev.py watcher")
+    watch.add_argument("--size", type=int, default=1000, help="synthetic techniques to generate")
+    watch.add_argument("--edits", type=int, default=10, help="edits to time per watcher mode")
+    watch.add_argument("--seed", type=int, default=0, help="synthetic corpus seed")
+    watch.set_defaults(func=bench_watch)
+
+    live = commands.add_parser("live", help="edit-to-page latency and throughput of the in-memory dev server")
+    live.add_argument("--size", type=int, default=1000, help="synthetic techniques to generate")
+    live.add_argument("--edits", type=int, default=10, help="edits to time")
+    live.add_argument("--requests", type=int, default=500, help="pages to request concurrently")
+    live.add_argument("--clients", type=int, default=8, help="concurrent HTTP clients")
+    live.add_argument("--seed", type=int, default=0, help="synthetic corpus seed")
+    live.set_defaults(func=bench_live)
+
+    precompress = commands.add_parser("precompress", help="gzip/brotli post-build stage, serial vs parallel")
+    precompress.add_argument("--size", type=int, default=1000, help="synthetic techniques to generate")
+    precompress.add_argument("--seed", type=int, default=0, help="synthetic corpus seed")
+    precompress.set_defaults(func=bench_precompress)
+
+    model = commands.add_parser("model", help="corpus memory as raw YAML dicts vs Technique records")
+    model.add_argument("--size", type=int, default=10000, help="synthetic techniques to generate")
+    model.add_argument("--seed", type=int, default=0, help="synthetic corpus seed")
+    model.add_argument("--baseline", metavar="REV",
+                       help="also time a full build at this git revision (one using the dict loader) against --revision")
+    model.add_argument("--revision", metavar="REV", default="HEAD", help="revision to compare --baseline with")
+    model.add_argument("--repeat", type=int, default=3, help="cold builds per revision (the best is reported)")
+    model.set_defaults(func=bench_model)
+
+    validate = commands.add_parser("validate", help="schema validation time, serial vs parallel vs cached")
+    validate.add_argument("--size", type=int, default=5000, help="synthetic techniques to generate")
+    validate.add_argument("--seed", type=int, default=0, help="synthetic corpus seed")
+    validate.set_defaults(func=bench_validate)
+
+    pack = commands.add_parser("pack", help="read-one and full-scan latency, YAML directory vs pack")
+    pack.add_argument("--size", type=int, default=10000, help="synthetic techniques to generate")
+    pack.add_argument("--reads", type=int, default=200, help="single-technique reads to time")
+    pack.add_argument("--seed", type=int, default=0, help="synthetic corpus seed")
+    pack.set_defaults(func=bench_pack)
+
+    deploy = commands.add_parser("deploy", help="full re-publish vs delta deploy to a local bare repo")
+    deploy.add_argument("--size", type=int, default=1000, help="synthetic techniques to generate")
+    deploy.add_argument("--seed", type=int, default=0, help="synthetic corpus seed")
+    deploy.set_defaults(func=bench_deploy)
+
+    daemon = commands.add_parser("daemon", help="startup-to-first-output latency, subprocess build vs daemon client")
+    daemon.add_argument("--size", type=int, default=1000, help="synthetic techniques to generate")
+    daemon.add_argument("--runs", type=int, default=5, help="runs of each request to take the median of")
+    daemon.add_argument("--seed", type=int, default=0, help="synthetic corpus seed")
+    daemon.set_defaults(func=bench_daemon)
+
+    corpus = commands.add_parser("corpus", help="generate a synthetic technique corpus")
+    corpus.add_argument("output", type=Path, help="directory to write technique files to")
+    corpus.add_argument("--size", type=int, default=1000, help="number of techniques")
+    corpus.add_argument("--seed", type=int, default=0, help="synthetic corpus seed")
+    corpus.set_defaults(func=bench_corpus)
+
+    build_once = commands.add_parser("build-once", help=argparse.SUPPRESS)
+    build_once.add_argument("--techniques", type=Path, required=True)
+    build_once.add_argument("--output", type=Path, required=True)
+    build_once.add_argument("--streaming", action="store_true")
+    build_once.set_defaults(func=bench_build_once)
+
+    return parser.parse_args(argv)
+
+def main(argv: List[str] = None) -> int:
+    """Main benchmark entry point"""
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    exit(main())
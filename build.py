@@ -5,187 +5,753 @@ A Python-based static site generator for the ClickFix Wiki
 """
 
 import os
-import yaml
-import shutil
+import sys
+import json
+import time
+import random
+import argparse
+import cProfile
+from collections import deque
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, Iterator, Optional
 
 # Import our modules
-from jinja2 import Environment, FileSystemLoader
-from src.generators import generate_tools_html, generate_lures_html, generate_tags_html, generate_info_html
-from src.utils import format_platform, format_presentation
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, ModuleLoader, Template
+from src.generators import iter_tools_html, iter_filter_groups_html, iter_lures_html, index_page_url
+from src.generators import generate_pagination_html, generate_tags_html, generate_info_html
+from src.generators import TAG_ICONS, CONTACT_ICONS, DEFAULT_CONTACT_ICON
+from src.utils import reset_markdown_converter, get_markdown_cache, get_markdown_stats
+from src.models import RECORD_VERSION, Technique, load_technique, summarize_entry
+from src.pack import TechniquePack, write_pack
 from src.pages import PageProcessor
 from src.config import ConfigLoader
+from src.cache import ParseCache, load_yaml
+from src.manifest import BuildManifest, hash_bytes, hash_data, hash_file, hash_files
+from src.profiling import BuildProfiler, cache_counters
+from src.output import OutputWriter
+from src.search import search_record, build_facets, iter_search_index_json
+from src.spill import RecordSpill
+from src.fulltext import FullTextIndexer
+from src.compress import compressed_formats, is_compressible, compress_files
+from src.assets import minify_asset, minify_html, fingerprint_name, extract_critical_css, stylesheet_links_html
+from src.icons import ICON_CDN_URL, IconSubset, find_icons
+from src.synthetic import generate_technique
 
 class ClickFixWikiBuilder:
-    def __init__(self):
-        self.techniques_dir = Path("techniques")
-        self.output_dir = Path("_site")
+    # Static files and directories copied into the site as-is: (source, output)
+    STATIC_ASSETS = [
+        ('assets/styles.css', 'styles.css'),
+        ('script.js', 'script.js'),
+        ('images', 'images')
+    ]
+    
+    # Path from each page type to the site root
+    PAGE_PREFIXES = {'index': '', 'entry': '../', 'page': '../'}
+    
+    # Synthetic techniques rendered to find the CSS each page type needs on first render
+    CRITICAL_SAMPLE_SIZE = 12
+    
+    def __init__(self, techniques_dir: Path = Path("techniques"), output_dir: Path = Path("_site"),
+                 cache_dir: Path = Path(".cache"), compiled_templates_dir: Path = None, quiet: bool = False,
+                 pack_path: Path = None):
+        self.techniques_dir = Path(techniques_dir)
+        # Techniques are read from this pack (see write_pack) instead of techniques_dir when set
+        self.pack_path = Path(pack_path) if pack_path else None
+        self.output_dir = Path(output_dir)
         self.assets_dir = Path("assets")
         self.pages_dir = Path("pages")
         self.templates_dir = Path("templates")
-        self.page_processor = PageProcessor(self.pages_dir)
-        self.config = ConfigLoader()
-        self.jinja_env = Environment(loader=FileSystemLoader('templates'))
+        self.cache_dir = Path(cache_dir)
+        self.quiet = quiet
+        self.profiler = BuildProfiler()
+        self.writer = OutputWriter(self.output_dir)
+        self.page_processor = PageProcessor(self.pages_dir, quiet=quiet)
+        self.parse_cache = ParseCache(self.cache_dir / "techniques.pickle", convert=self.parse_technique,
+                                      version=RECORD_VERSION)
+        self.config = ConfigLoader(quiet=quiet)
+        self.compiled_templates_dir = compiled_templates_dir
+        self.jinja_env = self.create_jinja_env()
+        self.templates: Dict[str, Template] = {}
+        # Kept across builds by a long-lived builder (dev.py watch)
+        self.fulltext = FullTextIndexer(self.cache_dir / "fulltext.pickle")
+        self.derived: Dict[str, tuple] = {}
+        # Asset pipeline (see prepare_assets): URL of each static file asset, and processed contents
+        self.minify = False
+        self.fingerprint = False
+        self.asset_urls: Dict[str, str] = {dst: dst for _, dst in self.STATIC_ASSETS}
+        self.processed_assets: Dict[str, tuple] = {}
+        # Style delivery (see prepare_styles): inline CSS per page type and the markup linking styles
+        self.critical_css = False
+        self.icon_font: Path = None
+        self.icon_subset: IconSubset = None
+        self.inline_styles: Dict[str, str] = {}
+        self.stylesheets_html = self.get_stylesheets_html()
+    
+    def create_jinja_env(self) -> Environment:
+        """Create the Jinja environment, preferring precompiled templates when given"""
+        if self.compiled_templates_dir is not None:
+            return Environment(loader=ModuleLoader(str(self.compiled_templates_dir)))
         
-    def load_yaml_file(self, file_path: Path) -> Dict[str, Any]:
-        """Load and parse a YAML file"""
+        # Compiled template bytecode survives across processes and builds
+        bytecode_dir = self.cache_dir / "jinja"
+        bytecode_dir.mkdir(parents=True, exist_ok=True)
+        return Environment(loader=FileSystemLoader(str(self.templates_dir)),
+                           bytecode_cache=FileSystemBytecodeCache(str(bytecode_dir)))
+    
+    def get_template(self, name: str) -> Template:
+        """Resolve a template once per build instead of once per rendered page"""
+        template = self.templates.get(name)
+        if template is None:
+            template = self.templates[name] = self.jinja_env.get_template(name)
+        return template
+    
+    def pack_techniques(self, pack_path: Path) -> int:
+        """Compile the techniques directory into a single pack loadable with --pack"""
+        entries = self.get_all_entries()
+        count = write_pack(entries, pack_path)
+        print(f"Packed {count} techniques into {pack_path} ({pack_path.stat().st_size / 1024:.0f} KiB)")
+        return count
+    
+    def precompile_templates(self, target_dir: Path) -> None:
+        """Compile every template to Python modules loadable with --templates-module"""
+        target_dir.mkdir(parents=True, exist_ok=True)
+        self.jinja_env.compile_templates(str(target_dir), zip=None)
+        print(f"Compiled templates to {target_dir}")
+        
+    def log(self, message: str) -> None:
+        """Print per-file progress, unless running quietly"""
+        if not self.quiet:
+            print(message)
+    
+    @staticmethod
+    def parse_technique(data: Any, file_path: Path) -> Technique:
+        """Turn a parsed technique file into its record, named after the file"""
+        return load_technique(data, file_path.stem)
+    
+    def load_yaml_file(self, file_path: Path) -> Technique:
+        """Load and parse a YAML file, reusing the parse cache when it is unchanged"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
+            return self.parse_cache.get(file_path)
         except Exception as e:
             print(f"Error loading {file_path}: {e}")
             return None
     
-    def get_all_entries(self) -> List[Dict[str, Any]]:
-        """Load all YAML files from the techniques directory"""
-        entries = []
+    def get_all_entries(self) -> List[Technique]:
+        """Load all YAML files from the techniques directory (or every record in the pack)"""
+        entries = list(self.iter_entries())
+        self.parse_cache.save()
+        return entries
+    
+    def iter_entries(self, use_parse_cache: bool = True) -> Iterator[Technique]:
+        """Lazily load YAML files from the techniques directory (or records from the pack) one entry at a time"""
+        if self.pack_path is not None:
+            with TechniquePack(self.pack_path) as pack:
+                yield from pack
+            return
         
         if not self.techniques_dir.exists():
             print(f"Techniques directory {self.techniques_dir} not found")
-            return entries
-            
+            return
+        
+        yaml_files = []
         for yaml_file in self.techniques_dir.glob("*.yml"):
-            entry = self.load_yaml_file(yaml_file)
+            if use_parse_cache:
+                # Only needed to prune the cache afterwards
+                yaml_files.append(yaml_file)
+                entry = self.load_yaml_file(yaml_file)
+            else:
+                entry = self.load_yaml_file_uncached(yaml_file)
             if entry:
-                entry['id'] = yaml_file.stem
-                entries.append(entry)
-                print(f"Loaded: {yaml_file.name}")
+                self.log(f"Loaded: {yaml_file.name}")
+                yield entry
         
-        return entries
+        if use_parse_cache:
+            self.parse_cache.prune(yaml_files)
     
-    def generate_index_html(self, entries: List[Dict[str, Any]]) -> str:
+    def load_yaml_file_uncached(self, file_path: Path) -> Technique:
+        """Load and parse a YAML file without keeping it in the parse cache"""
+        try:
+            with open(file_path, 'rb') as f:
+                return self.parse_technique(load_yaml(f), file_path)
+        except Exception as e:
+            print(f"Error loading {file_path}: {e}")
+            return None
+    
+    def generate_index_html(self, entries: List[Technique]) -> str:
         """Generate the main index.html file"""
-        template = self.jinja_env.get_template('index.html.j2')
-        tools_html = generate_tools_html(entries, self.config)
+        facets = build_facets([search_record(entry) for entry in entries])
+        return "".join(self.stream_index_html([summarize_entry(entry) for entry in entries], facets))
+    
+    def stream_index_html(self, summaries: List[Dict[str, Any]], facets: List[Dict[str, Any]],
+                          total_tools: int = None, pagination: Dict[str, int] = None) -> Iterator[str]:
+        """Yield the main index.html file (or one page of it) as fragments, one tool card at a time"""
+        template = self.get_template('index.html.j2')
+        tools_html = iter_tools_html(summaries, self.config)
+        filters_html = iter_filter_groups_html(facets)
+        pagination_html = generate_pagination_html(pagination) if pagination else ""
         
-        # Generate navigation
-        pages = self.page_processor.get_all_pages()
-        navigation_html = self.page_processor.generate_navigation_html(pages)
+        navigation_html = self.page_processor.get_navigation_html()
         
-        return template.render(
+        return template.generate(
             config=self.config.config,
             tools_html=tools_html,
+            filters_html=filters_html,
             navigation_html=navigation_html,
-            total_tools=len(entries)
+            total_tools=len(summaries) if total_tools is None else total_tools,
+            assets=self.asset_urls,
+            stylesheets_html=self.stylesheets_html['index'],
+            # With critical CSS inlined, the head script is all that would still block first render
+            defer_script=bool(self.inline_styles),
+            pagination=pagination,
+            pagination_html=pagination_html
         )
     
-    def generate_entry_page(self, entry: Dict[str, Any]) -> str:
+    def write_index_pages(self, manifest: BuildManifest, summaries: List[Dict[str, Any]],
+                          facets: List[Dict[str, Any]], page_size: int, base_hash: str) -> int:
+        """Write the index as static pages of page_size tools, plus one JSON card shard per page
+        
+        Page n is index.html / index-n.html and its cards are also in cards/<n-1>.json, so
+        script.js can render filtered results from any page by fetching only the shards
+        those results fall in. summaries is read once, in order (it may be a RecordSpill).
+        """
+        (self.output_dir / "cards").mkdir(exist_ok=True)
+        pages = max(1, -(-len(summaries) // page_size))
+        remaining = iter(summaries)
+        for number in range(1, pages + 1):
+            start = (number - 1) * page_size
+            chunk = list(islice(remaining, page_size))
+            pagination = {'page': number, 'pages': pages, 'size': page_size, 'start': start}
+            page_hash = hash_data([base_hash, facets, pagination, len(summaries), chunk])
+            
+            output = index_page_url(number)
+            if self.is_stale(manifest, output, page_hash):
+                self.write_html(manifest, output,
+                                self.stream_index_html(chunk, facets, len(summaries), pagination))
+            
+            shard = f"cards/{number - 1:04d}.json"
+            if self.is_stale(manifest, shard, page_hash):
+                self.write_json(manifest, shard, {
+                    'start': start,
+                    'cards': [card.strip() for card in iter_tools_html(chunk, self.config)]
+                })
+        return pages
+    
+    def generate_entry_page(self, entry: Technique) -> str:
         """Generate individual entry page HTML"""
-        template = self.jinja_env.get_template('entry.html.j2')
+        return "".join(self.stream_entry_page(entry))
+    
+    def stream_entry_page(self, entry: Technique) -> Iterator[str]:
+        """Yield individual entry page HTML as fragments, one lure card at a time"""
+        template = self.get_template('entry.html.j2')
         tags_html = generate_tags_html(entry)
-        lures_html = generate_lures_html(entry, self.config)
+        lures_html = iter_lures_html(entry, self.config)
         info_html = generate_info_html(entry)
         
-        # Generate navigation
-        pages = self.page_processor.get_all_pages()
-        navigation_html = self.page_processor.generate_navigation_html_relative(pages)
-        
-        # Handle date conversion
-        added_at = entry.get('added_at', 'Unknown')
-        if hasattr(added_at, 'strftime'):
-            added_at = added_at.strftime('%Y-%m-%d')
-        elif added_at is None:
-            added_at = 'Unknown'
-        else:
-            added_at = str(added_at)
+        navigation_html = self.page_processor.get_navigation_html_relative()
         
         # Prepare entry data for template
         entry_data = {
-            'name': entry.get('name', 'Unnamed Tool'),
-            'platform': format_platform(entry.get('platform', 'Unknown')),
-            'presentation': format_presentation(entry.get('presentation', 'Unknown')),
-            'added_at': added_at
+            'name': entry.name or 'Unnamed Tool',
+            'platform': entry.platform_label,
+            'presentation': entry.presentation_label,
+            'added_at': entry.added_at if entry.added_at is not None else 'Unknown'
         }
         
-        return template.render(
+        return template.generate(
             config=self.config.config,
             entry=entry_data,
             tags_html=tags_html,
             lures_html=lures_html,
             info_html=info_html,
-            navigation_html=navigation_html
+            navigation_html=navigation_html,
+            assets=self.asset_urls,
+            stylesheets_html=self.stylesheets_html['entry']
         )
     
-    def build_site(self):
-        """Build the complete static site"""
+    def render_entry(self, file_path: Path) -> Optional[str]:
+        """Re-render one technique's page in place, with the asset and style settings of the last build
+        
+        Only that page is written: the index, search data and build manifest are left for the
+        next build. Returns the output path, or None if the technique could not be loaded.
+        """
+        entry = self.load_yaml_file(file_path)
+        if entry is None:
+            return None
+        output = f"pages/{entry.id}.html"
+        self.templates = {}
+        fragments = self.stream_entry_page(entry)
+        if self.minify:
+            fragments = [minify_html("".join(fragments))]
+        self.writer.write_text(output, fragments)
+        self.log(f"Generated: {output}")
+        return output
+    
+    def get_code_version(self) -> str:
+        """Hash the builder source so code changes invalidate every output"""
+        return hash_files([Path(__file__)] + list(Path("src").glob("*.py")))
+    
+    def get_shared_hash(self, pages: List[Dict[str, Any]]) -> str:
+        """Hash the inputs every rendered page depends on: builder code, config, page navigation and asset URLs"""
+        return hash_data({
+            'code': self.get_code_version(),
+            'config': self.config.config,
+            'navigation': [(page['slug'], page['title']) for page in pages],
+            'assets': self.asset_urls,
+            'stylesheets': self.stylesheets_html,
+            'minify': self.minify
+        })
+    
+    def is_stale(self, manifest: BuildManifest, output: str, input_hash: str) -> bool:
+        """Record an output's input hash and report whether it needs re-rendering"""
+        manifest.record(output, input_hash)
+        return not manifest.is_current(output, input_hash)
+    
+    def write_html(self, manifest: BuildManifest, output: str, fragments: Iterable[str],
+                   render_seconds: float = 0.0) -> None:
+        """Stream a rendered page to the output directory without joining it in memory
+        
+        The file is only replaced if its bytes changed (see OutputWriter).
+        """
+        start = time.perf_counter()
+        output_path = self.output_dir / output
+        if self.minify and output.endswith('.html'):
+            fragments = [minify_html("".join(fragments))]
+        self.writer.write_text(output, fragments)
+        manifest.mark_written(output)
+        self.profiler.record_output(output, render_seconds + time.perf_counter() - start,
+                                    output_path.stat().st_size)
+        self.log(f"Generated: {output}")
+    
+    def write_json(self, manifest: BuildManifest, output: str, data: Any) -> None:
+        """Write compact JSON data to the output directory"""
+        self.write_html(manifest, output, [json.dumps(data, separators=(',', ':'), ensure_ascii=False)])
+    
+    def render_task(self, kind: str, item: Dict[str, Any]) -> Iterable[str]:
+        """Render a single entry or static page task as a sequence of fragments"""
+        if kind == 'entry':
+            return self.stream_entry_page(item)
+        return [self.page_processor.generate_page_html(item, self.stylesheets_html['page'])]
+    
+    def render_tasks(self, tasks: Iterable[tuple], jobs: int = 1, chunk_size: int = 32):
+        """Render (output, kind, item) tasks in order, sharding them across a process pool when jobs > 1
+        
+        Yields (output, fragments, seconds already spent rendering in a worker).
+        Tasks are consumed lazily: at most a few chunks per worker are in flight at once,
+        so a streamed task source is never materialized.
+        """
+        if jobs <= 1:
+            for output, kind, item in tasks:
+                yield output, self.render_task(kind, item), 0.0
+            return
+        
+        worker_options = {
+            'techniques_dir': self.techniques_dir,
+            'output_dir': self.output_dir,
+            'cache_dir': self.cache_dir,
+            'compiled_templates_dir': self.compiled_templates_dir,
+            'quiet': self.quiet
+        }
+        tasks = iter(tasks)
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_render_worker,
+                                 initargs=(worker_options, self.asset_urls, self.stylesheets_html)) as executor:
+            while True:
+                chunk = list(islice(tasks, chunk_size))
+                if chunk:
+                    pending.append(executor.submit(_render_chunk, chunk))
+                if pending and (not chunk or len(pending) >= jobs * 2):
+                    yield from pending.popleft().result()
+                elif not chunk:
+                    break
+    
+    def build_site(self, incremental: bool = False, jobs: int = 1, persist_markdown_cache: bool = False,
+                   streaming: bool = False, page_size: int = 0, precompress: bool = False,
+                   minify: bool = False, fingerprint: bool = False, critical_css: bool = False,
+                   icon_font: Path = None):
+        """Build the complete static site
+        
+        In streaming mode techniques are read lazily and each entry page is rendered and
+        written as soon as it is loaded; only the summary records the index needs are kept.
+        With a page_size the index is split into pages of that many tools (see write_index_pages).
+        With precompress, text outputs get .gz/.br siblings (see precompress_outputs).
+        minify and fingerprint run the asset pipeline (see prepare_assets); critical_css and
+        icon_font change how pages load their styles (see prepare_styles).
+        Timings and cache statistics for the build are collected in self.profiler.
+        """
         print("Building ClickFix Wiki...")
+        profiler = self.profiler = BuildProfiler()
+        markdown_before = get_markdown_stats()
+        parse_hits, parse_misses = self.parse_cache.hits, self.parse_cache.misses
         
-        # Create output directory
-        self.output_dir.mkdir(exist_ok=True)
-        (self.output_dir / "pages").mkdir(exist_ok=True)
+        with profiler.phase('setup'):
+            markdown_cache_path = self.cache_dir / "markdown.pickle"
+            if persist_markdown_cache:
+                get_markdown_cache().load(markdown_cache_path)
+            
+            # Create output directory
+            self.output_dir.mkdir(exist_ok=True)
+            (self.output_dir / "pages").mkdir(exist_ok=True)
+            
+            manifest = BuildManifest(self.cache_dir / "build-manifest.json", self.output_dir)
+            writer = self.writer = OutputWriter(self.output_dir)
+            
+            # A full build re-renders everything, but identical files are left in place
+            # (keeping their mtimes) and anything it no longer produces is removed afterwards
+            if not incremental:
+                manifest.clear()
+            
+            # Inputs shared by every rendered page
+            self.minify, self.fingerprint = minify, fingerprint
+            self.prepare_assets()
+            self.templates = {}
+            self.page_processor.invalidate()
+            pages = self.page_processor.get_all_pages()
+            self.critical_css, self.icon_font = critical_css, icon_font
+            self.prepare_styles(pages, page_size)
+            shared_hash = self.get_shared_hash(pages)
+            entry_template_hash = hash_file(self.templates_dir / 'entry.html.j2')
+            fulltext = self.fulltext
+            fulltext.begin(streaming=streaming)
+            previous_derived, self.derived = self.derived, {}
         
-        # Ensure clean build
-        if self.output_dir.exists():
-            # Remove old files but keep directory structure
-            for file_path in self.output_dir.rglob("*"):
-                if file_path.is_file():
-                    file_path.unlink()
+        # Load entries (all at once, or lazily while rendering in streaming mode)
+        if streaming:
+            entries = self.iter_entries(use_parse_cache=False)
+        else:
+            with profiler.phase('load'):
+                entries = self.get_all_entries()
+            print(f"Loaded {len(entries)} entries")
         
-        # Load all entries
-        entries = self.get_all_entries()
-        print(f"Loaded {len(entries)} entries")
-        
-        # Generate index.html
-        index_html = self.generate_index_html(entries)
-        with open(self.output_dir / "index.html", 'w', encoding='utf-8') as f:
-            f.write(index_html)
-        print("Generated: index.html")
-        
-        # Generate individual entry pages
-        for entry in entries:
-            page_html = self.generate_entry_page(entry)
-            page_path = self.output_dir / "pages" / f"{entry['id']}.html"
-            with open(page_path, 'w', encoding='utf-8') as f:
-                f.write(page_html)
-            print(f"Generated: pages/{entry['id']}.html")
-        
-        # Generate static pages
-        pages = self.page_processor.get_all_pages()
-        for page in pages:
-            page_html = self.page_processor.generate_page_html(page)
-            page_path = self.output_dir / "pages" / f"{page['slug']}.html"
-            with open(page_path, 'w', encoding='utf-8') as f:
-                f.write(page_html)
-            print(f"Generated: pages/{page['slug']}.html")
+        # A streaming build keeps these on disk until the index phase reads them back
+        summaries = RecordSpill("summaries-") if streaming else []
+        search_records = RecordSpill("search-") if streaming else []
+        
+        def entry_tasks():
+            """Yield the entry pages that need rendering"""
+            for entry in entries:
+                derived = previous_derived.get(entry.id)
+                if derived is None or derived[0] is not entry:
+                    derived = (entry, summarize_entry(entry), search_record(entry))
+                if not streaming:
+                    # Parse cache hits return the same object, so later builds can reuse these
+                    self.derived[entry.id] = derived
+                _, summary, record = derived
+                summaries.append(summary)
+                search_records.append(record)
+                fulltext.add(entry)
+                output = f"pages/{entry.id}.html"
+                if self.is_stale(manifest, output, hash_data([shared_hash, entry_template_hash, entry.content_hash])):
+                    yield output, 'entry', entry
+        
+        def page_tasks():
+            """Yield the static pages that need rendering"""
+            for page in pages:
+                output = f"pages/{page['slug']}.html"
+                if self.is_stale(manifest, output, hash_data([shared_hash, page])):
+                    yield output, 'page', page
+        
+        rendered = 0
+        with profiler.phase('entries'):
+            for output, html, worker_seconds in self.render_tasks(entry_tasks(), jobs):
+                self.write_html(manifest, output, html, worker_seconds)
+                rendered += 1
+        if jobs > 1:
+            print(f"Rendered {rendered} entry pages in {profiler.phases['entries']:.2f}s using {jobs} jobs")
+        if streaming:
+            print(f"Streamed {len(summaries)} entries")
+        
+        with profiler.phase('pages'):
+            # Static pages are few: rendering them here is cheaper than starting a pool for them
+            for output, html, worker_seconds in self.render_tasks(page_tasks()):
+                self.write_html(manifest, output, html, worker_seconds)
+        
+        # Generate index.html from the entry summaries
+        with profiler.phase('index'):
+            # Filter groups and the search index share one bit assignment per facet value
+            facets = build_facets(search_records)
+            index_template_hash = hash_file(self.templates_dir / 'index.html.j2')
+            if page_size > 0:
+                index_pages = self.write_index_pages(manifest, summaries, facets, page_size,
+                                                     hash_data([shared_hash, index_template_hash]))
+                print(f"Paginated index: {index_pages} pages of up to {page_size} tools")
+            else:
+                index_hash = hash_data([shared_hash, index_template_hash,
+                                        summaries.hexdigest() if streaming else summaries])
+                if self.is_stale(manifest, "index.html", index_hash):
+                    self.write_html(manifest, "index.html", self.stream_index_html(summaries, facets))
+        
+        with profiler.phase('search'):
+            # The client-side search index comes from the same pass as the tool cards
+            search_hash = hash_data([shared_hash, search_records.hexdigest() if streaming else search_records])
+            if self.is_stale(manifest, "search-index.json", search_hash):
+                self.write_html(manifest, "search-index.json", iter_search_index_json(search_records, facets))
+            if streaming:
+                summaries.close()
+                search_records.close()
+            
+            # Full-text shards over lure content; a shard is only rewritten when its postings change
+            (self.output_dir / "search").mkdir(exist_ok=True)
+            for key, (shard_hash, shard) in fulltext.iter_outputs():
+                output = f"search/{key}.json"
+                if self.is_stale(manifest, output, shard_hash):
+                    self.write_json(manifest, output, shard)
         
         # Copy static assets
-        self.copy_static_assets()
+        with profiler.phase('assets'):
+            self.copy_static_assets(manifest)
+            if fingerprint:
+                # Maps each asset to its fingerprinted URL, for anything outside the build that links them
+                if self.is_stale(manifest, "asset-manifest.json", hash_data(self.asset_urls)):
+                    self.write_json(manifest, "asset-manifest.json", self.asset_urls)
+        
+        if precompress:
+            with profiler.phase('precompress'):
+                compression = self.precompress_outputs(manifest)
+            savings = ", ".join(f"{compression[fmt] / 1024:.0f} KiB {fmt} "
+                                f"(-{100 - 100 * compression[fmt] / max(1, compression['bytes']):.0f}%)"
+                                for fmt in compressed_formats())
+            print(f"Precompressed {compression['compressed']} of {compression['files']} text outputs: "
+                  f"{compression['bytes'] / 1024:.0f} KiB -> {savings}")
+            profiler.set_counters('precompress', compression)
+        
+        with profiler.phase('cleanup'):
+            # Drop outputs whose sources were removed
+            removed = writer.remove(manifest.orphans() if incremental else writer.untracked(manifest.current))
+            for output in removed:
+                self.log(f"Removed: {output}")
+            manifest.save()
+            fulltext.save()
+            
+            if persist_markdown_cache:
+                get_markdown_cache().save(markdown_cache_path)
+        
+        markdown_after = get_markdown_stats()
+        markdown_hits = markdown_after['cache_hits'] - markdown_before['cache_hits']
+        markdown_misses = markdown_after['cache_misses'] - markdown_before['cache_misses']
+        print(f"Markdown cache: {markdown_hits} hits, {markdown_misses} misses, "
+              f"{markdown_after['cache_evictions'] - markdown_before['cache_evictions']} evictions")
+        
+        skipped = len(manifest.current) - len(manifest.written)
+        if incremental:
+            print(f"Incremental build: {len(manifest.written)} rendered, {skipped} up to date")
+        output_counts = writer.counts()
+        print(f"Output files: {output_counts['written']} written, {output_counts['unchanged']} unchanged, "
+              f"{output_counts['removed']} removed")
         
         # Verify build
-        self.verify_build()
+        with profiler.phase('verify'):
+            self.verify_build()
+        
+        # Counters reflect this process only; pool workers keep their own caches
+        profiler.set_counters('markdown', cache_counters(
+            markdown_hits, markdown_misses,
+            conversions=markdown_after['conversions'] - markdown_before['conversions'],
+            entries=markdown_after['cache_entries'],
+            bytes=markdown_after['cache_bytes']
+        ))
+        profiler.set_counters('parse_cache', cache_counters(
+            self.parse_cache.hits - parse_hits, self.parse_cache.misses - parse_misses
+        ))
+        profiler.set_counters('fulltext', cache_counters(
+            fulltext.hits, fulltext.misses,
+            documents=fulltext.document_count,
+            shards=fulltext.shard_count
+        ))
+        profiler.set_counters('manifest', {
+            'written': len(manifest.written),
+            'unchanged': skipped,
+            'removed': len(removed)
+        })
+        profiler.set_counters('output', output_counts)
+        profiler.set_counters('build', {
+            'entries': len(summaries),
+            'pages': len(pages),
+            'jobs': jobs,
+            'incremental': incremental,
+            'streaming': streaming,
+            'page_size': page_size,
+            'precompress': precompress,
+            'minify': minify,
+            'fingerprint': fingerprint,
+            'critical_css': critical_css,
+            'self_hosted_icons': self.icon_subset is not None
+        })
         
         print("Build complete!")
-        return len(entries)
-    
-    def copy_static_assets(self):
-        """Copy CSS, JS, and other static assets"""
-        assets_to_copy = [
-            ('assets/styles.css', 'styles.css'),
-            ('script.js', 'script.js'),
-            ('images', 'images')
-        ]
+        return len(summaries)
+    
+    def prepare_assets(self) -> None:
+        """Minify and fingerprint the static file assets before pages that link them are rendered
         
-        for src, dst in assets_to_copy:
+        With fingerprinting, styles.css is written as styles.<content hash>.css and templates
+        link it through asset_urls, so its URL only changes when its content does and it can
+        be cached indefinitely.
+        """
+        self.asset_urls = {}
+        self.processed_assets = {}
+        for src, dst in self.STATIC_ASSETS:
             src_path = Path(src)
-            dst_path = self.output_dir / dst
+            if not src_path.is_file():
+                continue
+            if not (self.minify or self.fingerprint):
+                self.asset_urls[dst] = dst
+                continue
+            content = src_path.read_bytes()
+            if self.minify:
+                content = minify_asset(dst, content)
+            url = fingerprint_name(dst, content) if self.fingerprint else dst
+            self.asset_urls[dst] = url
+            self.processed_assets[dst] = (url, content)
+    
+    def get_stylesheets_html(self) -> Dict[str, str]:
+        """Head markup loading the styles of each page type"""
+        stylesheets_html = {}
+        for kind, prefix in self.PAGE_PREFIXES.items():
+            inline_css = self.inline_styles.get(kind, "")
+            if self.icon_subset is not None:
+                inline_css += self.icon_subset.css(prefix)
+            stylesheets_html[kind] = stylesheet_links_html(
+                prefix + self.asset_urls['styles.css'], inline_css, defer=bool(self.inline_styles),
+                icons_href=None if self.icon_subset is not None else ICON_CDN_URL
+            )
+        return stylesheets_html
+    
+    def prepare_styles(self, pages: Iterable[Dict[str, Any]], page_size: int = 0) -> None:
+        """Inline each page type's critical CSS and self-host the icons the site uses, when enabled
+        
+        With critical_css, the rules a page type needs for first render are inlined and the
+        full stylesheet no longer blocks rendering. With an icon_font directory (a Font
+        Awesome 6 Free distribution), the icons are subset into local fonts whose CSS is
+        inlined too, replacing the CDN stylesheet; without fontTools the CDN is kept.
+        """
+        self.icon_subset = None
+        if self.icon_font is not None:
+            icons = find_icons([*TAG_ICONS.values(), *CONTACT_ICONS.values(), DEFAULT_CONTACT_ICON,
+                                *(path.read_text(encoding='utf-8') for path in sorted(self.templates_dir.glob("*.j2"))),
+                                *(page['content'] for page in pages)])
+            try:
+                self.icon_subset = IconSubset(self.icon_font, icons)
+            except (ImportError, OSError, ValueError) as e:
+                print(f"Icon subsetting unavailable ({e}); loading Font Awesome from the CDN")
+            else:
+                for url, data, _ in self.icon_subset.fonts.values():
+                    self.processed_assets[url] = (url, data)
+                print(f"Subset {len(self.icon_subset.codepoints)} icons into "
+                      f"{sum(len(data) for _, data, _ in self.icon_subset.fonts.values())} bytes of fonts")
+        
+        self.inline_styles = {}
+        if self.critical_css:
+            styles_path = next(Path(src) for src, dst in self.STATIC_ASSETS if dst == 'styles.css')
+            css = styles_path.read_text(encoding='utf-8')
+            # A fixed synthetic sample, so the inlined CSS does not change with every corpus edit
+            rng = random.Random(0)
+            sample = []
+            for index in range(self.CRITICAL_SAMPLE_SIZE):
+                technique = generate_technique(rng, index)
+                sample.append(load_technique(technique, technique['name']))
+            pagination = {'page': 1, 'pages': 3, 'size': page_size, 'start': 0} if page_size > 0 else None
+            index_html = "".join(self.stream_index_html([summarize_entry(entry) for entry in sample],
+                                                        build_facets([search_record(entry) for entry in sample]),
+                                                        pagination=pagination))
+            self.inline_styles = {
+                'index': extract_critical_css(css, [index_html]),
+                'entry': extract_critical_css(css, ("".join(self.stream_entry_page(entry)) for entry in sample)),
+                'page': extract_critical_css(css, (self.page_processor.generate_page_html(page) for page in pages))
+            }
+        self.stylesheets_html = self.get_stylesheets_html()
+    
+    def copy_static_assets(self, manifest: BuildManifest = None):
+        """Copy CSS, JS, and other static assets, and write the ones the asset pipeline produced"""
+        for name, (output, content) in self.processed_assets.items():
+            content_hash = hash_bytes(content)
+            if manifest is not None:
+                manifest.record(output, content_hash)
+                if manifest.is_current(output, content_hash):
+                    continue
+                manifest.mark_written(output)
+            self.writer.write_bytes(output, content)
+            self.profiler.record_bytes(len(content))
+            self.log(f"Processed: {name} -> {output}")
+        
+        for src, dst in self.STATIC_ASSETS:
+            src_path = Path(src)
+            
+            if dst in self.processed_assets:
+                continue
+            elif src_path.is_file():
+                files = [(src_path, dst)]
+            elif src_path.is_dir():
+                files = [(path, f"{dst}/{path.relative_to(src_path).as_posix()}")
+                         for path in sorted(src_path.rglob("*")) if path.is_file()]
+            else:
+                continue
             
-            if src_path.exists():
-                if src_path.is_file():
-                    shutil.copy2(src_path, dst_path)
-                    print(f"Copied: {src}")
-                elif src_path.is_dir():
-                    if dst_path.exists():
-                        shutil.rmtree(dst_path)
-                    shutil.copytree(src_path, dst_path)
-                    print(f"Copied: {src}/")
+            copied = False
+            for file_path, output in files:
+                dst_path = self.output_dir / output
+                if manifest is not None:
+                    file_hash = hash_file(file_path)
+                    manifest.record(output, file_hash)
+                    if manifest.is_current(output, file_hash):
+                        continue
+                    manifest.mark_written(output)
+                self.writer.copy_file(output, file_path)
+                self.profiler.record_bytes(dst_path.stat().st_size)
+                copied = True
+            
+            if copied:
+                self.log(f"Copied: {src}/" if src_path.is_dir() else f"Copied: {src}")
+    
+    def precompress_outputs(self, manifest: BuildManifest, jobs: int = None) -> Dict[str, int]:
+        """Write .gz (and, with brotli installed, .br) siblings of every text output, across jobs processes (all cores by default)
+        
+        Siblings are manifest outputs keyed on the content hash of the file they compress,
+        so only files whose content changed since the last build are compressed again, in
+        full builds as well as incremental ones.
+        Returns byte totals over every precompressed output, reused or not.
+        """
+        formats = compressed_formats()
+        totals = {'files': 0, 'compressed': 0, 'bytes': 0}
+        totals.update({fmt: 0 for fmt in formats})
+        tasks = []
+        for output in sorted(manifest.current):
+            path = self.output_dir / output
+            if not is_compressible(path):
+                continue
+            content_hash = hash_file(path)
+            stale = []
+            for fmt in formats:
+                manifest.record(f"{output}.{fmt}", content_hash)
+                if not manifest.was_recorded(f"{output}.{fmt}", content_hash):
+                    stale.append(fmt)
+            totals['files'] += 1
+            totals['bytes'] += path.stat().st_size
+            for fmt in formats:
+                if fmt not in stale:
+                    totals[fmt] += path.with_name(f"{path.name}.{fmt}").stat().st_size
+            if stale:
+                tasks.append((path, stale))
+        
+        for path, compressed in compress_files(tasks, jobs):
+            output = path.relative_to(self.output_dir).as_posix()
+            for fmt, data in compressed.items():
+                manifest.mark_written(f"{output}.{fmt}")
+                self.writer.write_bytes(f"{output}.{fmt}", data)
+                self.profiler.record_bytes(len(data))
+                totals[fmt] += len(data)
+            totals['compressed'] += 1
+        return totals
     
     def verify_build(self):
         """Verify that the build was successful"""
         required_files = [
             self.output_dir / "index.html",
-            self.output_dir / "styles.css",
-            self.output_dir / "script.js"
+            self.output_dir / "search-index.json",
+            self.output_dir / "search" / "docs.json",
+            self.output_dir / self.asset_urls.get("styles.css", "styles.css"),
+            self.output_dir / self.asset_urls.get("script.js", "script.js")
         ]
         
         missing_files = []
@@ -198,16 +764,102 @@ class ClickFixWikiBuilder:
         else:
             print("✅ Build verification passed - all required files present")
 
-def main():
-    """Main build function"""
-    builder = ClickFixWikiBuilder()
+# Builder owned by each process pool worker, created once by _init_render_worker
+_worker_builder = None
+
+def _init_render_worker(options: Dict[str, Any], asset_urls: Dict[str, str],
+                        stylesheets_html: Dict[str, str]) -> None:
+    """Give each worker process its own builder, Jinja environment and Markdown instance"""
+    global _worker_builder
+    reset_markdown_converter()
+    _worker_builder = ClickFixWikiBuilder(**options)
+    _worker_builder.asset_urls = asset_urls
+    _worker_builder.stylesheets_html = stylesheets_html
+
+def _render_chunk(tasks: List[tuple]) -> List[tuple]:
+    """Render a shard of (output, kind, item) tasks inside a worker process"""
+    results = []
+    for output, kind, item in tasks:
+        start = time.perf_counter()
+        html = "".join(_worker_builder.render_task(kind, item))
+        results.append((output, [html], time.perf_counter() - start))
+    return results
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    """Parse build command line options"""
+    parser = argparse.ArgumentParser(description="Build the ClickFix Wiki static site")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only re-render outputs whose inputs changed since the last build")
+    parser.add_argument("--jobs", "-j", type=int, default=1, metavar="N",
+                        help="render entry and static pages across N worker processes (0 = all cores)")
+    parser.add_argument("--persist-markdown-cache", action="store_true",
+                        help="keep rendered Markdown fragments in .cache/ between builds")
+    parser.add_argument("--streaming", action="store_true",
+                        help="load, render and write entries one at a time to keep memory bounded")
+    parser.add_argument("--page-size", type=int, default=0, metavar="N",
+                        help="split the index into static pages of N tools with JSON card shards (0 = one page)")
+    parser.add_argument("--precompress", action="store_true",
+                        help="write .gz (and .br, if brotli is installed) copies of text outputs across all cores")
+    parser.add_argument("--minify", action="store_true",
+                        help="minify HTML output and the CSS and JS assets")
+    parser.add_argument("--fingerprint", action="store_true",
+                        help="name CSS and JS assets by content hash (styles.<hash>.css) and write asset-manifest.json")
+    parser.add_argument("--critical-css", action="store_true",
+                        help="inline the CSS each page type needs for first render and load the rest without blocking")
+    parser.add_argument("--icon-font", type=Path, metavar="DIR",
+                        help="self-host the icons the site uses, subset from a Font Awesome 6 Free distribution "
+                             "in DIR (needs fontTools)")
+    parser.add_argument("--quiet", "-q", action="store_true",
+                        help="do not print a line for every loaded, generated or copied file")
+    parser.add_argument("--profile", type=Path, metavar="FILE",
+                        help="write a JSON report of phase timings, render durations and cache hit rates")
+    parser.add_argument("--cprofile", type=Path, metavar="FILE",
+                        help="run the build under cProfile and dump pstats data to FILE")
+    parser.add_argument("--precompile-templates", type=Path, metavar="DIR",
+                        help="compile all templates to Python modules in DIR and exit")
+    parser.add_argument("--templates-module", type=Path, metavar="DIR",
+                        help="load templates precompiled with --precompile-templates from DIR")
+    parser.add_argument("--pack", type=Path, metavar="FILE",
+                        help="read techniques from a pack written by 'python dev.py pack' instead of techniques/")
+    return parser.parse_args(argv)
+
+def run_build(builder: ClickFixWikiBuilder, args: argparse.Namespace) -> int:
+    """Build with the options parse_args returned and report the result; return the exit status"""
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+    profile = cProfile.Profile() if args.cprofile else None
     try:
-        num_entries = builder.build_site()
+        if profile:
+            profile.enable()
+        num_entries = builder.build_site(incremental=args.incremental, jobs=jobs,
+                                         persist_markdown_cache=args.persist_markdown_cache,
+                                         streaming=args.streaming, page_size=args.page_size,
+                                         precompress=args.precompress, minify=args.minify,
+                                         fingerprint=args.fingerprint, critical_css=args.critical_css,
+                                         icon_font=args.icon_font)
         print(f"\nBuild successful! Generated {num_entries} entry pages.")
     except Exception as e:
         print(f"\nBuild failed: {e}")
         return 1
+    finally:
+        if profile:
+            profile.disable()
+            profile.dump_stats(str(args.cprofile))
+            print(f"Wrote cProfile stats to {args.cprofile}")
+    
+    if args.profile:
+        builder.profiler.write(args.profile)
+        print(f"Wrote build profile to {args.profile}")
     return 0
 
+def main(argv: List[str] = None):
+    """Main build function"""
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    builder = ClickFixWikiBuilder(compiled_templates_dir=args.templates_module, quiet=args.quiet,
+                                  pack_path=args.pack)
+    if args.precompile_templates:
+        builder.precompile_templates(args.precompile_templates)
+        return 0
+    return run_build(builder, args)
+
 if __name__ == "__main__":
-    exit(main()) 
\ No newline at end of file
+    exit(main()) 
@@ -4,9 +4,11 @@ Deployment script for ClickFix Wiki
 Builds the site and ensures proper deployment to GitHub Pages
 """
 
+import argparse
 import subprocess
 import sys
 from pathlib import Path
+from src.publish import DeltaDeployer
 
 def run_command(command, description):
     """Run a command and handle errors"""
@@ -25,8 +27,64 @@ def run_command(command, description):
             print(f"Output: {e.stdout}")
         return False
 
+def delta_deploy(args):
+    """Commit only the changed files of _site onto the deployed branch and push it"""
+    print(f"🚀 Starting ClickFix Wiki delta deployment to {args.remote}/{args.branch}...")
+
+    if not args.no_build and not run_command("python build.py", "Building site"):
+        return 1
+
+    site_dir = Path("_site")
+    if not site_dir.exists():
+        print("❌ _site directory not found after build")
+        return 1
+
+    source = subprocess.run("git rev-parse --short HEAD", shell=True, capture_output=True, text=True).stdout.strip()
+    deployer = DeltaDeployer(site_dir, remote=args.remote, branch=args.branch, cname=args.cname)
+    try:
+        parent = deployer.fetch()
+        site = deployer.site_manifest()
+        plan = deployer.plan(deployer.deployed_manifest(parent), site)
+        counts = ", ".join(f"{len(paths)} {change}" for change, paths in plan.items())
+        print(f"📊 Delta: {counts}")
+        if args.dry_run:
+            for change, paths in plan.items():
+                for path in paths:
+                    print(f"  {change}: {path}")
+            return 0
+        if not any(plan.values()):
+            print("ℹ️ No changes to deploy - site is up to date")
+            return 0
+        commit = deployer.commit(parent, site, plan, f"Deploy {source or 'site'} ({counts})")
+        deployer.push(commit)
+    except subprocess.CalledProcessError as e:
+        print(f"❌ Delta deployment failed: {e}")
+        if e.stderr:
+            print(f"Error output: {e.stderr}")
+        return 1
+    except RuntimeError as e:
+        print(f"❌ Delta deployment failed: {e}")
+        return 1
+
+    print(f"🎉 Deployed {commit[:12]} to {args.remote}/{args.branch}")
+    return 0
+
 def main():
     """Main deployment function"""
+    parser = argparse.ArgumentParser(description='Deploy ClickFix Wiki')
+    parser.add_argument('--delta', action='store_true',
+                        help='Commit only added, changed and removed files onto the deployed branch')
+    parser.add_argument('--remote', default='origin', help='Remote to deploy to (--delta only)')
+    parser.add_argument('--branch', default='gh-pages', help='Branch to deploy to (--delta only)')
+    parser.add_argument('--no-build', action='store_true', help='Deploy the existing _site (--delta only)')
+    parser.add_argument('--dry-run', action='store_true', help='List the delta without committing (--delta only)')
+    parser.add_argument('--cname', metavar='DOMAIN',
+                        help='Deploy a CNAME file for this custom domain (--delta only; otherwise an existing one is kept)')
+    args = parser.parse_args()
+
+    if args.delta:
+        return delta_deploy(args)
+
     print("🚀 Starting ClickFix Wiki deployment...")
     
     # Step 1: Build the site
@@ -6,16 +6,17 @@ Provides easy commands for building and serving the site locally
 
 import os
 import sys
-import subprocess
-import webbrowser
 from pathlib import Path
-import http.server
-import socketserver
 import threading
 import time
 
+# Build modules (and the heavier standard library ones) are imported where they are used,
+# so 'python dev.py client' starts without them
+
 def build_site():
     """Build the static site"""
+    import subprocess
+    
     print("🔨 Building ClickFix Wiki...")
     result = subprocess.run([sys.executable, "build.py"], capture_output=True, text=True)
     
@@ -29,19 +30,24 @@ def build_site():
 
 def serve_site(port=8000):
     """Serve the site locally"""
+    import http.server
+    import webbrowser
+    
     site_dir = Path("_site")
     if not site_dir.exists():
         print("❌ Site not built. Run 'python dev.py build' first.")
         return False
     
-    os.chdir(site_dir)
-    
+    # Serve from the site directory without changing the working directory the watcher builds from
     class Handler(http.server.SimpleHTTPRequestHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=str(site_dir), **kwargs)
+        
         def end_headers(self):
             self.send_header('Cache-Control', 'no-cache, no-store, must-revalidate')
             super().end_headers()
     
-    with socketserver.TCPServer(("", port), Handler) as httpd:
+    with http.server.ThreadingHTTPServer(("", port), Handler) as httpd:
         print(f"🌐 Serving site at http://localhost:{port}")
         print("📁 Site directory:", site_dir.absolute())
         print("🔄 Auto-reload: Press Ctrl+C to stop")
@@ -55,41 +61,287 @@ def serve_site(port=8000):
             print("\n👋 Server stopped.")
             return True
 
-def watch_and_build():
+# Inputs the site is built from: directories (watched recursively) with the files that matter in
+# each, and files in the project root
+WATCHED_DIRS = {
+    "techniques": "*.yml",
+    "templates": "*.j2",
+    "pages": "*.md",
+    "src": "*.py",
+    "assets": "*",
+    "images": "*"
+}
+WATCHED_FILES = {"config.yml", "script.js", "build.py"}
+
+def is_watched(path):
+    """Whether a changed path is a build input (and not an editor swap file or bytecode)"""
+    name = path.name
+    if name.startswith(".") or name.endswith(("~", ".swp", ".swx", ".tmp")) or "__pycache__" in path.parts:
+        return False
+    if path.parent == Path("."):
+        return name in WATCHED_FILES
+    pattern = WATCHED_DIRS.get(path.parts[0])
+    return pattern is not None and path.match(pattern)
+
+def restart(reason="Build code changed"):
+    """Re-execute dev.py so changed Python sources are loaded"""
+    print(f"🔁 {reason}, restarting...")
+    sys.stdout.flush()
+    os.execv(sys.executable, [sys.executable] + sys.argv)
+
+def apply_source_changes(builder, changes):
+    """Pick up changes a warm builder cannot see through its caches: Python code and config.yml"""
+    from src.config import ConfigLoader
+    from src.watcher import RESCAN
+    
+    if RESCAN in changes:
+        # Code or config may be among the changes that were missed: start over with a full build
+        restart("Changes were missed")
+    if any(path.suffix == ".py" for path in changes):
+        restart()
+    if Path("config.yml") in changes:
+        builder.config = ConfigLoader()
+
+def rebuild(builder, changes):
+    """Incrementally rebuild with a warm builder; only outputs whose inputs changed are re-rendered"""
+    apply_source_changes(builder, changes)
+    
+    start = time.perf_counter()
+    try:
+        builder.build_site(incremental=True)
+    except Exception as e:
+        print(f"❌ Rebuild failed: {e}")
+        return False
+    
+    # Edit-to-output: from the newest change on disk to the rebuilt outputs
+    mtimes = [path.stat().st_mtime for path in changes if path.exists()]
+    latency = time.time() - max(mtimes) if mtimes else time.perf_counter() - start
+    written = builder.profiler.counters['manifest']['written']
+    print(f"✅ Rebuilt {written} outputs in {(time.perf_counter() - start) * 1000:.0f} ms "
+          f"(edit-to-output {latency * 1000:.0f} ms)")
+    return True
+
+def watch_and_build(polling=False):
     """Watch for changes and rebuild automatically"""
-    print("👀 Watching for changes...")
-    print("📝 Edit YAML files in techniques/ directory")
+    from build import ClickFixWikiBuilder
+    
+    builder = ClickFixWikiBuilder(quiet=True)
+    builder.build_site(incremental=True)
+    
+    watcher = create_source_watcher(polling)
     print("🔄 Site will rebuild automatically")
     print("⏹️  Press Ctrl+C to stop")
     
-    last_modified = {}
+    try:
+        for changes in iter_source_changes(watcher):
+            rebuild(builder, changes)
+    
+    except KeyboardInterrupt:
+        print("\n👋 Watcher stopped.")
+    finally:
+        watcher.close()
+
+def create_source_watcher(polling=False):
+    """Watch every build input"""
+    from src.watcher import InotifyWatcher, create_watcher
+    
+    roots = [(Path(directory), True) for directory in WATCHED_DIRS] + [(Path("."), False)]
+    watcher = create_watcher(roots, polling=polling)
+    print(f"👀 Watching for changes ({'inotify' if isinstance(watcher, InotifyWatcher) else 'polling'})...")
+    print("📝 Edit techniques, pages, templates, assets or config.yml")
+    return watcher
+
+def iter_source_changes(watcher):
+    """Yield each debounced burst of changes to build inputs"""
+    from src.watcher import RESCAN, wait_for_changes
+    
+    while True:
+        changes = wait_for_changes(watcher)
+        if RESCAN in changes:
+            print("⚠️  Too many changes at once to follow them one by one")
+            yield {RESCAN}
+            continue
+        changes = {path for path in changes if is_watched(path)}
+        if not changes:
+            continue
+        for path in sorted(changes):
+            print(f"📝 Detected change in {path}")
+        yield changes
+
+def live_serve(port=8000, polling=False):
+    """Serve pages rendered on demand from memory, reloading open browsers on every change"""
+    import webbrowser
+    from build import ClickFixWikiBuilder
+    from src.devserver import DevSite, create_dev_server
+    
+    start = time.perf_counter()
+    builder = ClickFixWikiBuilder(quiet=True)
+    site = DevSite(builder)
+    print(f"📚 Loaded {len(site.derived)} entries in {(time.perf_counter() - start) * 1000:.0f} ms")
+    
+    def watch():
+        watcher = create_source_watcher(polling)
+        try:
+            for changes in iter_source_changes(watcher):
+                apply_source_changes(builder, changes)
+                start = time.perf_counter()
+                try:
+                    dropped = site.refresh()
+                except Exception as e:
+                    print(f"❌ Refresh failed: {e}")
+                    continue
+                print(f"✅ {dropped} cached pages invalidated in {(time.perf_counter() - start) * 1000:.0f} ms")
+                site.notify_reload()
+        finally:
+            watcher.close()
     
-    # Get initial modification times
-    for yaml_file in Path("techniques").glob("*.yaml"):
-        last_modified[yaml_file] = yaml_file.stat().st_mtime
+    threading.Thread(target=watch, daemon=True).start()
+    
+    with create_dev_server(site, port) as httpd:
+        print(f"🌐 Serving live site at http://localhost:{port} (rendered in memory, _site/ is untouched)")
+        print("⏹️  Press Ctrl+C to stop")
+        webbrowser.open(f"http://localhost:{port}")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            print("\n👋 Server stopped.")
+    return True
+
+DEFAULT_PACK = Path(".cache") / "techniques.pack"
+
+def validate_techniques(files=None, cache=None):
+    """Check technique files (all of techniques/*.yml by default) against the schema; return whether all pass"""
+    from src.cache import ParseCache
+    from src.validation import VALIDATION_VERSION, validate_files
+    
+    start = time.perf_counter()
+    file_paths = [Path(name) for name in files] if files else sorted(Path("techniques").glob("*.yml"))
+    if cache is None:
+        cache = ParseCache(Path(".cache") / "validation.pickle", version=VALIDATION_VERSION)
+    issues = validate_files(file_paths, cache=cache)
+    if not files:
+        cache.prune(file_paths)
+    cache.save()
+    
+    for issue in issues:
+        print(issue)
+    elapsed = (time.perf_counter() - start) * 1000
+    if issues:
+        failed = len({issue.path for issue in issues})
+        print(f"❌ {len(issues)} problem{'s' if len(issues) != 1 else ''} in {failed} of {len(file_paths)} technique files ({elapsed:.0f} ms)")
+        return False
+    print(f"✅ {len(file_paths)} technique files valid ({elapsed:.0f} ms, {cache.hits} unchanged since last checked)")
+    return True
+
+def pack_techniques(pack_path=None):
+    """Compile techniques/*.yml into one memory-mapped pack file"""
+    from build import ClickFixWikiBuilder
+    
+    pack_path = Path(pack_path) if pack_path else DEFAULT_PACK
+    start = time.perf_counter()
+    ClickFixWikiBuilder(quiet=True).pack_techniques(pack_path)
+    print(f"📦 Done in {(time.perf_counter() - start) * 1000:.0f} ms (build from it with: python build.py --pack {pack_path})")
+
+def daemon_serve(socket_path=None):
+    """Serve build, render and validate requests from 'python dev.py client' with one builder kept warm"""
+    from build import ClickFixWikiBuilder, parse_args, run_build
+    from src.config import ConfigLoader
+    from src.cache import ParseCache
+    from src.validation import VALIDATION_VERSION
+    from src.daemon import BuildDaemon, DEFAULT_SOCKET
+    
+    socket_path = Path(socket_path) if socket_path else DEFAULT_SOCKET
+    builder = ClickFixWikiBuilder(quiet=True)
+    code_version = builder.get_code_version()
+    validation_cache = ParseCache(Path(".cache") / "validation.pickle", version=VALIDATION_VERSION)
+    config_path = Path("config.yml")
+    config_mtime = config_path.stat().st_mtime_ns if config_path.exists() else None
+    
+    def needs_restart():
+        # Changed Python code can only be loaded by a new process; the client retries once it is up
+        if builder.get_code_version() != code_version:
+            print("🔁 Build code changed")
+            return True
+        return False
+    
+    def refresh_config():
+        nonlocal config_mtime
+        mtime = config_path.stat().st_mtime_ns if config_path.exists() else None
+        if mtime != config_mtime:
+            builder.config = ConfigLoader()
+            config_mtime = mtime
+    
+    def build(args):
+        options = parse_args(args)
+        unsupported = [flag for flag, value in (("--templates-module", options.templates_module),
+                                                ("--pack", options.pack),
+                                                ("--precompile-templates", options.precompile_templates)) if value]
+        if unsupported:
+            print(f"❌ {', '.join(unsupported)} not supported by the daemon; run build.py directly")
+            return 2
+        refresh_config()
+        builder.quiet = builder.page_processor.quiet = options.quiet
+        return run_build(builder, options)
+    
+    def render(args):
+        if not args:
+            print("❌ Usage: python dev.py client render ID|FILE...")
+            return 2
+        refresh_config()
+        status = 0
+        for name in args:
+            file_path = Path(name) if name.endswith(".yml") else builder.techniques_dir / f"{name}.yml"
+            start = time.perf_counter()
+            output = builder.render_entry(file_path)
+            if output is None:
+                print(f"❌ Could not render {file_path}")
+                status = 1
+            else:
+                print(f"✅ Rendered {builder.output_dir / output} in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return status
+    
+    def validate(args):
+        return 0 if validate_techniques(args, validation_cache) else 1
     
     try:
-        while True:
-            time.sleep(1)
-            rebuild_needed = False
-            
-            # Check for changes
-            for yaml_file in Path("techniques").glob("*.yaml"):
-                current_mtime = yaml_file.stat().st_mtime
-                if yaml_file not in last_modified or current_mtime > last_modified[yaml_file]:
-                    print(f"📝 Detected change in {yaml_file.name}")
-                    rebuild_needed = True
-                    last_modified[yaml_file] = current_mtime
-            
-            if rebuild_needed:
-                print("🔨 Rebuilding...")
-                if build_site():
-                    print("✅ Rebuild complete!")
-                else:
-                    print("❌ Rebuild failed!")
+        daemon = BuildDaemon(socket_path, {'build': build, 'render': render, 'validate': validate}, needs_restart)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return False
     
+    # Warm the corpus, templates and page Markdown without writing anything
+    start = time.perf_counter()
+    entries = builder.get_all_entries()
+    for name in ("index.html.j2", "entry.html.j2"):
+        builder.get_template(name)
+    builder.page_processor.get_all_pages()
+    print(f"📚 Loaded {len(entries)} entries in {(time.perf_counter() - start) * 1000:.0f} ms")
+    print(f"🧩 Build daemon listening on {socket_path}")
+    print("📨 Send requests with: python dev.py client build|render|validate|stop")
+    
+    try:
+        restarting = daemon.serve()
     except KeyboardInterrupt:
-        print("\n👋 Watcher stopped.")
+        print("\n👋 Build daemon stopped.")
+        restarting = False
+    finally:
+        daemon.server_close()
+    if restarting:
+        restart()
+    return True
+
+def client_request(args):
+    """Send one request to the build daemon, printing its output as it arrives; return its exit status"""
+    from src.daemon import DEFAULT_SOCKET, request
+    
+    if not args:
+        print("❌ Usage: python dev.py client build|render|validate|stop [ARGS...]")
+        return 2
+    status = request(args[0], args[1:])
+    if status is None:
+        print(f"❌ No build daemon listening on {DEFAULT_SOCKET}; start one with: python dev.py daemon")
+        return 1
+    return status
 
 def main():
     """Main development helper"""
@@ -99,7 +351,17 @@ def main():
         print("  python dev.py build     - Build the site")
         print("  python dev.py serve     - Serve the site locally")
         print("  python dev.py watch     - Watch for changes and auto-rebuild")
+        print("                            (add --poll to poll instead of using inotify)")
         print("  python dev.py dev       - Build, serve, and watch")
+        print("  python dev.py live      - Serve pages rendered in memory with live reload")
+        print("                            (never writes _site/; add --poll as for watch)")
+        print(f"  python dev.py pack [FILE] - Compile techniques into one pack file (default {DEFAULT_PACK})")
+        print("  python dev.py validate [FILE...]")
+        print("                          - Check techniques against the schema (exits 1 on problems;")
+        print("                            usable as a pre-commit hook)")
+        print("  python dev.py daemon    - Keep a warm builder running for client requests")
+        print("  python dev.py client build [BUILD OPTIONS] | render ID... | validate [FILE...] | stop")
+        print("                          - Send a request to the daemon (skips build imports and corpus loading)")
         return
     
     command = sys.argv[1]
@@ -111,13 +373,28 @@ def main():
         serve_site()
     
     elif command == "watch":
-        watch_and_build()
+        watch_and_build(polling="--poll" in sys.argv)
+    
+    elif command == "live":
+        live_serve(polling="--poll" in sys.argv)
+    
+    elif command == "pack":
+        pack_techniques(sys.argv[2] if len(sys.argv) > 2 else None)
+    
+    elif command == "validate":
+        sys.exit(0 if validate_techniques(sys.argv[2:]) else 1)
+    
+    elif command == "daemon":
+        daemon_serve()
+    
+    elif command == "client":
+        sys.exit(client_request(sys.argv[2:]))
     
     elif command == "dev":
         # Build first
         if build_site():
             # Start watcher in background
-            watcher_thread = threading.Thread(target=watch_and_build, daemon=True)
+            watcher_thread = threading.Thread(target=watch_and_build, args=("--poll" in sys.argv,), daemon=True)
             watcher_thread.start()
             
             # Serve the site
@@ -125,7 +402,7 @@ def main():
     
     else:
         print(f"❌ Unknown command: {command}")
-        print("Available commands: build, serve, watch, dev")
+        print("Available commands: build, serve, watch, dev, live, pack, validate, daemon, client")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,21 +1,13 @@
 // ClickFix Wiki - Static JavaScript for search and filtering
 
-// Tag categories for tools
-const tagCategories = {
-    platform: ['Windows', 'Mac', 'Linux'],
-    presentation: ['GUI', 'CLI'],
-    capability: ['UAC', 'MOTW', 'File Explorer', 'Registry', 'PowerShell', 'Command Line', 'Network Access', 'System Information', 'Process Management', 'File System Access']
-};
-
-// Selected filters
-let selectedFilters = {
-    platform: [],
-    presentation: [],
-    capability: []
-};
+// Selected filters, keyed by facet (the filter groups are generated from the corpus)
+let selectedFilters = {};
 
 // Toggle filter selection
 function toggleFilter(category, tag, element) {
+    if (!selectedFilters[category]) {
+        selectedFilters[category] = [];
+    }
     const index = selectedFilters[category].indexOf(tag);
     if (index > -1) {
         selectedFilters[category].splice(index, 1);
@@ -35,11 +27,7 @@ function applyFilters() {
 
 // Clear all filters
 function clearAllFilters() {
-    selectedFilters = {
-        platform: [],
-        presentation: [],
-        capability: []
-    };
+    selectedFilters = {};
     
     // Remove selected class from all filter tags
     document.querySelectorAll('.filter-tag').forEach(tag => {
@@ -49,8 +37,408 @@ function clearAllFilters() {
     applyFilters();
 }
 
+// Precomputed search index (search-index.json) and the tool cards it describes
+let searchIndex = null;
+let toolElements = [];
+let toolVisible = [];
+let facetCountElements = [];
+
+// Full-text index over lure content (search/*.json); shards are fetched the first time a query needs them
+const STEM_SUFFIXES = ['ational', 'ations', 'ements', 'ation', 'ement', 'ments', 'ingly', 'ment', 'ings',
+                       'edly', 'ing', 'ers', 'ies', 'ied', 'er', 'ed', 'es', 'ly', 'e', 's', 'y'];
+const SHARD_PREFIX = 2;
+const NO_TOOL = 0xFFFFFFFF;
+let fullTextDocs = null;
+let fullTextShards = {};
+let fullTextPending = null;
+let fullTextResult = null;
+
+// Strip a common English suffix exactly like stem() in src/fulltext.py
+function stem(token) {
+    if (token.length <= 3 || /^[0-9]+$/.test(token) || token.endsWith('ss')) {
+        return token;
+    }
+    for (const suffix of STEM_SUFFIXES) {
+        if (token.endsWith(suffix) && token.length - suffix.length >= 3) {
+            return token.slice(0, -suffix.length);
+        }
+    }
+    return token;
+}
+
+// Fetch a full-text JSON file once
+function loadFullText(name) {
+    if (!fullTextShards[name]) {
+        fullTextShards[name] = fetch(`search/${name}.json`)
+            .then(response => response.ok ? response.json() : { terms: [], docs: [], tf: [] })
+            .catch(error => {
+                delete fullTextShards[name];
+                throw error;
+            });
+    }
+    return fullTextShards[name];
+}
+
+// Resolve a query against the shards its words fall in, then re-run the filters with the result
+function requestFullText(query, words) {
+    if (fullTextPending === query) {
+        return;
+    }
+    fullTextPending = query;
+    const stems = words.map(word => stem(word));
+    const keys = Array.from(new Set(stems.map(prefix => prefix.slice(0, SHARD_PREFIX))));
+    
+    Promise.all([loadFullText('docs'), ...keys.map(loadFullText)])
+        .then(([docs, ...shards]) => {
+            if (!fullTextDocs) {
+                // Map each document (lure) number to the tool it belongs to; numbers no tool owns map to NO_TOOL
+                fullTextDocs = new Uint32Array(docs.size).fill(NO_TOOL);
+                docs.bases.forEach((base, tool) => {
+                    fullTextDocs.fill(tool, base, base + docs.counts[tool]);
+                });
+            }
+            const shardByKey = {};
+            keys.forEach((key, i) => {
+                shardByKey[key] = shards[i];
+            });
+            
+            // Tools with a lure containing a term that starts with the word's stem, for every word
+            let tools = null;
+            stems.forEach(prefix => {
+                const shard = shardByKey[prefix.slice(0, SHARD_PREFIX)];
+                const wordTools = new Uint32Array(searchIndex.words);
+                let low = 0;
+                let high = shard.terms.length;
+                while (low < high) {
+                    const mid = (low + high) >>> 1;
+                    if (shard.terms[mid] < prefix) {
+                        low = mid + 1;
+                    } else {
+                        high = mid;
+                    }
+                }
+                for (let t = low; t < shard.terms.length && shard.terms[t].startsWith(prefix); t++) {
+                    let doc = 0;
+                    shard.docs[t].forEach(delta => {
+                        doc += delta;
+                        const tool = fullTextDocs[doc];
+                        if (tool !== NO_TOOL) {
+                            wordTools[tool >>> 5] |= 1 << (tool & 31);
+                        }
+                    });
+                }
+                if (tools === null) {
+                    tools = wordTools;
+                } else {
+                    for (let w = 0; w < tools.length; w++) {
+                        tools[w] &= wordTools[w];
+                    }
+                }
+            });
+            
+            if (fullTextPending === query) {
+                fullTextPending = null;
+                fullTextResult = { query: query, tools: tools };
+                applyFilters();
+            }
+        })
+        .catch(err => {
+            console.error('Failed to load the full-text index: ', err);
+            if (fullTextPending === query) {
+                fullTextPending = null;
+            }
+        });
+}
+
+// Paginated index (build.py --page-size): filtered results are rendered from cards/NNNN.json shards
+const RESULTS_WINDOW = 50;
+let pagedIndex = null;
+let pageCards = [];
+let cardShards = {};
+let resultTools = [];
+let resultsShown = 0;
+let resultsLoading = false;
+let resultsGeneration = 0;
+
+// Number of set bits in a 32-bit word
+function popcount(word) {
+    word -= (word >>> 1) & 0x55555555;
+    word = (word & 0x33333333) + ((word >>> 2) & 0x33333333);
+    return (((word + (word >>> 4)) & 0x0F0F0F0F) * 0x01010101) >>> 24;
+}
+
+// Number of set bits in the AND of two tool bitsets
+function popcountAnd(a, b) {
+    let count = 0;
+    for (let w = 0; w < a.length; w++) {
+        count += popcount(a[w] & b[w]);
+    }
+    return count;
+}
+
+// Load the search index emitted by the build; filtering falls back to the DOM until it arrives
+function loadSearchIndex() {
+    const toolsGrid = document.getElementById('toolsGrid');
+    if (!toolsGrid || !window.fetch) {
+        return;
+    }
+    
+    fetch('search-index.json')
+        .then(response => response.ok ? response.json() : null)
+        .then(data => {
+            if (!data) {
+                return;
+            }
+            const elementsById = new Map();
+            toolsGrid.querySelectorAll('.tool-item').forEach(item => {
+                elementsById.set(item.getAttribute('data-id'), item);
+            });
+            
+            // Normalize once so each keystroke only does string and integer comparisons
+            data.names = data.names.map(name => name.toLowerCase());
+            data.terms = data.terms.map(terms => ' ' + terms);
+            data.postings = data.postings.map(words => Uint32Array.from(words));
+            data.bitOf = {};
+            data.facets.forEach(facet => {
+                data.bitOf[facet.name] = {};
+                facet.values.forEach((value, i) => {
+                    data.bitOf[facet.name][value] = facet.bits[i];
+                });
+            });
+            data.words = (data.ids.length + 31) >>> 5;
+            facetCountElements = Array.from(document.querySelectorAll('.filter-count'));
+            if (toolsGrid.hasAttribute('data-page-size')) {
+                pagedIndex = {
+                    page: Number(toolsGrid.getAttribute('data-page')),
+                    size: Number(toolsGrid.getAttribute('data-page-size'))
+                };
+                pageCards = Array.from(toolsGrid.children);
+                window.addEventListener('scroll', renderMoreResultsNearBottom, { passive: true });
+            }
+            toolElements = data.ids.map(id => elementsById.get(id));
+            toolVisible = toolElements.map(item => !item || item.style.display !== 'none');
+            searchIndex = data;
+            applyFilters();
+        })
+        .catch(() => {
+            searchIndex = null;
+        });
+}
+
 // Search and filter functionality
 function filterTools(searchTerm) {
+    let visibleCount;
+    if (!searchIndex) {
+        visibleCount = filterToolsFromDom(searchTerm);
+    } else if (pagedIndex) {
+        visibleCount = filterPagedTools(searchTerm);
+    } else {
+        visibleCount = filterToolsWithIndex(searchTerm);
+    }
+    
+    // Update visible count
+    const visibleTools = document.getElementById('visibleTools');
+    if (visibleTools) {
+        visibleTools.textContent = visibleCount;
+    }
+    
+    // Show/hide no results message
+    const noResults = document.getElementById('noResults');
+    if (visibleCount === 0) {
+        noResults.style.display = 'block';
+    } else {
+        noResults.style.display = 'none';
+    }
+}
+
+// Bitset of the tools matching the selected facet values and the search text
+function matchTools(searchTerm) {
+    const index = searchIndex;
+    const query = (searchTerm || '').toLowerCase().trim();
+    // Until the full-text shards for the query arrive, every query word must be the start of
+    // a word in the tool name, lure nicknames or steps
+    const tokens = (query.match(/[a-z0-9]+/g) || []).filter(token => token.length >= SHARD_PREFIX);
+    const words = tokens.map(word => ' ' + word);
+    const toolCount = index.ids.length;
+    let fullText = null;
+    if (tokens.length > 0) {
+        if (fullTextResult && fullTextResult.query === query) {
+            fullText = fullTextResult.tools;
+        } else {
+            requestFullText(query, tokens);
+        }
+    }
+    
+    // Start from every tool and AND in the posting bitset of each selected facet value
+    const matches = new Uint32Array(index.words).fill(0xFFFFFFFF);
+    if (toolCount & 31) {
+        matches[index.words - 1] = (1 << (toolCount & 31)) - 1;
+    }
+    Object.keys(selectedFilters).forEach(category => {
+        selectedFilters[category].forEach(value => {
+            const bit = index.bitOf[category] ? index.bitOf[category][value] : undefined;
+            if (bit === undefined) {
+                matches.fill(0);
+                return;
+            }
+            const posting = index.postings[bit];
+            for (let w = 0; w < matches.length; w++) {
+                matches[w] &= posting[w];
+            }
+        });
+    });
+    
+    // The text query only has to look at tools the facets left in
+    if (query) {
+        for (let w = 0; w < matches.length; w++) {
+            let word = matches[w];
+            while (word) {
+                const low = word & -word;
+                const i = (w << 5) + 31 - Math.clz32(low);
+                word ^= low;
+                let hit = index.names[i].includes(query);
+                if (!hit && fullText) {
+                    hit = (fullText[w] & low) !== 0;
+                } else if (!hit && words.length > 0) {
+                    hit = words.every(term => index.terms[i].includes(term));
+                }
+                if (!hit) {
+                    matches[w] &= ~low;
+                }
+            }
+        }
+    }
+    return matches;
+}
+
+// Live facet counts: how many of the matching tools carry each value
+function updateFacetCounts(matches) {
+    facetCountElements.forEach(element => {
+        const posting = searchIndex.postings[Number(element.getAttribute('data-bit'))];
+        if (posting) {
+            element.textContent = popcountAnd(matches, posting);
+        }
+    });
+}
+
+// Filter against the search index, touching only cards whose visibility changes
+function filterToolsWithIndex(searchTerm) {
+    const matches = matchTools(searchTerm);
+    let visibleCount = 0;
+    for (let i = 0; i < searchIndex.ids.length; i++) {
+        const visible = (matches[i >>> 5] >>> (i & 31) & 1) === 1;
+        if (visible) {
+            visibleCount++;
+        }
+        if (visible !== toolVisible[i]) {
+            toolVisible[i] = visible;
+            if (toolElements[i]) {
+                toolElements[i].style.display = visible ? 'block' : 'none';
+            }
+        }
+    }
+    updateFacetCounts(matches);
+    return visibleCount;
+}
+
+// On the paginated index, show the prebuilt page until a filter is active, then the matching
+// tools from every page, rendered a window at a time as the user scrolls
+function filterPagedTools(searchTerm) {
+    const matches = matchTools(searchTerm);
+    updateFacetCounts(matches);
+    
+    const toolsGrid = document.getElementById('toolsGrid');
+    const pagination = document.getElementById('pagination');
+    const filtered = (searchTerm || '').trim() !== '' ||
+        Object.keys(selectedFilters).some(category => selectedFilters[category].length > 0);
+    resultsGeneration++;
+    resultsLoading = false;
+    
+    if (!filtered) {
+        resultTools = [];
+        toolsGrid.replaceChildren(...pageCards);
+        if (pagination) {
+            pagination.style.display = '';
+        }
+        return searchIndex.ids.length;
+    }
+    
+    resultTools = [];
+    for (let w = 0; w < matches.length; w++) {
+        let word = matches[w];
+        while (word) {
+            const low = word & -word;
+            resultTools.push((w << 5) + 31 - Math.clz32(low));
+            word ^= low;
+        }
+    }
+    resultsShown = 0;
+    toolsGrid.replaceChildren();
+    if (pagination) {
+        pagination.style.display = 'none';
+    }
+    renderMoreResults();
+    return resultTools.length;
+}
+
+// Fetch a shard of card HTML once
+function loadCardShard(shard) {
+    if (!cardShards[shard]) {
+        cardShards[shard] = fetch(`cards/${String(shard).padStart(4, '0')}.json`)
+            .then(response => response.json())
+            .catch(error => {
+                delete cardShards[shard];
+                throw error;
+            });
+    }
+    return cardShards[shard];
+}
+
+// Append the next window of filtered results, fetching only the shards they live in
+function renderMoreResults() {
+    if (resultsLoading || resultsShown >= resultTools.length) {
+        return;
+    }
+    const generation = resultsGeneration;
+    const batch = resultTools.slice(resultsShown, resultsShown + RESULTS_WINDOW);
+    const shards = Array.from(new Set(batch.map(tool => Math.floor(tool / pagedIndex.size))));
+    resultsLoading = true;
+    
+    Promise.all(shards.map(loadCardShard))
+        .then(loaded => {
+            if (generation !== resultsGeneration) {
+                return;
+            }
+            const byShard = {};
+            shards.forEach((shard, i) => {
+                byShard[shard] = loaded[i];
+            });
+            const html = batch.map(tool => {
+                const shard = byShard[Math.floor(tool / pagedIndex.size)];
+                return shard.cards[tool - shard.start];
+            }).join('');
+            document.getElementById('toolsGrid').insertAdjacentHTML('beforeend', html);
+            resultsShown += batch.length;
+            resultsLoading = false;
+            renderMoreResultsNearBottom();
+        })
+        .catch(err => {
+            console.error('Failed to load tool cards: ', err);
+            if (generation === resultsGeneration) {
+                resultsLoading = false;
+            }
+        });
+}
+
+// Keep rendering result windows while the end of the list is on screen
+function renderMoreResultsNearBottom() {
+    if (resultTools.length > 0 && window.innerHeight + window.scrollY >= document.body.offsetHeight - 800) {
+        renderMoreResults();
+    }
+}
+
+// Filter by reading each card's title and tags from the DOM
+function filterToolsFromDom(searchTerm) {
     const toolItems = document.querySelectorAll('.tool-item');
     let visibleCount = 0;
     
@@ -73,11 +461,7 @@ function filterTools(searchTerm) {
         
         // Check tag filters
         let matchesFilters = true;
-        const allSelectedTags = [
-            ...selectedFilters.platform,
-            ...selectedFilters.presentation,
-            ...selectedFilters.capability
-        ];
+        const allSelectedTags = [].concat(...Object.values(selectedFilters));
         
         if (allSelectedTags.length > 0) {
             matchesFilters = allSelectedTags.every(selectedTag => 
@@ -94,16 +478,7 @@ function filterTools(searchTerm) {
         }
     });
     
-    // Update visible count
-    document.getElementById('visibleTools').textContent = visibleCount;
-    
-    // Show/hide no results message
-    const noResults = document.getElementById('noResults');
-    if (visibleCount === 0) {
-        noResults.style.display = 'block';
-    } else {
-        noResults.style.display = 'none';
-    }
+    return visibleCount;
 }
 
 // Copy lure link to clipboard
@@ -254,10 +629,16 @@ document.addEventListener('DOMContentLoaded', () => {
         });
     }
     
-    // Initialize with all tools visible
+    // Initialize with all tools visible (a page of the paginated index already has the corpus total)
     const totalTools = document.querySelectorAll('.tool-item').length;
-    document.getElementById('totalTools').textContent = totalTools;
-    document.getElementById('visibleTools').textContent = totalTools;
+    const totalToolsElement = document.getElementById('totalTools');
+    const toolsGrid = document.getElementById('toolsGrid');
+    if (totalToolsElement && !(toolsGrid && toolsGrid.hasAttribute('data-page-size'))) {
+        totalToolsElement.textContent = totalTools;
+        document.getElementById('visibleTools').textContent = totalTools;
+    }
+    
+    loadSearchIndex();
     
     // Set up lure card click handlers
     const lureItems = document.querySelectorAll('.lure-item');
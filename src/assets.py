@@ -0,0 +1,222 @@
+"""
+ClickFix Wiki Asset Pipeline
+Minifies HTML, CSS and JS output and names assets by content hash so they can be cached indefinitely
+"""
+
+import re
+from pathlib import PurePosixPath
+from typing import Iterable, List, Set, Tuple
+from .manifest import hash_bytes
+
+# Length of the content hash put into fingerprinted file names
+FINGERPRINT_LENGTH = 8
+
+# Elements whose text is not ordinary collapsible HTML whitespace
+_RAW_ELEMENT_RE = re.compile(r'(<(pre|textarea|script|style)\b[^>]*>)(.*?)(</\2\s*>)', re.S | re.I)
+_HTML_COMMENT_RE = re.compile(r'<!--(?!\[if).*?-->', re.S)
+# ASCII whitespace only: a non-breaking space next to a line break is content
+_HTML_SPACE = ' \t\r\f\v'
+
+_CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+_CSS_SPACE_RE = re.compile(r'\s+')
+_CSS_PUNCTUATION_RE = re.compile(r'\s*([{};,>])\s*')
+_CSS_COLON_RE = re.compile(r':\s+')
+
+_CLASS_ATTR_RE = re.compile(r'\sclass="([^"]*)"')
+_ID_ATTR_RE = re.compile(r'\sid="([^"]*)"')
+_SELECTOR_NOT_RE = re.compile(r':not\([^)]*\)')
+_SELECTOR_CLASS_RE = re.compile(r'\.([\w-]+)')
+_SELECTOR_ID_RE = re.compile(r'#([\w-]+)')
+# At-rules whose blocks hold style rules rather than declarations
+_CONDITIONAL_AT_RULES = ('@media', '@supports')
+
+def minify_css(css: str) -> str:
+    """Drop comments and the whitespace around CSS punctuation
+
+    Spaces before a colon are kept, since "a :hover" and "a:hover" select different elements.
+    """
+    css = _CSS_COMMENT_RE.sub('', css)
+    css = _CSS_SPACE_RE.sub(' ', css)
+    css = _CSS_PUNCTUATION_RE.sub(r'\1', css)
+    css = _CSS_COLON_RE.sub(':', css)
+    return css.replace(';}', '}').strip()
+
+def minify_js(js: str) -> str:
+    """Drop indentation, blank lines and whole-line // comments
+
+    Line breaks are kept so automatic semicolon insertion is unaffected; this is only safe
+    for code without multi-line template literals, which script.js and the templates avoid.
+    """
+    lines = []
+    for line in js.splitlines():
+        stripped = line.strip()
+        if stripped and not stripped.startswith('//'):
+            lines.append(stripped)
+    return "\n".join(lines)
+
+def _collapse_html(html: str) -> str:
+    html = _HTML_COMMENT_RE.sub('', html)
+    lines = html.split("\n")
+    if len(lines) == 1:
+        return html
+    # Only whitespace touching a line break goes; each run of it becomes a single "\n"
+    middle = [line.strip(_HTML_SPACE) for line in lines[1:-1]]
+    return "\n".join([lines[0].rstrip(_HTML_SPACE)] + [line for line in middle if line] +
+                     [lines[-1].lstrip(_HTML_SPACE)])
+
+def minify_html(html: str) -> str:
+    """Collapse indentation and blank lines between tags, and minify inline scripts and styles
+
+    A run of whitespace spanning lines renders like a single line break, so this never changes
+    layout; <pre> and <textarea> contents are left untouched.
+    """
+    parts = []
+    position = 0
+    for match in _RAW_ELEMENT_RE.finditer(html):
+        parts.append(_collapse_html(html[position:match.start()]))
+        tag = match.group(2).lower()
+        body = match.group(3)
+        if tag == 'script':
+            body = minify_js(body)
+        elif tag == 'style':
+            body = minify_css(body)
+        parts.append(_collapse_html(match.group(1)) + body + match.group(4))
+        position = match.end()
+    parts.append(_collapse_html(html[position:]))
+    return "".join(parts).strip() + "\n"
+
+def minify_asset(name: str, content: bytes) -> bytes:
+    """Minify a CSS or JS file by its extension; other files are returned as they are"""
+    suffix = PurePosixPath(name).suffix
+    if suffix == '.css':
+        return minify_css(content.decode('utf-8')).encode('utf-8')
+    if suffix == '.js':
+        return minify_js(content.decode('utf-8')).encode('utf-8')
+    return content
+
+def fingerprint_name(name: str, content: bytes) -> str:
+    """styles.css -> styles.<content hash>.css"""
+    path = PurePosixPath(name)
+    return str(path.with_name(f"{path.stem}.{hash_bytes(content)[:FINGERPRINT_LENGTH]}{path.suffix}"))
+
+def _read_prelude(css: str, position: int) -> Tuple[str, int]:
+    """Read up to the next "{", ";" or "}" outside quotes; return the text and the stop position"""
+    start = position
+    quote = None
+    while position < len(css):
+        char = css[position]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char in '{;}':
+            break
+        position += 1
+    return css[start:position], position
+
+def _skip_block(css: str, position: int) -> int:
+    """Position just past the block whose "{" is at position, honouring nesting and quotes"""
+    depth = 0
+    quote = None
+    while position < len(css):
+        char = css[position]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return position + 1
+        position += 1
+    return position
+
+def _parse_css(css: str, position: int = 0) -> Tuple[List[tuple], int]:
+    """Split a stylesheet into ('rule', selectors, text), ('group', prelude, children) and ('raw', text) items"""
+    items = []
+    while position < len(css):
+        prelude, stop = _read_prelude(css, position)
+        if stop >= len(css):
+            break
+        char = css[stop]
+        if char == '}':
+            return items, stop + 1
+        if char == ';':
+            items.append(('raw', css[position:stop + 1].strip()))
+            position = stop + 1
+            continue
+
+        prelude = prelude.strip()
+        if prelude.startswith(_CONDITIONAL_AT_RULES):
+            children, position = _parse_css(css, stop + 1)
+            items.append(('group', prelude, children))
+        else:
+            end = _skip_block(css, stop)
+            text = prelude + css[stop:end]
+            # @font-face, @keyframes and the like are kept whole
+            items.append(('raw', text) if prelude.startswith('@') else ('rule', prelude.split(','), text))
+            position = end
+    return items, position
+
+def page_tokens(html: str) -> Tuple[Set[str], Set[str]]:
+    """The class names and ids present in an HTML page"""
+    classes = set()
+    for value in _CLASS_ATTR_RE.findall(html):
+        classes.update(value.split())
+    return classes, set(_ID_ATTR_RE.findall(html))
+
+def selector_matches(selector: str, classes: Set[str], ids: Set[str]) -> bool:
+    """Whether every class and id a selector requires is on the page (element names are assumed present)"""
+    selector = _SELECTOR_NOT_RE.sub('', selector)
+    return (set(_SELECTOR_CLASS_RE.findall(selector)) <= classes and
+            set(_SELECTOR_ID_RE.findall(selector)) <= ids)
+
+def _critical_items(items: List[tuple], classes: Set[str], ids: Set[str]) -> List[str]:
+    kept = []
+    for item in items:
+        if item[0] == 'raw':
+            kept.append(item[1])
+        elif item[0] == 'group':
+            children = _critical_items(item[2], classes, ids)
+            if children:
+                kept.append(f"{item[1]}{{{''.join(children)}}}")
+        elif any(selector_matches(selector, classes, ids) for selector in item[1]):
+            kept.append(item[2])
+    return kept
+
+def extract_critical_css(css: str, pages: Iterable[str]) -> str:
+    """The rules of a stylesheet that can apply to the given pages as first rendered
+
+    Rules only reachable through classes added later by script (selected filters, copied
+    lures, ...) are left to the full stylesheet, which is loaded without blocking render.
+    """
+    classes: Set[str] = set()
+    ids: Set[str] = set()
+    for html in pages:
+        page_classes, page_ids = page_tokens(html)
+        classes |= page_classes
+        ids |= page_ids
+    items, _ = _parse_css(_CSS_COMMENT_RE.sub('', css))
+    return minify_css("".join(_critical_items(items, classes, ids)))
+
+def stylesheet_links_html(href: str, inline_css: str = "", defer: bool = False,
+                          icons_href: str = None, indent: str = "    ") -> str:
+    """Head markup for a page's styles: optional inline CSS, then the stylesheet and icon links
+
+    Deferred stylesheets are preloaded and applied once loaded, so they no longer block
+    first render (with a <noscript> fallback).
+    """
+    lines = [f'<style>{inline_css}</style>'] if inline_css else []
+    for url in (href, icons_href):
+        if not url:
+            continue
+        if defer:
+            lines.append(f'<link rel="preload" href="{url}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">')
+            lines.append(f'<noscript><link rel="stylesheet" href="{url}"></noscript>')
+        else:
+            lines.append(f'<link rel="stylesheet" href="{url}">')
+    return f"\n{indent}".join(lines)
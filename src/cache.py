@@ -0,0 +1,110 @@
+"""
+ClickFix Wiki Parse Cache
+Keeps parsed technique YAML (as corpus records) on disk so unchanged files are not re-parsed every build
+"""
+
+import os
+import pickle
+import yaml
+from pathlib import Path
+from typing import Dict, Any, Callable, Iterable, Tuple
+
+# The libyaml bindings are several times faster than the pure-Python loader
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# Bump whenever the cache file layout changes; callers converting documents version what they produce
+CACHE_VERSION = 2
+
+def load_yaml(stream) -> Any:
+    """Parse YAML with the fastest available safe loader"""
+    return yaml.load(stream, Loader=SafeLoader)
+
+class ParseCache:
+    """Parsed YAML documents keyed on file path, invalidated by mtime and size
+
+    With a convert function, what is cached (and returned) is convert(document, file_path),
+    so the conversion happens once per file change rather than once per build.
+    """
+
+    def __init__(self, cache_path: Path, convert: Callable[[Any, Path], Any] = None, version: Any = None):
+        self.cache_path = cache_path
+        self.convert = convert
+        # Callers caching something other than parsed YAML pass their own version on top of ours
+        self.version = CACHE_VERSION if version is None else f"{CACHE_VERSION}:{version}"
+        # Loaded on first use: builders that only render (worker processes) never read the cache
+        self._entries: Dict[str, Tuple[int, int, Any]] = None
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+
+    @property
+    def entries(self) -> Dict[str, Tuple[int, int, Any]]:
+        if self._entries is None:
+            self._entries = self.load()
+        return self._entries
+
+    def load(self) -> Dict[str, Tuple[int, int, Any]]:
+        """Load the cache written by a previous run"""
+        try:
+            with open(self.cache_path, 'rb') as f:
+                data = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError, TypeError):
+            return {}
+
+        if not isinstance(data, dict) or data.get('version') != self.version:
+            return {}
+        return data.get('entries', {})
+
+    def get(self, file_path: Path) -> Any:
+        """Return the parsed contents of a file, parsing it only if it changed"""
+        stat, found, data = self.lookup(file_path)
+        if found:
+            return data
+
+        with open(file_path, 'rb') as f:
+            data = load_yaml(f)
+        if self.convert is not None:
+            data = self.convert(data, file_path)
+        self.store(file_path, stat, data)
+        return data
+
+    def lookup(self, file_path: Path) -> Tuple[os.stat_result, bool, Any]:
+        """Stat a file and return (stat, found, cached value); found is False if it changed since it was cached
+
+        Together with store() this lets callers produce values elsewhere (e.g. in worker processes).
+        """
+        stat = os.stat(file_path)
+        cached = self.entries.get(str(file_path))
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            self.hits += 1
+            return stat, True, cached[2]
+        self.misses += 1
+        return stat, False, None
+
+    def store(self, file_path: Path, stat: os.stat_result, value: Any) -> None:
+        """Cache a value for a file as it was when stat was taken"""
+        self.entries[str(file_path)] = (stat.st_mtime_ns, stat.st_size, value)
+        self.dirty = True
+
+    def prune(self, file_paths: Iterable[Path]) -> None:
+        """Forget files that no longer exist (anything not in file_paths)"""
+        keep = {str(file_path) for file_path in file_paths}
+        for key in list(self.entries):
+            if key not in keep:
+                del self.entries[key]
+                self.dirty = True
+
+    def save(self) -> None:
+        """Write the cache atomically if anything changed"""
+        if not self.dirty:
+            return
+
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_name(self.cache_path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'version': self.version, 'entries': self.entries}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.cache_path)
+        self.dirty = False
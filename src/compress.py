@@ -0,0 +1,58 @@
+"""
+ClickFix Wiki Precompression
+Compresses text outputs into .gz and .br siblings for servers and CDNs that serve precompressed files
+"""
+
+import os
+import gzip
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Iterator, Tuple
+
+# brotli is optional; without it only .gz siblings are written
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+TEXT_SUFFIXES = {'.html', '.css', '.js', '.json', '.svg', '.xml', '.txt'}
+
+# Smaller files gain too little to be worth a compressed variant
+MIN_SIZE = 256
+
+def compressed_formats() -> List[str]:
+    """Sibling extensions that can be written with the installed libraries"""
+    return ['gz', 'br'] if brotli is not None else ['gz']
+
+def is_compressible(path: Path) -> bool:
+    """Whether an output is a text file large enough to precompress"""
+    return path.suffix in TEXT_SUFFIXES and path.stat().st_size >= MIN_SIZE
+
+def compress(data: bytes, fmt: str) -> bytes:
+    """Compress at the highest level; output is deterministic (no gzip timestamp)"""
+    if fmt == 'gz':
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    return brotli.compress(data, quality=11)
+
+def compress_file(path: Path, formats: List[str]) -> Dict[str, bytes]:
+    """Compress a file in each of the given formats"""
+    data = path.read_bytes()
+    return {fmt: compress(data, fmt) for fmt in formats}
+
+def _compress_task(task: Tuple[Path, List[str]]) -> Dict[str, bytes]:
+    return compress_file(*task)
+
+def compress_files(tasks: List[Tuple[Path, List[str]]], jobs: int = None) -> Iterator[Tuple[Path, Dict[str, bytes]]]:
+    """Compress (path, formats) tasks across jobs processes (all cores by default); yield (path, compressed data)
+
+    Writing is left to the caller, so every output goes through the same writer.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if jobs <= 1 or len(tasks) <= 1:
+        for path, formats in tasks:
+            yield path, compress_file(path, formats)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        chunk_size = max(1, len(tasks) // (jobs * 4))
+        yield from zip((path for path, _ in tasks), executor.map(_compress_task, tasks, chunksize=chunk_size))
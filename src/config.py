@@ -9,8 +9,9 @@ from typing import Dict, Any
 from .utils import render_markdown
 
 class ConfigLoader:
-    def __init__(self, config_path: Path = Path("config.yml")):
+    def __init__(self, config_path: Path = Path("config.yml"), quiet: bool = False):
         self.config_path = config_path
+        self.quiet = quiet
         self.config = self.load_config()
     
     def load_config(self) -> Dict[str, Any]:
@@ -20,7 +21,8 @@ class ConfigLoader:
                 config = yaml.safe_load(f)
             
             # Don't process markdown for template values - keep them as raw strings
-            print(f"Loaded configuration from {self.config_path}")
+            if not self.quiet:
+                print(f"Loaded configuration from {self.config_path}")
             return config
         except Exception as e:
             print(f"Error loading config: {e}")
@@ -0,0 +1,182 @@
+"""
+ClickFix Wiki Build Daemon
+Serves build requests from a long-running process over a Unix socket, so each request skips interpreter startup
+"""
+
+import io
+import sys
+import json
+import time
+import socket
+import contextlib
+import socketserver
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, TextIO
+
+# Only the standard library is imported here: the client side runs in every short-lived request process
+
+DEFAULT_SOCKET = Path(".cache") / "build.sock"
+
+# Seconds a client waits for a restarting daemon to listen again
+RESTART_TIMEOUT = 30.0
+
+# A handler is given a request's arguments, prints its output and returns an exit status
+Handler = Callable[[List[str]], int]
+
+def _send(wfile, message: Dict) -> None:
+    wfile.write(json.dumps(message).encode('utf-8') + b"\n")
+    wfile.flush()
+
+class _OutputStream(io.TextIOBase):
+    """Forwards what a handler prints to the client, a line at a time, as it is printed"""
+
+    def __init__(self, wfile):
+        self.wfile = wfile
+        self.pending = ""
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        self.pending += text
+        if "\n" in self.pending:
+            lines, self.pending = self.pending.rsplit("\n", 1)
+            _send(self.wfile, {'output': lines + "\n"})
+        return len(text)
+
+    def flush(self) -> None:
+        if self.pending:
+            _send(self.wfile, {'output': self.pending})
+            self.pending = ""
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """One request per connection: a JSON line in; output lines, then an exit status (or a restart notice), out"""
+
+    def handle(self) -> None:
+        server = self.server
+        try:
+            request = json.loads(self.rfile.readline() or b"null")
+            command, args = request['command'], list(request.get('args', []))
+        except (ValueError, TypeError, KeyError):
+            _send(self.wfile, {'output': "❌ Malformed request\n"})
+            _send(self.wfile, {'status': 2})
+            return
+
+        if server.needs_restart is not None and server.needs_restart():
+            server.restarting = True
+            _send(self.wfile, {'restart': True})
+            return
+
+        stream = _OutputStream(self.wfile)
+        with contextlib.redirect_stdout(stream), contextlib.redirect_stderr(stream):
+            if command == "ping":
+                status = 0
+            elif command == "stop":
+                server.stopping = True
+                print("👋 Build daemon stopping")
+                status = 0
+            elif command not in server.handlers:
+                print(f"❌ Unknown command: {command} (available: {', '.join(sorted(server.handlers))}, ping, stop)")
+                status = 2
+            else:
+                try:
+                    status = server.handlers[command](args)
+                except SystemExit as e:
+                    # argparse exits on bad options; that ends the request, not the daemon
+                    status = e.code if isinstance(e.code, int) else 2
+                except Exception as e:
+                    print(f"❌ {command} failed: {e}")
+                    status = 1
+            stream.flush()
+        _send(self.wfile, {'status': status})
+
+    def finish(self) -> None:
+        # A client that went away mid-request is not the daemon's problem
+        with contextlib.suppress(OSError):
+            super().finish()
+
+class BuildDaemon(socketserver.UnixStreamServer):
+    """Runs handlers one request at a time, in this process, against whatever state they keep warm
+
+    Requests are never concurrent: handlers share one builder and the process's stdout.
+    needs_restart is asked before every request; when it returns True the client is told
+    to retry and serve() returns so the caller can re-execute the daemon.
+    Raises RuntimeError if another daemon is already listening on the socket.
+    """
+
+    def __init__(self, socket_path: Path, handlers: Dict[str, Handler],
+                 needs_restart: Callable[[], bool] = None):
+        self.socket_path = Path(socket_path)
+        self.handlers = handlers
+        self.needs_restart = needs_restart
+        self.stopping = False
+        self.restarting = False
+        if self.socket_path.exists():
+            existing = _connect(self.socket_path)
+            if existing is not None:
+                existing.close()
+                raise RuntimeError(f"a build daemon is already listening on {self.socket_path}")
+            # Left behind by a daemon that did not shut down cleanly
+            self.socket_path.unlink()
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        super().__init__(str(self.socket_path), _RequestHandler)
+
+    def serve(self) -> bool:
+        """Handle requests until a client stops the daemon; return True if it should be restarted instead"""
+        while not (self.stopping or self.restarting):
+            self.handle_request()
+        return self.restarting
+
+    def server_close(self) -> None:
+        super().server_close()
+        with contextlib.suppress(FileNotFoundError):
+            self.socket_path.unlink()
+
+def _connect(socket_path: Path) -> Optional[socket.socket]:
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(str(socket_path))
+    except (FileNotFoundError, ConnectionRefusedError):
+        connection.close()
+        return None
+    return connection
+
+def request(command: str, args: List[str] = (), socket_path: Path = DEFAULT_SOCKET,
+            output: TextIO = None) -> Optional[int]:
+    """Send one request to the daemon, writing its output as it arrives; return its exit status
+
+    Returns None when no daemon is listening. A daemon that restarts to load changed code
+    is waited for (up to RESTART_TIMEOUT) and sent the request again.
+    """
+    output = output or sys.stdout
+    payload = json.dumps({'command': command, 'args': list(args)}).encode('utf-8') + b"\n"
+    # Set once the daemon has asked for a retry: until then, no daemon means None
+    deadline = None
+    while True:
+        connection = _connect(socket_path)
+        if connection is None and deadline is None:
+            return None
+        if connection is not None:
+            try:
+                with connection, connection.makefile('rb') as responses:
+                    connection.sendall(payload)
+                    for line in responses:
+                        message = json.loads(line)
+                        if 'output' in message:
+                            output.write(message['output'])
+                            output.flush()
+                        elif 'status' in message:
+                            return message['status']
+                        elif message.get('restart'):
+                            deadline = time.monotonic() + RESTART_TIMEOUT
+                            break
+                    else:
+                        # The old daemon can accept a connection just before it closes its socket
+                        if deadline is None:
+                            raise ConnectionError(f"build daemon on {socket_path} closed the connection mid-request")
+            except (BrokenPipeError, ConnectionResetError):
+                if deadline is None:
+                    raise
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"build daemon on {socket_path} did not come back after restarting")
+        time.sleep(0.05)
@@ -0,0 +1,251 @@
+"""
+ClickFix Wiki Development Server
+Renders pages on demand from a warm builder and pushes live-reload events to open browsers
+"""
+
+import json
+import time
+import uuid
+import mimetypes
+import threading
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+from .manifest import hash_data, hash_file
+from .models import summarize_entry
+from .search import search_record, build_facets, build_search_index
+from .fulltext import FullTextIndexer
+
+RELOAD_ROUTE = "/__livereload"
+
+# Injected before </body> of every HTML response; reloads on a rebuild, or once the
+# server comes back after restarting (a new boot id)
+RELOAD_SCRIPT = b"""<script>
+(function () {
+    const source = new EventSource("/__livereload");
+    let boot = null;
+    source.addEventListener("hello", function (event) {
+        if (boot !== null && boot !== event.data) location.reload();
+        boot = event.data;
+    });
+    source.addEventListener("reload", function () { location.reload(); });
+})();
+</script>
+"""
+
+# Seconds between keep-alive comments on an idle reload stream
+HEARTBEAT_SECONDS = 15
+
+class DevSite:
+    """The site's routes, rendered on first request and cached until refresh() finds their inputs changed
+
+    Every route carries an input hash computed the same way as the build manifest's, so a
+    refresh after an edit only drops the routes that edit affects. Nothing is written to
+    the output directory.
+    """
+
+    def __init__(self, builder):
+        self.builder = builder
+        # Rendering shares one Jinja environment and Markdown converter, so renders are serialised
+        self.lock = threading.RLock()
+        self.routes: Dict[str, Tuple[str, Callable[[], Iterable[str]]]] = {}
+        self.cache: Dict[str, Tuple[str, bytes]] = {}
+        self.derived: Dict[str, tuple] = {}
+        self.fulltext = FullTextIndexer(builder.cache_dir / "fulltext.pickle")
+        self.fulltext_outputs = None
+        self.renders = 0
+        self.boot_id = uuid.uuid4().hex
+        self.generation = 0
+        self.reloaded = threading.Condition()
+        self.refresh()
+
+    def refresh(self) -> int:
+        """Reload the corpus and recompute every route's input hash; return the cached routes dropped"""
+        with self.lock:
+            builder = self.builder
+            builder.templates = {}
+            builder.page_processor.invalidate()
+            pages = builder.page_processor.get_all_pages()
+            shared_hash = builder.get_shared_hash(pages)
+            entry_template_hash = hash_file(builder.templates_dir / 'entry.html.j2')
+            index_template_hash = hash_file(builder.templates_dir / 'index.html.j2')
+
+            routes = {}
+            derived_entries = {}
+            summaries = []
+            records = []
+            self.fulltext.begin()
+            for entry in builder.get_all_entries():
+                derived = self.derived.get(entry.id)
+                if derived is None or derived[0] is not entry:
+                    derived = (entry, summarize_entry(entry), search_record(entry))
+                derived_entries[entry.id] = derived
+                _, summary, record = derived
+                summaries.append(summary)
+                records.append(record)
+                self.fulltext.add(entry)
+                routes[f"/pages/{entry.id}.html"] = (
+                    hash_data([shared_hash, entry_template_hash, entry.content_hash]),
+                    partial(builder.render_task, 'entry', entry)
+                )
+            self.derived = derived_entries
+            self.fulltext_outputs = None
+
+            for page in pages:
+                routes[f"/pages/{page['slug']}.html"] = (hash_data([shared_hash, page]),
+                                                         partial(builder.render_task, 'page', page))
+
+            def render_index():
+                return builder.stream_index_html(summaries, build_facets(records))
+
+            def render_search_index():
+                return [json.dumps(build_search_index(records), separators=(',', ':'), ensure_ascii=False)]
+
+            routes["/index.html"] = (hash_data([shared_hash, index_template_hash, summaries]), render_index)
+            routes["/search-index.json"] = (hash_data([shared_hash, records]), render_search_index)
+
+            stale = [route for route, (input_hash, _) in self.cache.items()
+                     if not route.startswith("/search/") and routes.get(route, (None,))[0] != input_hash]
+            for route in stale:
+                del self.cache[route]
+            self.routes = routes
+            return len(stale)
+
+    def search_route(self, route: str) -> Optional[Tuple[str, Callable[[], Iterable[str]]]]:
+        """Full-text shards are only indexed once a browser asks for one"""
+        if self.fulltext_outputs is None:
+            self.fulltext_outputs = self.fulltext.outputs()
+        output = self.fulltext_outputs.get(route[len("/search/"):-len(".json")])
+        if output is None:
+            return None
+        shard_hash, shard = output
+        return shard_hash, lambda: [json.dumps(shard, separators=(',', ':'), ensure_ascii=False)]
+
+    def get(self, route: str) -> Optional[Tuple[bytes, str]]:
+        """(body, content type) for a route, or None if the site has nothing there"""
+        if route.endswith("/"):
+            route += "index.html"
+        content_type = mimetypes.guess_type(route)[0] or 'application/octet-stream'
+
+        with self.lock:
+            if route.startswith("/search/") and route.endswith(".json"):
+                target = self.search_route(route)
+            else:
+                target = self.routes.get(route)
+            if target is not None:
+                input_hash, render = target
+                cached = self.cache.get(route)
+                if cached is None or cached[0] != input_hash:
+                    start = time.perf_counter()
+                    body = "".join(render()).encode('utf-8')
+                    if content_type == 'text/html':
+                        body = inject_reload_script(body)
+                    self.cache[route] = cached = (input_hash, body)
+                    self.renders += 1
+                    print(f"🖨️  Rendered {route} in {(time.perf_counter() - start) * 1000:.0f} ms")
+                return cached[1], content_type
+
+        path = self.static_path(route)
+        if path is None:
+            return None
+        return path.read_bytes(), content_type
+
+    def static_path(self, route: str) -> Optional[Path]:
+        """Source file behind a static asset route, read straight from the working tree"""
+        relative = route.lstrip("/")
+        for src, dst in self.builder.STATIC_ASSETS:
+            src_path = Path(src)
+            if relative == dst and src_path.is_file():
+                return src_path
+            if relative.startswith(dst + "/") and src_path.is_dir():
+                path = (src_path / relative[len(dst) + 1:]).resolve()
+                if path.is_file() and path.is_relative_to(src_path.resolve()):
+                    return path
+        return None
+
+    def notify_reload(self) -> None:
+        """Tell every open reload stream that the site changed"""
+        with self.reloaded:
+            self.generation += 1
+            self.reloaded.notify_all()
+
+    def wait_for_reload(self, generation: int, timeout: float) -> int:
+        """Block until the generation moves past the given one, or timeout; return the current generation"""
+        with self.reloaded:
+            self.reloaded.wait_for(lambda: self.generation != generation, timeout)
+            return self.generation
+
+def inject_reload_script(body: bytes) -> bytes:
+    """Insert the live-reload client before the closing body tag"""
+    index = body.rfind(b"</body>")
+    if index < 0:
+        return body + RELOAD_SCRIPT
+    return body[:index] + RELOAD_SCRIPT + body[index:]
+
+class DevRequestHandler(BaseHTTPRequestHandler):
+    """Serves DevSite routes plus a server-sent events stream of reloads"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        route = unquote(urlsplit(self.path).path)
+        if route == RELOAD_ROUTE:
+            self.stream_reloads()
+            return
+
+        try:
+            found = self.server.site.get(route)
+        except Exception as e:
+            print(f"❌ Failed to render {route}: {e}")
+            self.send_error(500, str(e))
+            return
+        if found is None:
+            self.send_error(404)
+            return
+
+        body, content_type = found
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-cache, no-store, must-revalidate')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def stream_reloads(self):
+        """Hold the connection open and send a reload event whenever the site changes"""
+        site = self.server.site
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        generation = site.generation
+        try:
+            self.wfile.write(f"event: hello\ndata: {site.boot_id}\n\n".encode('utf-8'))
+            self.wfile.flush()
+            while True:
+                current = site.wait_for_reload(generation, HEARTBEAT_SECONDS)
+                if current != generation:
+                    generation = current
+                    self.wfile.write(f"event: reload\ndata: {generation}\n\n".encode('utf-8'))
+                else:
+                    # Comments keep proxies from closing the stream and reveal closed browsers
+                    self.wfile.write(b": ping\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        # Renders are logged by DevSite; per-request lines would drown them
+        pass
+
+def create_dev_server(site: DevSite, port: int = 8000) -> ThreadingHTTPServer:
+    """A threaded HTTP server for a DevSite, so reload streams never block page requests"""
+    httpd = ThreadingHTTPServer(("", port), DevRequestHandler)
+    httpd.daemon_threads = True
+    httpd.site = site
+    return httpd
@@ -0,0 +1,538 @@
+"""
+ClickFix Wiki Full-Text Search
+Builds the sharded inverted index over lure content that script.js queries, and reads it back for offline queries
+"""
+
+import os
+import json
+import math
+import heapq
+import pickle
+import shutil
+import tempfile
+from bisect import bisect_left, insort
+from collections import Counter
+from itertools import accumulate
+from pathlib import Path
+from typing import Dict, List, Any, Iterator, Set, Tuple
+from .manifest import hash_data
+from .search import tokenize
+from .models import Technique, Lure
+
+FULLTEXT_VERSION = 2
+
+# Terms are sharded on their first SHARD_PREFIX characters, so a query word needs exactly one shard
+SHARD_PREFIX = 2
+
+# Postings a streaming build buffers in memory before appending them to the per-shard spill files
+SPILL_RECORDS = 100000
+
+# Unused document numbers tolerated (beyond twice the documents in use) before every document is renumbered
+COMPACT_SLACK = 1024
+
+# Suffixes stripped by stem(), longest first. Only stripping (never rewriting) keeps every stem a
+# prefix of its word, so matching index terms that start with the query stem also finds the word itself.
+STEM_SUFFIXES = ('ational', 'ations', 'ements', 'ation', 'ement', 'ments', 'ingly', 'ment', 'ings',
+                 'edly', 'ing', 'ers', 'ies', 'ied', 'er', 'ed', 'es', 'ly', 'e', 's', 'y')
+
+def stem(token: str) -> str:
+    """Strip a common English suffix, leaving a stem of at least three characters (see script.js stem)"""
+    if len(token) <= 3 or token.isdigit() or token.endswith('ss'):
+        return token
+    for suffix in STEM_SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            return token[:-len(suffix)]
+    return token
+
+def index_terms(text: Any) -> List[str]:
+    """Stemmed terms of a piece of text, dropping ones too short to shard"""
+    return [stem(token) for token in tokenize(text) if len(token) >= SHARD_PREFIX]
+
+def lure_terms(entry: Technique, lure: Lure) -> Counter:
+    """Term frequencies for one lure: every text field, plus the tool name"""
+    terms = Counter(index_terms(entry.name))
+    for text in (lure.nickname, lure.preamble, lure.epilogue):
+        terms.update(index_terms(text))
+    for texts in (lure.steps, lure.mitigations, lure.references):
+        for text in texts:
+            terms.update(index_terms(text))
+    return terms
+
+def make_shards(postings: Dict[str, List[Tuple[int, int]]], keys: Set[str] = None) -> Dict[str, Dict[str, Any]]:
+    """Build the shards (or only those in keys) from sorted postings, keyed on term prefix
+
+    Each shard lists its terms in sorted order (so prefix matches are a contiguous
+    range) with, per term, the delta-encoded document numbers it occurs in and a flat
+    list of (position, count) pairs for the documents it occurs in more than once.
+    """
+    terms = sorted(term for term in postings if keys is None or term[:SHARD_PREFIX] in keys)
+
+    shards: Dict[str, Dict[str, Any]] = {}
+    for term in terms:
+        term_postings = postings[term]
+        shard = shards.setdefault(term[:SHARD_PREFIX], {'terms': [], 'docs': [], 'tf': []})
+        deltas = []
+        previous = 0
+        for doc, _ in term_postings:
+            deltas.append(doc - previous)
+            previous = doc
+        shard['terms'].append(term)
+        shard['docs'].append(deltas)
+        # Most terms occur once per lure, so only the exceptions are stored
+        shard['tf'].append([value for position, (_, count) in enumerate(term_postings) if count > 1
+                            for value in (position, count)])
+    return shards
+
+# (old documents, old terms, new documents, new terms) of a technique whose documents changed
+Change = Tuple[List[int], List[Counter], List[int], List[Counter]]
+
+class FullTextIndexer:
+    """Collects per-lure terms for a build, reusing the terms of entries that did not change
+
+    Every lure is a document whose number stays put across builds: each technique owns a
+    block of numbers (see allocate()), so adding, changing or removing one technique only
+    changes the shards holding its terms. One indexer can serve several builds (see
+    begin()); a later build only patches the postings of the techniques that changed.
+    A streaming build keeps no terms in memory: it spills (term, document, count) records
+    to a file per shard and builds the shards one at a time (see iter_outputs()).
+    """
+
+    def __init__(self, cache_path: Path):
+        self.cache_path = cache_path
+        self.blocks_path = cache_path.with_name(cache_path.stem + "-blocks.pickle")
+        # Read by the first begin() (see the properties below), not when the indexer is created
+        self._current: Dict[str, Tuple[str, List[Counter]]] = None
+        self._blocks: Dict[str, Tuple[int, int]] = None
+        self.previous: Dict[str, Tuple[str, List[Counter]]] = {}
+        self.previous_blocks: Dict[str, Tuple[int, int]] = {}
+        # Document numbers below size have been handed out
+        self.size = 0
+        self.seen: Set[str] = set()
+        # Techniques in search index order, and their lure counts
+        self.order: List[str] = []
+        self.counts: List[int] = []
+        self.changes: List[Change] = []
+        self.document_count = 0
+        self.shard_count = 0
+        self.postings: Dict[str, List[Tuple[int, int]]] = None
+        self.built: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        self.streaming = False
+        self.spill_dir: Path = None
+        self.spilled: Dict[str, List[str]] = {}
+        self.spilled_records = 0
+        self.hits = 0
+        self.misses = 0
+        self.pending = False
+        self.dirty = False
+        self.blocks_dirty = False
+
+    @property
+    def current(self) -> Dict[str, Tuple[str, List[Counter]]]:
+        if self._current is None:
+            self._current = self.load()
+        return self._current
+
+    @current.setter
+    def current(self, value: Dict[str, Tuple[str, List[Counter]]]) -> None:
+        self._current = value
+
+    @property
+    def blocks(self) -> Dict[str, Tuple[int, int]]:
+        """Technique id -> (first document number, capacity)"""
+        if self._blocks is None:
+            self._blocks, self.size = self.load_blocks()
+        return self._blocks
+
+    def load(self) -> Dict[str, Tuple[str, List[Counter]]]:
+        """Load the per-entry terms kept by a previous build"""
+        try:
+            with open(self.cache_path, 'rb') as f:
+                data = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return {}
+
+        if not isinstance(data, dict) or data.get('version') != FULLTEXT_VERSION:
+            return {}
+        return data.get('entries', {})
+
+    def load_blocks(self) -> Tuple[Dict[str, Tuple[int, int]], int]:
+        """Load the document numbers handed out by previous builds (kept apart from the much larger terms)"""
+        try:
+            with open(self.blocks_path, 'rb') as f:
+                data = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return {}, 0
+
+        if not isinstance(data, dict) or data.get('version') != FULLTEXT_VERSION:
+            return {}, 0
+        return data.get('blocks', {}), data.get('size', 0)
+
+    def begin(self, streaming: bool = False) -> None:
+        """Start collecting the documents of a new build (spilling them to disk when streaming)"""
+        blocks = self.blocks
+        if self.size > 2 * sum(capacity for _, capacity in blocks.values()) + COMPACT_SLACK:
+            # Removed and grown techniques left too many unused numbers: number every document afresh
+            blocks.clear()
+            self.size = 0
+            self.postings = None
+            self.blocks_dirty = True
+        self.previous_blocks = dict(blocks)
+        self.seen = set()
+        self.order = []
+        self.counts = []
+        if self.pending:
+            # The last build's changes and removals never reached the postings, so they cannot be patched
+            self.postings = None
+        self.pending = True
+        self.changes = []
+        self.document_count = 0
+        self.hits = 0
+        self.misses = 0
+        self.streaming = streaming
+        if streaming:
+            # The term cache is neither read nor updated, and postings are rebuilt from the spill files
+            self.postings = None
+            self.built = {}
+            self.spill_dir = Path(tempfile.mkdtemp(prefix="fulltext-"))
+            self.spilled = {}
+            self.spilled_records = 0
+        else:
+            self.previous, self.current = self.current, {}
+
+    def allocate(self, technique_id: str, count: int) -> List[int]:
+        """Document numbers for a technique's lures: its block, or a new one at the end if it outgrew it"""
+        block = self.blocks.get(technique_id)
+        if block is None or block[1] < count:
+            block = self.blocks[technique_id] = (self.size, count)
+            self.size += count
+            self.blocks_dirty = True
+        return list(range(block[0], block[0] + count))
+
+    def add(self, entry: Technique) -> None:
+        """Add an entry's lures as documents, in search index tool order"""
+        docs = self.allocate(entry.id, entry.lure_count)
+        self.seen.add(entry.id)
+        self.order.append(entry.id)
+        self.counts.append(len(docs))
+        self.document_count += len(docs)
+        if self.streaming:
+            for doc, lure in zip(docs, entry.lures):
+                self.spill(doc, lure_terms(entry, lure))
+            self.misses += 1
+            return
+
+        entry_hash = entry.content_hash
+        cached = self.previous.get(entry.id)
+        if cached is not None and cached[0] == entry_hash:
+            lures = cached[1]
+            self.hits += 1
+        else:
+            lures = [lure_terms(entry, lure) for lure in entry.lures]
+            self.misses += 1
+            self.dirty = True
+        self.current[entry.id] = (entry_hash, lures)
+
+        old_block = self.previous_blocks.get(entry.id)
+        old_lures = cached[1] if cached is not None and old_block is not None else []
+        old_docs = list(range(old_block[0], old_block[0] + len(old_lures))) if old_lures else []
+        if old_lures is not lures or old_docs != docs:
+            self.changes.append((old_docs, old_lures, docs, lures))
+
+    def spill(self, doc: int, terms: Counter) -> None:
+        """Buffer a document's postings, writing them out to their shards' files every SPILL_RECORDS"""
+        for term, count in terms.items():
+            self.spilled.setdefault(term[:SHARD_PREFIX], []).append(f"{term}\t{doc}\t{count}\n")
+        self.spilled_records += len(terms)
+        if self.spilled_records >= SPILL_RECORDS:
+            self.flush_spill()
+
+    def flush_spill(self) -> None:
+        for key, lines in self.spilled.items():
+            with open(self.spill_dir / f"{key}.tsv", 'a', encoding='utf-8') as f:
+                f.writelines(lines)
+        self.spilled = {}
+        self.spilled_records = 0
+
+    def free_removed(self) -> List[Tuple[str, Tuple[int, int]]]:
+        """Release the blocks of techniques this build did not add; return them"""
+        removed = [(technique_id, block) for technique_id, block in self.blocks.items()
+                   if technique_id not in self.seen]
+        for technique_id, _ in removed:
+            del self.blocks[technique_id]
+        if removed:
+            self.blocks_dirty = True
+        return removed
+
+    def documents(self) -> Dict[str, Any]:
+        """Map document numbers back to tools: tool i owns documents bases[i] to bases[i] + counts[i] - 1"""
+        return {'version': FULLTEXT_VERSION, 'prefix': SHARD_PREFIX, 'size': self.size,
+                'bases': [self.blocks[technique_id][0] for technique_id in self.order], 'counts': self.counts}
+
+    def collect_postings(self) -> Dict[str, List[Tuple[int, int]]]:
+        """(document, count) pairs of every term, in document order"""
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        for technique_id, (_, lures) in self.current.items():
+            base = self.blocks[technique_id][0]
+            for offset, terms in enumerate(lures):
+                for term, count in terms.items():
+                    postings.setdefault(term, []).append((base + offset, count))
+        for term_postings in postings.values():
+            term_postings.sort()
+        return postings
+
+    def apply_changes(self) -> Set[str]:
+        """Patch the postings for techniques whose documents changed; return the shard keys affected"""
+        touched = set()
+        for old_docs, old_lures, _, _ in self.changes:
+            for doc, terms in zip(old_docs, old_lures):
+                for term in terms:
+                    postings = self.postings[term]
+                    del postings[bisect_left(postings, (doc, 0))]
+                    if not postings:
+                        del self.postings[term]
+                    touched.add(term)
+        for _, _, new_docs, new_lures in self.changes:
+            for doc, terms in zip(new_docs, new_lures):
+                for term, count in terms.items():
+                    insort(self.postings.setdefault(term, []), (doc, count))
+                    touched.add(term)
+        return {term[:SHARD_PREFIX] for term in touched}
+
+    def outputs(self) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+        """Every shard plus "docs", keyed on file name stem, as (content hash, data)
+
+        Shards untouched since the previous build of this indexer are reused with their hash.
+        Not for streaming builds (see iter_outputs()).
+        """
+        for technique_id, block in self.free_removed():
+            cached = self.previous.get(technique_id)
+            if cached is not None:
+                self.changes.append((list(range(block[0], block[0] + len(cached[1]))), cached[1], [], []))
+        if self.previous.keys() - self.current.keys():
+            self.dirty = True
+
+        if self.postings is not None:
+            keys = self.apply_changes()
+            outputs = {key: built for key, built in self.built.items() if key not in keys}
+        else:
+            self.postings = self.collect_postings()
+            keys = None
+            outputs = {}
+        self.changes = []
+        self.pending = False
+
+        for key, shard in make_shards(self.postings, keys).items():
+            outputs[key] = (hash_data(shard), shard)
+        self.built = dict(outputs)
+        self.shard_count = len(outputs)
+        documents = self.documents()
+        outputs['docs'] = (hash_data(documents), documents)
+        return outputs
+
+    def iter_outputs(self) -> Iterator[Tuple[str, Tuple[str, Dict[str, Any]]]]:
+        """outputs() one at a time; a streaming build only ever holds one shard's postings"""
+        if not self.streaming:
+            yield from self.outputs().items()
+            return
+
+        self.free_removed()
+        self.flush_spill()
+        self.shard_count = 0
+        try:
+            for spill_path in sorted(self.spill_dir.glob("*.tsv")):
+                postings: Dict[str, List[Tuple[int, int]]] = {}
+                with open(spill_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        term, doc, count = line.split('\t')
+                        postings.setdefault(term, []).append((int(doc), int(count)))
+                for term_postings in postings.values():
+                    term_postings.sort()
+                shard = make_shards(postings)[spill_path.stem]
+                self.shard_count += 1
+                yield spill_path.stem, (hash_data(shard), shard)
+        finally:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+        documents = self.documents()
+        yield 'docs', (hash_data(documents), documents)
+
+    def save(self) -> None:
+        """Keep the terms of this build's entries and the document numbers handed out, if either changed"""
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.dirty:
+            self._dump(self.cache_path, {'version': FULLTEXT_VERSION, 'entries': self.current})
+            self.dirty = False
+        if self.blocks_dirty:
+            self._dump(self.blocks_path, {'version': FULLTEXT_VERSION, 'blocks': self.blocks, 'size': self.size})
+            self.blocks_dirty = False
+
+    @staticmethod
+    def _dump(path: Path, data: Dict[str, Any]) -> None:
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+class TermPostings:
+    """Decoded postings of one term: ascending document numbers and their tf-idf scores"""
+
+    def __init__(self, deltas: List[int], counts: List[int], document_count: int):
+        self.docs = list(accumulate(deltas))
+        self.counts = dict(zip(counts[::2], counts[1::2]))
+        self.idf = math.log(1 + document_count / len(self.docs))
+        self.best = self.weight(max(self.counts.values(), default=1))
+        self.repeated = None
+
+    def weight(self, count: int) -> float:
+        """Score of a document the term occurs in `count` times"""
+        return (1 + math.log(count)) * self.idf
+
+    def score(self, doc: int) -> float:
+        """Score of a document, or 0.0 if the term does not occur in it"""
+        position = bisect_left(self.docs, doc)
+        if position == len(self.docs) or self.docs[position] != doc:
+            return 0.0
+        return self.weight(self.counts.get(position, 1))
+
+    def ranked(self) -> Iterator[Tuple[float, int]]:
+        """(score, doc) best first, ties in document order, without sorting every posting"""
+        if self.repeated is None:
+            # Positions were inserted in ascending order and the sort is stable, so ties stay in document order
+            self.repeated = sorted(self.counts, key=self.counts.__getitem__, reverse=True)
+        for position in self.repeated:
+            yield self.weight(self.counts[position]), self.docs[position]
+        single = self.weight(1)
+        for position, doc in enumerate(self.docs):
+            if position not in self.counts:
+                yield single, doc
+
+class FullTextIndex:
+    """Query API over a built site's search/ shards, loading shards on demand like script.js does"""
+
+    def __init__(self, site_dir: Path):
+        self.index_dir = Path(site_dir) / "search"
+        with open(Path(site_dir) / "search-index.json", 'r', encoding='utf-8') as f:
+            self.ids = json.load(f)['ids']
+        with open(self.index_dir / "docs.json", 'r', encoding='utf-8') as f:
+            documents = json.load(f)
+        self.bases, self.counts = documents['bases'], documents['counts']
+        # Tool position of every document number; None for numbers no tool owns
+        self.tools: List[int] = [None] * documents['size']
+        for tool, (base, count) in enumerate(zip(self.bases, self.counts)):
+            self.tools[base:base + count] = [tool] * count
+        self.document_count = sum(self.counts)
+        self.shards: Dict[str, Dict[str, Any]] = {}
+        self.postings: Dict[Tuple[str, int], TermPostings] = {}
+
+    def shard(self, key: str) -> Dict[str, Any]:
+        """Load a shard once; a missing shard means no term has that prefix"""
+        shard = self.shards.get(key)
+        if shard is None:
+            try:
+                with open(self.index_dir / f"{key}.json", 'r', encoding='utf-8') as f:
+                    shard = json.load(f)
+            except FileNotFoundError:
+                shard = {'terms': [], 'docs': [], 'tf': []}
+            self.shards[key] = shard
+        return shard
+
+    def word_postings(self, word: str) -> List[TermPostings]:
+        """Postings of every term that starts with the word's stem"""
+        prefix = stem(word)
+        key = prefix[:SHARD_PREFIX]
+        shard = self.shard(key)
+        terms = shard['terms']
+        position = bisect_left(terms, prefix)
+        matches = []
+        while position < len(terms) and terms[position].startswith(prefix):
+            postings = self.postings.get((key, position))
+            if postings is None:
+                postings = self.postings[(key, position)] = TermPostings(
+                    shard['docs'][position], shard['tf'][position], self.document_count)
+            matches.append(postings)
+            position += 1
+        return matches
+
+    def query_postings(self, query: str) -> List[List[TermPostings]]:
+        """Postings of every query word, rarest first"""
+        words = [token for token in tokenize(query) if len(token) >= SHARD_PREFIX]
+        word_postings = [self.word_postings(word) for word in words]
+        return sorted(word_postings, key=lambda terms: sum(len(postings.docs) for postings in terms))
+
+    def tool_index(self, doc: int) -> int:
+        """Position in the search index of the tool a document number belongs to"""
+        return self.tools[doc]
+
+    def tool_of(self, doc: int) -> Tuple[str, int]:
+        """The tool id and lure index a document number belongs to"""
+        tool = self.tool_index(doc)
+        return self.ids[tool], doc - self.bases[tool]
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Rank lures containing every query word (by prefix of its stem), best first
+
+        A lure scores the tf-idf of every matching term. The rarest word's postings are
+        walked in impact order and the other words are looked up by bisection; the walk
+        stops as soon as no later document can beat the current top `limit`, so a query
+        touches only a few postings of even the most common words.
+        """
+        words = self.query_postings(query)
+        if not words or not words[0]:
+            return []
+
+        driver, others = words[0], words[1:]
+        others_best = sum(postings.best for terms in others for postings in terms)
+        # Walk the driver's terms together, always advancing the one with the best next score
+        heads = []
+        for index, postings in enumerate(driver):
+            ranked = postings.ranked()
+            first = next(ranked, None)
+            if first is not None:
+                heads.append([first[0], first[1], index, ranked])
+
+        seen = set()
+        top: List[Tuple[float, int]] = []
+        while heads:
+            head = max(heads, key=lambda item: (item[0], -item[1]))
+            bound = sum(item[0] for item in heads) + others_best
+            if len(top) == limit and top[0][0] >= bound:
+                break
+            doc = head[1]
+            following = next(head[3], None)
+            if following is None:
+                heads.remove(head)
+            else:
+                head[0], head[1] = following
+            if doc in seen:
+                continue
+            seen.add(doc)
+
+            total = sum(postings.score(doc) for postings in driver)
+            for terms in others:
+                score = sum(postings.score(doc) for postings in terms)
+                if not score:
+                    break
+                total += score
+            else:
+                # Ties go to the earlier document
+                item = (total, -doc)
+                if len(top) < limit:
+                    heapq.heappush(top, item)
+                elif item > top[0]:
+                    heapq.heapreplace(top, item)
+
+        results = []
+        for total, negative_doc in sorted(top, reverse=True):
+            tool_id, lure = self.tool_of(-negative_doc)
+            results.append({'id': tool_id, 'lure': lure, 'score': total})
+        return results
+
+    def matching_tools(self, query: str) -> List[str]:
+        """Ids of the tools with at least one lure matching the query (what the index page shows)"""
+        words = self.query_postings(query)
+        if not words:
+            return []
+        docs = None
+        for terms in words:
+            word_docs = set().union(*(postings.docs for postings in terms))
+            docs = word_docs if docs is None else docs & word_docs
+        return [self.ids[tool] for tool in sorted({self.tool_index(doc) for doc in docs})]
@@ -3,176 +3,222 @@ ClickFix Wiki HTML Generators
 Handles generation of HTML content from YAML data
 """
 
-from typing import Dict, List, Any
-from .utils import render_markdown, format_platform, format_presentation, get_contact_url, get_all_capabilities
+from typing import Dict, List, Any, Iterable, Iterator
+from .utils import render_markdown, get_contact_url
+from .models import Technique, Lure, Contributor, summarize_entry
 
-def generate_tools_html(entries: List[Dict[str, Any]], config) -> str:
+def generate_tools_html(entries: Iterable[Technique], config) -> str:
     """Generate tools HTML for the index page"""
-    tools_html = ""
-    for entry in entries:
-        # Get all capabilities from all lures
-        all_capabilities = get_all_capabilities(entry)
-        
-        # Count lures
-        lure_count = len(entry.get('lures', []))
+    return "".join(iter_tools_html(map(summarize_entry, entries), config))
+
+def iter_tools_html(summaries: Iterable[Dict[str, Any]], config) -> Iterator[str]:
+    """Yield the index page tool cards one entry summary (see summarize_entry) at a time"""
+    for entry in summaries:
+        all_capabilities = entry['capabilities']
+        lure_count = entry['lure_count']
         
         # Generate tags HTML
-        tags_html = ""
-        platform = entry.get('platform', '')
-        if platform:
-            platform_formatted = format_platform(platform)
-            if platform_formatted == 'Windows':
-                tags_html += f'<span class="tool-tag platform-tag" data-platform="{platform_formatted}"><i class="fab fa-windows" style="color: #0078d4;"></i> {platform_formatted}</span>'
-            elif platform_formatted == 'Mac':
-                tags_html += f'<span class="tool-tag platform-tag" data-platform="{platform_formatted}"><i class="fab fa-apple" style="color: #000000;"></i> {platform_formatted}</span>'
-            elif platform_formatted == 'Linux':
-                tags_html += f'<span class="tool-tag platform-tag" data-platform="{platform_formatted}"><i class="fab fa-linux" style="color: #f47421;"></i> {platform_formatted}</span>'
-            else:
-                tags_html += f'<span class="tool-tag platform-tag" data-platform="{platform_formatted}">{platform_formatted}</span>'
-        if entry.get('presentation'):
-            presentation = entry.get('presentation', '')
-            presentation_formatted = format_presentation(presentation)
-            if presentation_formatted == 'GUI':
-                tags_html += f'<span class="tool-tag presentation-tag" data-presentation="{presentation_formatted}"><i class="fas fa-window-maximize"></i> {presentation_formatted}</span>'
-            elif presentation_formatted == 'CLI':
-                tags_html += f'<span class="tool-tag presentation-tag" data-presentation="{presentation_formatted}"><i class="fas fa-terminal"></i> {presentation_formatted}</span>'
-            else:
-                tags_html += f'<span class="tool-tag presentation-tag" data-presentation="{presentation_formatted}">{presentation_formatted}</span>'
-        if all_capabilities:
-            for capability in sorted(all_capabilities):
-                if capability == 'UAC':
-                    tags_html += f'<span class="tool-tag capability-tag" data-capability="{capability}"><i class="fas fa-shield-alt" style="color: #194360;"></i> {capability}</span>'
-                elif capability == 'MOTW':
-                    tags_html += f'<span class="tool-tag capability-tag" data-capability="{capability}"><i class="fas fa-check-circle" style="color: #4CAF50;"></i> {capability}</span>'
-                elif capability == 'File Explorer':
-                    tags_html += f'<span class="tool-tag capability-tag" data-capability="{capability}"><i class="fas fa-folder" style="color: #FFA726;"></i> {capability}</span>'
-                else:
-                    tags_html += f'<span class="tool-tag capability-tag" data-capability="{capability}">{capability}</span>'
+        tags = []
+        if entry['platform']:
+            tags.append(generate_tag_html('platform', entry['platform']))
+        if entry['presentation']:
+            tags.append(generate_tag_html('presentation', entry['presentation']))
+        for capability in all_capabilities:
+            tags.append(generate_tag_html('capability', capability))
         
         # Get lure count text
         lure_text = config.get('lure_count_singular') if lure_count == 1 else config.get('lure_count_plural')
         
-        tools_html += f'''
+        yield f'''
         <a href="pages/{entry['id']}.html" class="tool-item" data-id="{entry['id']}">
-            <div class="tool-title">{entry.get('name', 'Unnamed Tool')}</div>
+            <div class="tool-title">{entry['name']}</div>
             <div class="tool-tags">
-                {tags_html}
+                {"".join(tags)}
                 <div class="tool-lure-count">{lure_count} {lure_text}</div>
             </div>
         </a>
         '''
+
+# Icons shown next to known facet values on tool cards and filter tags
+TAG_ICONS = {
+    ('platform', 'Windows'): '<i class="fab fa-windows" style="color: #0078d4;"></i>',
+    ('platform', 'Mac'): '<i class="fab fa-apple" style="color: #000000;"></i>',
+    ('platform', 'Linux'): '<i class="fab fa-linux" style="color: #f47421;"></i>',
+    ('presentation', 'GUI'): '<i class="fas fa-window-maximize"></i>',
+    ('presentation', 'CLI'): '<i class="fas fa-terminal"></i>',
+    ('capability', 'UAC'): '<i class="fas fa-shield-alt" style="color: #194360;"></i>',
+    ('capability', 'MOTW'): '<i class="fas fa-check-circle" style="color: #4CAF50;"></i>',
+    ('capability', 'File Explorer'): '<i class="fas fa-folder" style="color: #FFA726;"></i>'
+}
+
+def get_tag_label_html(facet: str, value: str) -> str:
+    """Facet value label, prefixed with its icon when it has one"""
+    icon = TAG_ICONS.get((facet, value))
+    return f'{icon} {value}' if icon else value
+
+def generate_tag_html(facet: str, value: str) -> str:
+    """Generate a tool card tag for a facet value"""
+    return f'<span class="tool-tag {facet}-tag" data-{facet}="{value}">{get_tag_label_html(facet, value)}</span>'
+
+def iter_filter_groups_html(facets: List[Dict[str, Any]]) -> Iterator[str]:
+    """Yield the index page filter groups for the facet values present in the corpus (see build_facets)"""
+    for facet in facets:
+        if not facet['values']:
+            continue
+        tags = "".join(
+            f'<div class="filter-tag" data-{facet["name"]}="{value["name"]}" data-bit="{value["bit"]}" '
+            f'onclick="toggleFilter(\'{facet["name"]}\', \'{value["name"]}\', this)">'
+            f'{get_tag_label_html(facet["name"], value["name"])} '
+            f'<span class="filter-count" data-bit="{value["bit"]}">{value["count"]}</span></div>'
+            for value in facet['values']
+        )
+        yield f'''
+                <div class="filter-group">
+                    <div class="filter-group-title">{facet['title']}</div>
+                    <div class="filter-tags" id="{facet['name']}Tags">{tags}</div>
+                </div>
+'''
+
+def index_page_url(page: int) -> str:
+    """File name of a page of the paginated index (the first page is index.html)"""
+    return "index.html" if page == 1 else f"index-{page}.html"
+
+def generate_pagination_html(pagination: Dict[str, int]) -> str:
+    """Generate the page links for a page of the paginated index"""
+    page, pages = pagination['page'], pagination['pages']
+    # Always link the first and last page and the pages around the current one
+    shown = sorted({1, pages} | set(range(max(1, page - 2), min(pages, page + 2) + 1)))
     
-    return tools_html
+    links = []
+    if page > 1:
+        links.append(f'<a class="page-link" href="{index_page_url(page - 1)}" rel="prev">&laquo; Previous</a>')
+    previous = 0
+    for number in shown:
+        if number > previous + 1:
+            links.append('<span class="page-gap">&hellip;</span>')
+        if number == page:
+            links.append(f'<span class="page-link current">{number}</span>')
+        else:
+            links.append(f'<a class="page-link" href="{index_page_url(number)}">{number}</a>')
+        previous = number
+    if page < pages:
+        links.append(f'<a class="page-link" href="{index_page_url(page + 1)}" rel="next">Next &raquo;</a>')
+    return "".join(links)
 
-def generate_lures_html(entry: Dict[str, Any], config) -> str:
+def generate_lures_html(entry: Technique, config) -> str:
     """Generate lures HTML for an entry"""
-    lures = entry.get('lures', [])
-    lures_html = ""
+    return "".join(iter_lures_html(entry, config))
+
+# Define colors for different lure cards
+LURE_COLORS = [
+    '#667eea',  # Blue
+    '#f093fb',  # Pink
+    '#f093fb',  # Purple
+    '#4facfe',  # Light Blue
+    '#43e97b',  # Green
+    '#fa709a',  # Rose
+    '#a8edea',  # Cyan
+    '#fed6e3',  # Light Pink
+    '#ffecd2',  # Orange
+    '#fcb69f'   # Peach
+]
+
+def iter_lures_html(entry: Technique, config) -> Iterator[str]:
+    """Yield the lure cards for an entry one lure at a time"""
+    lures = entry.lures
+    if not lures:
+        yield '<p class="no-lures">No lures documented for this tool yet.</p>'
+        return
     
-    # Define colors for different lure cards
-    lure_colors = [
-        '#667eea',  # Blue
-        '#f093fb',  # Pink
-        '#f093fb',  # Purple
-        '#4facfe',  # Light Blue
-        '#43e97b',  # Green
-        '#fa709a',  # Rose
-        '#a8edea',  # Cyan
-        '#fed6e3',  # Light Pink
-        '#ffecd2',  # Orange
-        '#fcb69f'   # Peach
-    ]
+    for i, lure in enumerate(lures):
+        yield generate_lure_html(entry, lure, i)
+
+def generate_lure_html(entry: Technique, lure: Lure, i: int) -> str:
+    """Generate the card for a single lure"""
+    # Get color for this lure card
+    color = LURE_COLORS[i % len(LURE_COLORS)]
+    
+    # Generate preamble HTML with proper line break handling
+    preamble_html = ""
+    if lure.preamble:
+        preamble_text = render_markdown(lure.preamble)
+        # Handle multiple newlines by converting to <br> tags
+        preamble_text = preamble_text.replace('\n\n', '</p><p>').replace('\n', '<br>')
+        preamble_html = f'<div class="lure-preamble">{preamble_text}</div>'
+    
+    # Generate epilogue HTML with proper line break handling
+    epilogue_html = ""
+    if lure.epilogue:
+        epilogue_text = render_markdown(lure.epilogue)
+        # Handle multiple newlines by converting to <br> tags
+        epilogue_text = epilogue_text.replace('\n\n', '</p><p>').replace('\n', '<br>')
+        epilogue_html = f'<div class="lure-epilogue">{epilogue_text}</div>'
+    
+    # Generate steps HTML with bold numbers on same line
+    steps = []
+    if lure.steps:
+        for j, step in enumerate(lure.steps, 1):
+            step_text = render_markdown(step)
+            # Remove <p> tags that Markdown might add
+            step_text = step_text.replace('<p>', '').replace('</p>', '')
+            # Clean up any double spaces and ensure proper sentence spacing
+            step_text = ' '.join(step_text.split())
+            # Ensure proper spacing after the number
+            steps.append(f'<li><strong>{j}.</strong> {step_text}</li>')
+    else:
+        steps.append('<li><strong>1.</strong> No steps specified</li>')
+    steps_html = "".join(steps)
+    
+    # Generate references HTML as unordered list
+    references_html = "".join(
+        f'<li><a href="{ref}" target="_blank">{ref}</a></li>'
+        for ref in lure.references
+    )
     
-    if lures:
-        for i, lure in enumerate(lures):
-            # Get color for this lure card
-            color = lure_colors[i % len(lure_colors)]
-            
-            # Generate preamble HTML with proper line break handling
-            preamble_html = ""
-            if lure.get('preamble'):
-                preamble_text = render_markdown(lure['preamble'])
-                # Handle multiple newlines by converting to <br> tags
-                preamble_text = preamble_text.replace('\n\n', '</p><p>').replace('\n', '<br>')
-                preamble_html = f'<div class="lure-preamble">{preamble_text}</div>'
-            
-            # Generate epilogue HTML with proper line break handling
-            epilogue_html = ""
-            if lure.get('epilogue'):
-                epilogue_text = render_markdown(lure['epilogue'])
-                # Handle multiple newlines by converting to <br> tags
-                epilogue_text = epilogue_text.replace('\n\n', '</p><p>').replace('\n', '<br>')
-                epilogue_html = f'<div class="lure-epilogue">{epilogue_text}</div>'
-            
-            # Generate steps HTML with bold numbers on same line
-            steps_html = ""
-            if lure.get('steps'):
-                for j, step in enumerate(lure['steps'], 1):
-                    step_text = render_markdown(step)
-                    # Remove <p> tags that Markdown might add
-                    step_text = step_text.replace('<p>', '').replace('</p>', '')
-                    # Add natural sentence spacing around <strong> tags
-                    # step_text = step_text.replace('<strong>', ' <strong> ').replace('</strong>', '</strong> ')
-                    # Clean up any double spaces and ensure proper sentence spacing
-                    step_text = ' '.join(step_text.split())
-                    # Ensure proper spacing after the number
-                    steps_html += f'<li><strong>{j}.</strong> {step_text}</li>'
-            else:
-                steps_html = '<li><strong>1.</strong> No steps specified</li>'
-            
-            # Generate references HTML as unordered list
-            references_html = ""
-            if lure.get('references'):
-                for ref in lure['references']:
-                    references_html += f'<li><a href="{ref}" target="_blank">{ref}</a></li>'
-            
-            # Generate mitigations HTML as unordered list
-            mitigations_html = ""
-            if lure.get('mitigations'):
-                for mitigation in lure['mitigations']:
-                    mitigation_text = render_markdown(mitigation)
-                    mitigations_html += f'<li>{mitigation_text}</li>'
-            
-            # Generate compact contributor HTML with tooltip
-            contributor_html = generate_compact_contributor_html(lure.get('contributor'), i, lure)
-            
-            # Generate capabilities HTML for top-right of lure card
-            capabilities_html = ""
-            capabilities_list = []
-            if lure.get('capabilities'):
-                for capability in lure['capabilities']:
-                    # Add Font Awesome icons for specific capabilities
-                    icon_html = ""
-                    if capability == "UAC":
-                        icon_html = '<i class="fas fa-shield-alt" style="color: #000080;"></i>'
-                    elif capability == "MOTW":
-                        icon_html = '<i class="fas fa-check-circle" style="color: #28a745;"></i>'
-                    elif capability == "File Explorer":
-                        icon_html = '<i class="fas fa-folder" style="color: #FFA726;"></i>'
-                    
-                    capabilities_html += f'<span class="capability-tag">{icon_html} {capability}</span>'
-                    capabilities_list.append(capability)
-            
-            # Prepare data attributes for copy functionality
-            preamble_text = lure.get('preamble', '').replace('"', '&quot;').replace('\n', '\\n')
-            epilogue_text = lure.get('epilogue', '').replace('"', '&quot;').replace('\n', '\\n')
-            
-            # Prepare steps text for copying
-            steps_text = ""
-            if lure.get('steps'):
-                for j, step in enumerate(lure['steps'], 1):
-                    steps_text += f"{j}. {step}\\n"
-            else:
-                steps_text = "1. No steps specified\\n"
-            
-            capabilities_text = ", ".join(capabilities_list)
-            
-            # Create anchor ID for the lure
-            lure_anchor = f"lure-{entry['id']}-{i}"
-             
-            lures_html += f'''
+    # Generate mitigations HTML as unordered list
+    mitigations_html = "".join(
+        f'<li>{render_markdown(mitigation)}</li>'
+        for mitigation in lure.mitigations
+    )
+    
+    # Generate compact contributor HTML with tooltip
+    contributor_html = generate_compact_contributor_html(lure.contributor, i, lure)
+    
+    # Generate capabilities HTML for top-right of lure card
+    capabilities = []
+    capabilities_list = []
+    for capability in lure.capabilities:
+        # Add Font Awesome icons for specific capabilities
+        icon_html = ""
+        if capability == "UAC":
+            icon_html = '<i class="fas fa-shield-alt" style="color: #000080;"></i>'
+        elif capability == "MOTW":
+            icon_html = '<i class="fas fa-check-circle" style="color: #28a745;"></i>'
+        elif capability == "File Explorer":
+            icon_html = '<i class="fas fa-folder" style="color: #FFA726;"></i>'
+        
+        capabilities.append(f'<span class="capability-tag">{icon_html} {capability}</span>')
+        capabilities_list.append(capability)
+    capabilities_html = "".join(capabilities)
+    
+    # Prepare data attributes for copy functionality
+    preamble_text = lure.preamble.replace('"', '&quot;').replace('\n', '\\n')
+    epilogue_text = lure.epilogue.replace('"', '&quot;').replace('\n', '\\n')
+    
+    # Prepare steps text for copying
+    if lure.steps:
+        steps_text = "".join(f"{j}. {step}\\n" for j, step in enumerate(lure.steps, 1))
+    else:
+        steps_text = "1. No steps specified\\n"
+    
+    capabilities_text = ", ".join(capabilities_list)
+    
+    # Create anchor ID for the lure
+    lure_anchor = f"lure-{entry.id}-{i}"
+     
+    return f'''
             <div class="lure-item" style="border-left-color: {color};" 
-                 data-nickname="{lure.get('nickname', 'Unnamed Lure')}"
+                 data-nickname="{lure.nickname or 'Unnamed Lure'}"
                  data-preamble="{preamble_text}"
                  data-steps="{steps_text}"
                  data-epilogue="{epilogue_text}"
@@ -181,7 +227,7 @@ def generate_lures_html(entry: Dict[str, Any], config) -> str:
                 <div class="lure-header">
                     <h3 class="lure-name">
                         <a href="#{lure_anchor}" class="lure-link" onclick="copyLureLink(event, '{lure_anchor}')">
-                            {lure.get('nickname', 'Unnamed Lure')}
+                            {lure.nickname or 'Unnamed Lure'}
                             <i class="fas fa-link"></i>
                         </a>
                     </h3>
@@ -209,86 +255,87 @@ def generate_lures_html(entry: Dict[str, Any], config) -> str:
                 {contributor_html}
             </div>
             '''
-    else:
-        lures_html = '<p class="no-lures">No lures documented for this tool yet.</p>'
-    
-    return lures_html
 
-def generate_contributor_html(contributor: Dict[str, Any]) -> str:
+def generate_contributor_html(contributor: Contributor) -> str:
     """Generate contributor HTML"""
     if not contributor:
         return ""
+    return "".join(iter_contributor_html(contributor))
+
+def iter_contributor_html(contributor: Contributor) -> Iterator[str]:
+    """Yield the fragments of a contributor block"""
+    yield '<div class="contributor">'
+    yield '<h4>Contributor:</h4>'
+    yield f'<p class="contributor-name">{contributor.name}'
     
-    contributor_html = f'<div class="contributor">'
-    contributor_html += f'<h4>Contributor:</h4>'
-    contributor_html += f'<p class="contributor-name">{contributor.get("name", "Unknown")}'
-    
-    if contributor.get('handle'):
-        contributor_html += f' <span class="handle">@{contributor["handle"]}</span>'
+    if contributor.handle:
+        yield f' <span class="handle">@{contributor.handle}</span>'
     
-    contributor_html += '</p>'
+    yield '</p>'
     
     # Add contact links
-    if contributor.get('contacts'):
-        contacts_html = '<div class="contributor-contacts">'
-        for platform, value in contributor['contacts'].items():
+    if contributor.contacts:
+        yield '<div class="contributor-contacts">'
+        for platform, value in contributor.contacts:
             if value:
                 icon_class = f"icon-{platform}"
-                contacts_html += f'<a href="{get_contact_url(platform, value)}" class="contact-link {icon_class}" target="_blank" title="{platform.title()}"></a>'
-        contacts_html += '</div>'
-        contributor_html += contacts_html
+                yield f'<a href="{get_contact_url(platform, value)}" class="contact-link {icon_class}" target="_blank" title="{platform.title()}"></a>'
+        yield '</div>'
     
-    contributor_html += '</div>'
-    return contributor_html
+    yield '</div>'
 
-def generate_compact_contributor_html(contributor: Dict[str, Any], lure_index: int, lure: Dict[str, Any]) -> str:
+def generate_compact_contributor_html(contributor: Contributor, lure_index: int, lure: Lure) -> str:
     """Generate compact contributor HTML for bottom of lure cards with tooltip"""
     if not contributor:
         return ""
+    return "".join(iter_compact_contributor_html(contributor, lure_index, lure))
+
+def iter_compact_contributor_html(contributor: Contributor, lure_index: int, lure: Lure) -> Iterator[str]:
+    """Yield the fragments of a compact contributor block"""
+    yield '<div class="lure-contributor">'
+    yield '<span class="contributor-label">Contributor:</span> '
+    yield f'<span class="contributor-name" onclick="toggleContributorContacts({lure_index})">{contributor.name}'
     
-    contributor_html = f'<div class="lure-contributor">'
-    contributor_html += f'<span class="contributor-label">Contributor:</span> '
-    contributor_html += f'<span class="contributor-name" onclick="toggleContributorContacts({lure_index})">{contributor.get("name", "Unknown")}'
-    
-    if contributor.get('handle'):
-        contributor_html += f' (@{contributor["handle"]})'
+    if contributor.handle:
+        yield f' (@{contributor.handle})'
     
-    contributor_html += '</span>'
+    yield '</span>'
     
     # Add added date if available
-    if lure.get('added_at'):
-        contributor_html += f' <span class="contributor-date">({lure["added_at"]})</span>'
+    if lure.added_at:
+        yield f' <span class="contributor-date">({lure.added_at})</span>'
     
     # Add contact links with Font Awesome icons in tooltip
-    if contributor.get('contacts'):
-        contacts_html = f'<div class="contributor-contacts" id="contributor-contacts-{lure_index}">'
-        for platform, value in contributor['contacts'].items():
+    if contributor.contacts:
+        yield f'<div class="contributor-contacts" id="contributor-contacts-{lure_index}">'
+        for platform, value in contributor.contacts:
             if value:
                 icon_class = get_contact_icon_class(platform)
-                contacts_html += f'<a href="{get_contact_url(platform, value)}" class="contact-link" target="_blank" title="{platform.title()}"><i class="{icon_class}"></i></a>'
-        contacts_html += '</div>'
-        contributor_html += contacts_html
+                yield f'<a href="{get_contact_url(platform, value)}" class="contact-link" target="_blank" title="{platform.title()}"><i class="{icon_class}"></i></a>'
+        yield '</div>'
     
-    contributor_html += '</div>'
-    return contributor_html
+    yield '</div>'
+
+# Font Awesome icon classes for contributor contact platforms
+CONTACT_ICONS = {
+    'linkedin': 'fab fa-linkedin',
+    'twitter': 'fab fa-twitter',
+    'youtube': 'fab fa-youtube',
+    'github': 'fab fa-github',
+    'facebook': 'fab fa-facebook',
+    'email': 'fas fa-envelope',
+    'instagram': 'fab fa-instagram',
+    'website': 'fas fa-globe'
+}
+DEFAULT_CONTACT_ICON = 'fas fa-link'
 
 def get_contact_icon_class(platform: str) -> str:
     """Get Font Awesome icon class for contact platform"""
-    icon_map = {
-        'linkedin': 'fab fa-linkedin',
-        'twitter': 'fab fa-twitter',
-        'youtube': 'fab fa-youtube',
-        'github': 'fab fa-github',
-        'facebook': 'fab fa-facebook',
-        'email': 'fas fa-envelope',
-        'instagram': 'fab fa-instagram',
-        'website': 'fas fa-globe'
-    }
-    return icon_map.get(platform.lower(), 'fas fa-link')
+    return CONTACT_ICONS.get(platform.lower(), DEFAULT_CONTACT_ICON)
 
-def generate_info_html(entry: Dict[str, Any]) -> str:
+def generate_info_html(entry: Technique) -> str:
     """Generate info HTML for an entry"""
-    info = entry.get('info', '')
+    info = entry.info
     if not info:
         return ""
     
@@ -299,18 +346,13 @@ def generate_info_html(entry: Dict[str, Any]) -> str:
     
     return f'<div class="entry-info">{info_html}</div>'
 
-def generate_tags_html(entry: Dict[str, Any]) -> str:
+def generate_tags_html(entry: Technique) -> str:
     """Generate tags HTML for an entry"""
-    all_capabilities = get_all_capabilities(entry)
-    
-    tags_html = ""
-    if all_capabilities:
-        for capability in sorted(all_capabilities):
-            tags_html += f'<span class="tool-tag">{capability}</span>'
-    
-    # Add platform and presentation tags
-    platform_tag = f'<span class="tool-tag platform-tag">{format_platform(entry.get("platform", ""))}</span>'
-    presentation_tag = f'<span class="tool-tag presentation-tag">{format_presentation(entry.get("presentation", ""))}</span>'
-    tags_html = platform_tag + presentation_tag + tags_html
+    # Platform and presentation tags come first
+    tags = [
+        f'<span class="tool-tag platform-tag">{entry.platform_label}</span>',
+        f'<span class="tool-tag presentation-tag">{entry.presentation_label}</span>'
+    ]
+    tags.extend(f'<span class="tool-tag">{capability}</span>' for capability in entry.capabilities)
     
-    return tags_html 
\ No newline at end of file
+    return "".join(tags)
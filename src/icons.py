@@ -0,0 +1,114 @@
+"""
+ClickFix Wiki Icon Subsetting
+Self-hosts only the Font Awesome icons the site uses, subset from a local Font Awesome distribution
+"""
+
+import io
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Set, Tuple
+from .assets import fingerprint_name
+from .compress import brotli
+
+# fontTools is optional; without it pages keep loading Font Awesome from the CDN
+try:
+    from fontTools import subset as font_subset
+except ImportError:
+    font_subset = None
+
+ICON_CDN_URL = "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css"
+
+# Style prefix -> (font family, font weight, webfont file stem in the distribution)
+ICON_STYLES = {
+    'fas': ("Font Awesome 6 Free", 900, "fa-solid-900"),
+    'far': ("Font Awesome 6 Free", 400, "fa-regular-400"),
+    'fab': ("Font Awesome 6 Brands", 400, "fa-brands-400")
+}
+
+# Properties Font Awesome gives every icon element
+ICON_BASE_CSS = ("-moz-osx-font-smoothing:grayscale;-webkit-font-smoothing:antialiased;display:inline-block;"
+                 "font-style:normal;font-variant:normal;line-height:1;text-rendering:auto")
+
+_ICON_RE = re.compile(r'\b(fa[srb]) (fa-[a-z0-9-]+)')
+# Code points appear as `.fa-x:before{content:"\f17a"}` (and, in later 6.x releases, `.fa-x{--fa:"\f17a"}`)
+_CODEPOINT_RULE_RE = re.compile(r'([^{}]+)\{[^{}]*?(?:content|--fa)\s*:\s*"\\([0-9a-fA-F]+)"')
+_ICON_SELECTOR_RE = re.compile(r'\s*\.(fa-[a-z0-9-]+)(?:::?before)?\s*')
+
+def find_icons(texts: Iterable[str]) -> Set[Tuple[str, str]]:
+    """(style prefix, icon class) pairs used in HTML, templates or icon class strings"""
+    icons = set()
+    for text in texts:
+        icons.update(_ICON_RE.findall(text))
+    return icons
+
+def icon_codepoints(css: str) -> Dict[str, int]:
+    """Map every icon class in Font Awesome's all.css (aliases included) to its code point"""
+    codepoints = {}
+    for selectors, code in _CODEPOINT_RULE_RE.findall(css):
+        for selector in selectors.split(','):
+            match = _ICON_SELECTOR_RE.fullmatch(selector)
+            if match:
+                codepoints[match.group(1)] = int(code, 16)
+    return codepoints
+
+def subset_font(font_path: Path, codepoints: Iterable[int]) -> Tuple[bytes, str]:
+    """Keep only the glyphs for codepoints; return the font data and its format (woff2 needs brotli)"""
+    options = font_subset.Options()
+    options.flavor = 'woff2' if brotli is not None else 'woff'
+    options.layout_features = []
+    font = font_subset.load_font(str(font_path), options)
+    subsetter = font_subset.Subsetter(options)
+    subsetter.populate(unicodes=codepoints)
+    subsetter.subset(font)
+    data = io.BytesIO()
+    font_subset.save_font(font, data, options)
+    return data.getvalue(), options.flavor
+
+class IconSubset:
+    """Subset webfonts and CSS for a set of icons, built from a Font Awesome 6 Free distribution
+
+    source_dir is the unpacked distribution (css/all.css and webfonts/). Raises ImportError
+    without fontTools, and OSError or ValueError if the distribution lacks a used icon.
+    """
+
+    def __init__(self, source_dir: Path, icons: Set[Tuple[str, str]]):
+        if font_subset is None:
+            raise ImportError("fontTools is not installed")
+        source_dir = Path(source_dir)
+        css_path = next((path for path in (source_dir / "css" / "all.css", source_dir / "css" / "all.min.css")
+                         if path.is_file()), None)
+        if css_path is None:
+            raise OSError(f"no css/all.css in {source_dir}")
+        codepoints = icon_codepoints(css_path.read_text(encoding='utf-8'))
+        missing = sorted(icon for _, icon in icons if icon not in codepoints)
+        if missing:
+            raise ValueError(f"icons not in {css_path}: {', '.join(missing)}")
+
+        self.icons = sorted(icons)
+        self.codepoints = {icon: codepoints[icon] for _, icon in self.icons}
+        # Webfont output name -> (url relative to the site root, font data, format)
+        self.fonts: Dict[str, Tuple[str, bytes, str]] = {}
+        for style in sorted({style for style, _ in self.icons}):
+            stem = ICON_STYLES[style][2]
+            font_path = next((source_dir / "webfonts" / f"{stem}.{ext}" for ext in ("ttf", "woff2")
+                              if (source_dir / "webfonts" / f"{stem}.{ext}").is_file()), None)
+            if font_path is None:
+                raise OSError(f"no webfonts/{stem}.ttf or .woff2 in {source_dir}")
+            data, fmt = subset_font(font_path, [self.codepoints[icon] for used, icon in self.icons if used == style])
+            self.fonts[style] = (fingerprint_name(f"icons/{stem}.{fmt}", data), data, fmt)
+
+    def css(self, prefix: str = "") -> str:
+        """Font faces and icon rules, with font URLs relative to a page prefix ("" or "../")"""
+        rules: List[str] = []
+        for style, (url, _, fmt) in sorted(self.fonts.items()):
+            family, weight, _ = ICON_STYLES[style]
+            rules.append(f'@font-face{{font-family:"{family}";font-style:normal;font-weight:{weight};'
+                         f'font-display:block;src:url({prefix}{url}) format("{fmt}")}}')
+        styles = sorted(self.fonts)
+        rules.append(f'{",".join("." + style for style in styles)}{{{ICON_BASE_CSS}}}')
+        for style in styles:
+            family, weight, _ = ICON_STYLES[style]
+            rules.append(f'.{style}{{font-family:"{family}";font-weight:{weight}}}')
+        for icon, codepoint in sorted(self.codepoints.items()):
+            rules.append(f'.{icon}:before{{content:"\\{codepoint:x}"}}')
+        return "".join(rules)
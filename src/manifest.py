@@ -0,0 +1,102 @@
+"""
+ClickFix Wiki Build Manifest
+Tracks the input hashes behind every generated file so incremental builds
+only re-render outputs whose inputs changed
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, List, Any, Iterable
+
+MANIFEST_VERSION = 1
+
+def hash_bytes(data: bytes) -> str:
+    """Return the hex digest used for all manifest hashes"""
+    return hashlib.sha256(data).hexdigest()
+
+def hash_file(file_path: Path) -> str:
+    """Hash the contents of a single file"""
+    with open(file_path, 'rb') as f:
+        return hash_bytes(f.read())
+
+def hash_files(file_paths: Iterable[Path]) -> str:
+    """Hash the names and contents of several files into one digest"""
+    digest = hashlib.sha256()
+    for file_path in sorted(file_paths):
+        digest.update(str(file_path).encode('utf-8'))
+        with open(file_path, 'rb') as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+def hash_modules(*modules: str) -> str:
+    """Hash the source of src/ modules (named without .py), to version caches of what that code computes"""
+    digest = hashlib.sha256()
+    for module in sorted(modules):
+        digest.update(module.encode('utf-8'))
+        digest.update(bytes.fromhex(hash_file(Path(__file__).parent / f"{module}.py")))
+    return digest.hexdigest()
+
+def hash_data(data: Any) -> str:
+    """Hash any YAML-like value (dicts, lists, strings, dates) deterministically"""
+    encoded = json.dumps(data, sort_keys=True, default=str, ensure_ascii=False)
+    return hash_bytes(encoded.encode('utf-8'))
+
+class BuildManifest:
+    """Maps each output file (relative to the output directory) to the hash of its inputs"""
+
+    def __init__(self, manifest_path: Path, output_dir: Path):
+        self.manifest_path = manifest_path
+        self.output_dir = output_dir
+        self.previous = self.load()
+        # What the previous build recorded, kept by clear() for outputs derived purely from content hashes
+        self.recorded = self.previous
+        self.current: Dict[str, str] = {}
+        self.written: List[str] = []
+
+    def load(self) -> Dict[str, str]:
+        """Load the manifest written by the previous build, if it matches this output directory"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if data.get('version') != MANIFEST_VERSION or data.get('output_dir') != str(self.output_dir):
+            return {}
+        return data.get('outputs', {})
+
+    def clear(self) -> None:
+        """Forget the previous build so every output is treated as stale"""
+        self.previous = {}
+
+    def is_current(self, output: str, input_hash: str) -> bool:
+        """Check whether an output exists and was generated from the same inputs"""
+        return self.previous.get(output) == input_hash and (self.output_dir / output).exists()
+
+    def was_recorded(self, output: str, input_hash: str) -> bool:
+        """Like is_current, but ignoring clear(): for outputs whose input hash covers every input they have"""
+        return self.recorded.get(output) == input_hash and (self.output_dir / output).exists()
+
+    def record(self, output: str, input_hash: str) -> None:
+        """Record the input hash an output was generated from during this build"""
+        self.current[output] = input_hash
+
+    def mark_written(self, output: str) -> None:
+        """Note that an output was regenerated during this build"""
+        self.written.append(output)
+
+    def orphans(self) -> List[str]:
+        """Outputs from the previous build that this build did not produce"""
+        return sorted(set(self.previous) - set(self.current))
+
+    def save(self) -> None:
+        """Write the manifest for the next incremental build"""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            'version': MANIFEST_VERSION,
+            'output_dir': str(self.output_dir),
+            'outputs': dict(sorted(self.current.items()))
+        }
+        with open(self.manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
@@ -0,0 +1,136 @@
+"""
+ClickFix Wiki Corpus Model
+Typed, immutable records for techniques, lures and contributors, with derived fields computed once at load
+"""
+
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+from .manifest import hash_data, hash_modules
+from .utils import format_platform, format_presentation
+
+# Changes with the code that builds records and their derived fields, so caches of records go stale with it
+RECORD_VERSION = hash_modules("models", "utils", "manifest")
+
+def intern_text(value: Any) -> Any:
+    """Share one copy of a repeated string (platforms, capabilities, names) across the corpus"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+def normalize_date(value: Any) -> Optional[str]:
+    """YAML dates and date strings as YYYY-MM-DD text; None when missing"""
+    if value is None:
+        return None
+    if hasattr(value, 'strftime'):
+        return value.strftime('%Y-%m-%d')
+    return str(value)
+
+def _texts(values: Any) -> Tuple[Any, ...]:
+    return tuple(values) if values else ()
+
+@dataclass(frozen=True, slots=True)
+class Contributor:
+    name: str
+    handle: str
+    # (platform, value) pairs in document order
+    contacts: Tuple[Tuple[str, Any], ...]
+
+    @classmethod
+    def from_yaml(cls, data: Dict[str, Any]) -> 'Contributor':
+        return cls(
+            name=intern_text(data.get('name', 'Unknown')),
+            handle=intern_text(data.get('handle') or ''),
+            contacts=tuple((intern_text(platform), intern_text(value))
+                           for platform, value in (data.get('contacts') or {}).items())
+        )
+
+@dataclass(frozen=True, slots=True)
+class Lure:
+    nickname: str
+    preamble: str
+    steps: Tuple[str, ...]
+    epilogue: str
+    capabilities: Tuple[str, ...]
+    references: Tuple[str, ...]
+    mitigations: Tuple[str, ...]
+    contributor: Optional[Contributor]
+    added_at: Optional[str]
+
+@dataclass(frozen=True, slots=True)
+class Technique:
+    id: str
+    name: str
+    platform: str
+    presentation: str
+    info: str
+    added_at: Optional[str]
+    lures: Tuple[Lure, ...]
+    # Derived at load time
+    platform_label: str
+    presentation_label: str
+    capabilities: Tuple[str, ...]
+    lure_count: int
+    content_hash: str
+
+class CorpusLoader:
+    """Turns parsed technique YAML into records, sharing contributors that appear on several lures"""
+
+    def __init__(self):
+        self.contributors: Dict[Contributor, Contributor] = {}
+
+    def contributor(self, data: Any) -> Optional[Contributor]:
+        if not data:
+            return None
+        contributor = Contributor.from_yaml(data)
+        return self.contributors.setdefault(contributor, contributor)
+
+    def lure(self, data: Dict[str, Any]) -> Lure:
+        return Lure(
+            nickname=data.get('nickname') or '',
+            preamble=data.get('preamble') or '',
+            steps=_texts(data.get('steps')),
+            epilogue=data.get('epilogue') or '',
+            capabilities=tuple(intern_text(capability) for capability in data.get('capabilities') or []),
+            references=_texts(data.get('references')),
+            mitigations=_texts(data.get('mitigations')),
+            contributor=self.contributor(data.get('contributor')),
+            added_at=intern_text(normalize_date(data.get('added_at')))
+        )
+
+    def technique(self, data: Any, technique_id: str) -> Optional[Technique]:
+        """Build a Technique from a parsed YAML document, or None if the document is empty"""
+        if not data:
+            return None
+        lures = tuple(self.lure(lure) for lure in data.get('lures') or [])
+        platform = data.get('platform') or ''
+        presentation = data.get('presentation') or ''
+        return Technique(
+            id=technique_id,
+            name=data.get('name') or '',
+            platform=intern_text(platform),
+            presentation=intern_text(presentation),
+            info=data.get('info') or '',
+            added_at=intern_text(normalize_date(data.get('added_at'))),
+            lures=lures,
+            platform_label=intern_text(format_platform(platform)),
+            presentation_label=intern_text(format_presentation(presentation)),
+            capabilities=tuple(sorted({capability for lure in lures for capability in lure.capabilities})),
+            lure_count=len(lures),
+            content_hash=hash_data([technique_id, data])
+        )
+
+def summarize_entry(entry: Technique) -> Dict[str, Any]:
+    """Reduce a Technique to the fields the index page needs (platform and presentation labels, or '')"""
+    return {
+        'id': entry.id,
+        'name': entry.name or 'Unnamed Tool',
+        'platform': entry.platform_label if entry.platform else '',
+        'presentation': entry.presentation_label if entry.presentation else '',
+        'capabilities': list(entry.capabilities),
+        'lure_count': entry.lure_count
+    }
+
+_loader = CorpusLoader()
+
+def load_technique(data: Any, technique_id: str) -> Optional[Technique]:
+    """Build a Technique with the process-wide loader"""
+    return _loader.technique(data, technique_id)
@@ -0,0 +1,154 @@
+"""
+ClickFix Wiki Output Writer
+Writes build outputs atomically and only when their bytes change, so unchanged files keep their mtimes
+"""
+
+import os
+import shutil
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+def _default_mode() -> int:
+    # The umask can only be read by setting it
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+# Mode for written outputs: what open() would give a new file (temporary files are created 0600)
+DEFAULT_MODE = _default_mode()
+
+def file_digest(file_path: Path) -> bytes:
+    """SHA-256 of a file's contents, read in blocks"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.digest()
+
+class OutputWriter:
+    """Every file a build writes into the output directory goes through here
+
+    New content goes to a temporary file in the target directory and is renamed over the
+    old file, so readers never see a partial file. When the new bytes match the existing
+    file the temporary file is dropped instead, leaving the old file (and its mtime) alone.
+    """
+
+    def __init__(self, output_dir: Path):
+        self.output_dir = output_dir
+        self.written: List[str] = []
+        self.unchanged: List[str] = []
+        self.removed: List[str] = []
+
+    def _temp_file(self, output_path: Path):
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        return tempfile.NamedTemporaryFile(dir=output_path.parent, prefix=f".{output_path.name}.",
+                                           suffix=".tmp", delete=False)
+
+    def _replace(self, temp_path: Path, output_path: Path) -> None:
+        """Give a temporary file DEFAULT_MODE and move it into place"""
+        os.chmod(temp_path, DEFAULT_MODE)
+        os.replace(temp_path, output_path)
+
+    def _commit(self, output: str, temp_path: Path, digest: bytes, size: int) -> bool:
+        """Move a finished temporary file into place unless the existing file has the same bytes"""
+        output_path = self.output_dir / output
+        try:
+            same = output_path.stat().st_size == size and file_digest(output_path) == digest
+        except OSError:
+            same = False
+        if same:
+            temp_path.unlink()
+            self.unchanged.append(output)
+            return False
+        self._replace(temp_path, output_path)
+        self.written.append(output)
+        return True
+
+    def write_bytes(self, output: str, data: bytes) -> bool:
+        """Write data to an output; return whether the file changed"""
+        output_path = self.output_dir / output
+        try:
+            if output_path.stat().st_size == len(data) and output_path.read_bytes() == data:
+                self.unchanged.append(output)
+                return False
+        except OSError:
+            pass
+        with self._temp_file(output_path) as f:
+            temp_path = Path(f.name)
+            try:
+                f.write(data)
+            except BaseException:
+                f.close()
+                temp_path.unlink()
+                raise
+        self._replace(temp_path, output_path)
+        self.written.append(output)
+        return True
+
+    def write_text(self, output: str, fragments: Iterable[str]) -> bool:
+        """Stream text fragments to an output as UTF-8 without joining them; return whether the file changed"""
+        digest = hashlib.sha256()
+        size = 0
+        with self._temp_file(self.output_dir / output) as f:
+            temp_path = Path(f.name)
+            try:
+                for fragment in fragments:
+                    data = fragment.encode('utf-8')
+                    digest.update(data)
+                    size += len(data)
+                    f.write(data)
+            except BaseException:
+                # A failed render must not leave a stray temporary file in the output directory
+                f.close()
+                temp_path.unlink()
+                raise
+        return self._commit(output, temp_path, digest.digest(), size)
+
+    def copy_file(self, output: str, source_path: Path) -> bool:
+        """Copy a file (with its metadata) to an output; return whether the file changed"""
+        output_path = self.output_dir / output
+        try:
+            if (output_path.stat().st_size == source_path.stat().st_size and
+                    file_digest(output_path) == file_digest(source_path)):
+                self.unchanged.append(output)
+                return False
+        except OSError:
+            pass
+        with self._temp_file(output_path) as f:
+            pass
+        try:
+            # copy2 gives the output the source file's mode
+            shutil.copy2(source_path, f.name)
+        except BaseException:
+            os.unlink(f.name)
+            raise
+        os.replace(f.name, output_path)
+        self.written.append(output)
+        return True
+
+    def remove(self, outputs: Iterable[str]) -> List[str]:
+        """Delete outputs and prune directories left empty; return the ones that existed"""
+        removed = []
+        for output in outputs:
+            output_path = self.output_dir / output
+            if output_path.is_file():
+                output_path.unlink()
+                removed.append(output)
+            parent = output_path.parent
+            while parent != self.output_dir and parent.exists() and not any(parent.iterdir()):
+                parent.rmdir()
+                parent = parent.parent
+        self.removed.extend(removed)
+        return removed
+
+    def untracked(self, outputs: Iterable[str]) -> List[str]:
+        """Files in the output directory that are not among outputs"""
+        keep = set(outputs)
+        return sorted(path.relative_to(self.output_dir).as_posix() for path in self.output_dir.rglob("*")
+                      if path.is_file() and path.relative_to(self.output_dir).as_posix() not in keep)
+
+    def counts(self) -> Dict[str, int]:
+        """How many outputs were written, left unchanged and removed"""
+        return {'written': len(self.written), 'unchanged': len(self.unchanged), 'removed': len(self.removed)}
@@ -0,0 +1,131 @@
+"""
+ClickFix Wiki Corpus Pack
+One memory-mapped file holding every technique record, readable one technique at a time by id
+"""
+
+import os
+import mmap
+import pickle
+import struct
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+from .models import RECORD_VERSION, Technique
+
+PACK_MAGIC = b"CFWPACK\0"
+# Bump whenever the layout changes; the records themselves are checked against RECORD_VERSION
+PACK_VERSION = 2
+
+# magic, version, record version, record count, index offset, id table offset
+_HEADER = struct.Struct("<8sI32sIQQ")
+# Each record is prefixed with its length
+_LENGTH = struct.Struct("<I")
+# One index slot per technique, sorted by id: id offset and length in the id table, record offset
+_SLOT = struct.Struct("<IIQ")
+
+def write_pack(entries: Iterable[Technique], pack_path: Path) -> int:
+    """Write records to a pack (atomically) in the order given; return how many were written
+
+    Layout: header, length-prefixed pickled records, then the index slots and id table
+    the index slots point into.
+    """
+    pack_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = pack_path.with_name(pack_path.name + '.tmp')
+    slots = []
+    with open(tmp_path, 'wb') as f:
+        f.write(b"\0" * _HEADER.size)
+        for entry in entries:
+            record = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+            slots.append((entry.id.encode('utf-8'), f.tell()))
+            f.write(_LENGTH.pack(len(record)))
+            f.write(record)
+
+        slots.sort()
+        ids = bytearray()
+        index = bytearray()
+        for technique_id, offset in slots:
+            index += _SLOT.pack(len(ids), len(technique_id), offset)
+            ids += technique_id
+        index_offset = f.tell()
+        f.write(index)
+        f.write(ids)
+        f.seek(0)
+        f.write(_HEADER.pack(PACK_MAGIC, PACK_VERSION, bytes.fromhex(RECORD_VERSION), len(slots),
+                             index_offset, index_offset + len(index)))
+    os.replace(tmp_path, pack_path)
+    return len(slots)
+
+class TechniquePack:
+    """A pack opened for reading; only the records asked for are unpickled
+
+    get() binary-searches the index in place, so opening a pack and reading one technique
+    costs the same however large the corpus is. Raises OSError if the file cannot be read
+    and ValueError if it is not a pack of this version or its records predate the current
+    record code (see RECORD_VERSION).
+    """
+
+    def __init__(self, pack_path: Path):
+        self.pack_path = Path(pack_path)
+        with open(self.pack_path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.data) < _HEADER.size:
+            self.close()
+            raise ValueError(f"{self.pack_path} is not a technique pack")
+        magic, version, record_version, self.count, self.index_offset, self.ids_offset = _HEADER.unpack_from(self.data)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            self.close()
+            raise ValueError(f"{self.pack_path} is not a version {PACK_VERSION} technique pack")
+        if record_version.hex() != RECORD_VERSION:
+            self.close()
+            raise ValueError(f"{self.pack_path} holds records built by older code; pack the techniques again")
+
+    def __enter__(self) -> 'TechniquePack':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.data.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _slot(self, position: int):
+        return _SLOT.unpack_from(self.data, self.index_offset + position * _SLOT.size)
+
+    def _id(self, position: int) -> bytes:
+        id_offset, id_length, _ = self._slot(position)
+        start = self.ids_offset + id_offset
+        return self.data[start:start + id_length]
+
+    def _record(self, offset: int) -> Technique:
+        length, = _LENGTH.unpack_from(self.data, offset)
+        start = offset + _LENGTH.size
+        return pickle.loads(self.data[start:start + length])
+
+    def ids(self) -> List[str]:
+        """Every technique id, sorted"""
+        return [self._id(position).decode('utf-8') for position in range(self.count)]
+
+    def get(self, technique_id: str) -> Optional[Technique]:
+        """One technique by id, or None"""
+        key = technique_id.encode('utf-8')
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._id(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count and self._id(low) == key:
+            return self._record(self._slot(low)[2])
+        return None
+
+    def __iter__(self) -> Iterator[Technique]:
+        """Every technique, in the order they were written"""
+        offset = _HEADER.size
+        while offset < self.index_offset:
+            length, = _LENGTH.unpack_from(self.data, offset)
+            start = offset + _LENGTH.size
+            yield pickle.loads(self.data[start:start + length])
+            offset = start + length
@@ -6,14 +6,44 @@ Handles Markdown page processing and navigation generation
 import os
 import re
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
 from .utils import render_markdown
+from .assets import stylesheet_links_html
+from .icons import ICON_CDN_URL
 
 class PageProcessor:
-    def __init__(self, pages_dir: Path = Path("pages")):
+    def __init__(self, pages_dir: Path = Path("pages"), quiet: bool = False):
         self.pages_dir = pages_dir
+        self.quiet = quiet
+        self._pages = None
+        self._navigation_html = None
+        self._navigation_html_relative = None
         
-    def get_all_pages(self) -> List[Dict[str, Any]]:
+    def get_all_pages(self) -> Tuple[Dict[str, Any], ...]:
+        """Return all Markdown pages, loading and rendering them once per build"""
+        if self._pages is None:
+            self._pages = tuple(self.load_all_pages())
+            self._navigation_html = self.generate_navigation_html(self._pages)
+            self._navigation_html_relative = self.generate_navigation_html_relative(self._pages)
+        return self._pages
+    
+    def invalidate(self) -> None:
+        """Drop the loaded pages so the next build re-reads the pages directory"""
+        self._pages = None
+        self._navigation_html = None
+        self._navigation_html_relative = None
+    
+    def get_navigation_html(self) -> str:
+        """Navigation HTML for pages at the site root"""
+        self.get_all_pages()
+        return self._navigation_html
+    
+    def get_navigation_html_relative(self) -> str:
+        """Navigation HTML for pages one directory below the root"""
+        self.get_all_pages()
+        return self._navigation_html_relative
+    
+    def load_all_pages(self) -> List[Dict[str, Any]]:
         """Load all Markdown pages from the pages directory"""
         pages = []
         
@@ -25,7 +55,8 @@ class PageProcessor:
             page = self.load_markdown_page(md_file)
             if page:
                 pages.append(page)
-                print(f"Loaded page: {md_file.name}")
+                if not self.quiet:
+                    print(f"Loaded page: {md_file.name}")
         
         return pages
     
@@ -81,18 +112,19 @@ class PageProcessor:
         
         return nav_html
     
-    def generate_page_html(self, page: Dict[str, Any]) -> str:
-        """Generate HTML for a single page"""
+    def generate_page_html(self, page: Dict[str, Any], stylesheets_html: str = None) -> str:
+        """Generate HTML for a single page, with the builder's stylesheet markup when given"""
         template = self.get_page_template()
         
-        # Generate navigation for this page
-        pages = self.get_all_pages()
-        navigation_html = self.generate_navigation_html_relative(pages)
+        navigation_html = self.get_navigation_html_relative()
         
         html = template.replace("{{TITLE}}", page['title'])
         html = html.replace("{{CONTENT}}", page['content'])
         html = html.replace("{{SLUG}}", page['slug'])
         html = html.replace("{{NAVIGATION_HTML}}", navigation_html)
+        if stylesheets_html is None:
+            stylesheets_html = stylesheet_links_html("../styles.css", icons_href=ICON_CDN_URL)
+        html = html.replace("{{STYLESHEETS}}", stylesheets_html)
         
         return html
     
@@ -104,8 +136,7 @@ class PageProcessor:
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>{{TITLE}} - ClickFix Wiki</title>
-    <link rel="stylesheet" href="../styles.css">
-    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css">
+    {{STYLESHEETS}}
 </head>
 <body>
     <div class="header">
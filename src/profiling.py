@@ -0,0 +1,96 @@
+"""
+ClickFix Wiki Build Profiling
+Collects phase timings, per-output render durations and cache statistics for a build
+"""
+
+import json
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any
+
+class BuildProfiler:
+    """Instrumentation surface shared by the builder for a single build"""
+
+    # Number of slowest outputs listed individually in the report
+    SLOWEST_OUTPUTS = 20
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.outputs: Dict[str, float] = {}
+        self.bytes_written = 0
+        self.files_written = 0
+        self.counters: Dict[str, Any] = {}
+        self.started = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a build phase; repeated phases accumulate"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def record_output(self, output: str, seconds: float, size: int) -> None:
+        """Record how long an output took to render and write, and how large it is"""
+        self.outputs[output] = seconds
+        self.bytes_written += size
+        self.files_written += 1
+
+    def record_bytes(self, size: int) -> None:
+        """Record bytes written for an output that is not individually timed (e.g. a copied asset)"""
+        self.bytes_written += size
+        self.files_written += 1
+
+    def set_counters(self, name: str, values: Dict[str, Any]) -> None:
+        """Attach a named group of counters (cache statistics, conversion counts, ...)"""
+        self.counters[name] = values
+
+    def output_summary(self) -> Dict[str, Any]:
+        """Distribution of per-output render durations"""
+        durations = sorted(self.outputs.values())
+        if not durations:
+            return {'count': 0}
+
+        def percentile(fraction: float) -> float:
+            return durations[min(len(durations) - 1, int(len(durations) * fraction))]
+
+        slowest = sorted(self.outputs.items(), key=lambda item: item[1], reverse=True)[:self.SLOWEST_OUTPUTS]
+        return {
+            'count': len(durations),
+            'total_seconds': sum(durations),
+            'mean_seconds': sum(durations) / len(durations),
+            'p50_seconds': percentile(0.5),
+            'p95_seconds': percentile(0.95),
+            'max_seconds': durations[-1],
+            'slowest': [{'output': output, 'seconds': seconds} for output, seconds in slowest]
+        }
+
+    def report(self) -> Dict[str, Any]:
+        """Build the JSON-serialisable profile report"""
+        return {
+            'total_seconds': time.perf_counter() - self.started,
+            'phases': self.phases,
+            'outputs': self.output_summary(),
+            'files_written': self.files_written,
+            'bytes_written': self.bytes_written,
+            'counters': self.counters
+        }
+
+    def write(self, report_path: Path) -> None:
+        """Write the profile report as JSON"""
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+
+def hit_rate(hits: int, misses: int) -> float:
+    """Fraction of lookups served from a cache"""
+    total = hits + misses
+    return hits / total if total else 0.0
+
+def cache_counters(hits: int, misses: int, **extra: Any) -> Dict[str, Any]:
+    """Standard shape for cache statistics in the report"""
+    counters = {'hits': hits, 'misses': misses, 'hit_rate': hit_rate(hits, misses)}
+    counters.update(extra)
+    return counters
@@ -0,0 +1,131 @@
+"""
+ClickFix Wiki Delta Deploys
+Publishes the built site to a branch by staging only the files whose content changed since the last deploy
+"""
+
+import os
+import hashlib
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Files GitHub Pages needs on the branch that the build does not produce
+EXTRA_FILES = {'.nojekyll': b''}
+
+# Files on the deployed branch that may have been set up outside the build (custom domain) and are never removed
+PRESERVED_FILES = {'CNAME'}
+
+# path -> (git file mode, object id): what a git tree records for every file
+Manifest = Dict[str, Tuple[str, str]]
+
+def git(args: List[str], repo_dir: Path, env: Dict[str, str] = None, input: str = None) -> str:
+    """Run a git command and return its output; raises subprocess.CalledProcessError on failure"""
+    result = subprocess.run(['git', *args], cwd=repo_dir, env=env, input=input,
+                            capture_output=True, text=True, check=True)
+    return result.stdout
+
+def blob_id(data: bytes, object_format: str = 'sha1') -> str:
+    """The object id git hash-object gives a file's contents, computed without running git"""
+    return hashlib.new(object_format, b"blob %d\0" % len(data) + data).hexdigest()
+
+class DeltaDeployer:
+    """Commits the site directory on top of the deployed branch without touching the working tree
+
+    The last deploy's manifest is the deployed commit's tree (every path with its content
+    hash); the new manifest hashes the site directory the same way. Only added and changed
+    files are written as objects and staged, in a temporary index seeded from the deployed
+    tree, and removed files are dropped from it. The commit is made with commit-tree and
+    pushed as a fast-forward of the deployed branch.
+
+    With a cname, a CNAME file naming that custom domain is deployed like .nojekyll, so
+    a new or reset branch gets it too; without one, a CNAME already on the branch is kept.
+    """
+
+    def __init__(self, site_dir: Path, remote: str = "origin", branch: str = "gh-pages", repo_dir: Path = Path("."),
+                 cname: str = None):
+        self.site_dir = Path(site_dir)
+        self.remote = remote
+        self.branch = branch
+        self.repo_dir = Path(repo_dir)
+        self.extra_files = dict(EXTRA_FILES)
+        if cname:
+            self.extra_files['CNAME'] = cname.encode('utf-8')
+        try:
+            self.object_format = git(['rev-parse', '--show-object-format'], self.repo_dir).strip() or 'sha1'
+        except subprocess.CalledProcessError:
+            self.object_format = 'sha1'
+
+    def fetch(self) -> Optional[str]:
+        """Fetch the tip of the deployed branch (just that commit); None if the branch does not exist yet"""
+        listing = git(['ls-remote', self.remote, f"refs/heads/{self.branch}"], self.repo_dir).split()
+        if not listing:
+            return None
+        git(['fetch', '--quiet', '--no-tags', '--depth=1', self.remote, f"refs/heads/{self.branch}"], self.repo_dir)
+        return listing[0]
+
+    def deployed_manifest(self, commit: Optional[str]) -> Manifest:
+        """Every file in a deployed commit, with its mode and object id"""
+        if commit is None:
+            return {}
+        manifest = {}
+        for line in git(['ls-tree', '-r', '-z', '--full-tree', commit], self.repo_dir).split('\0'):
+            if line:
+                info, path = line.split('\t', 1)
+                mode, _, object_id = info.split()
+                manifest[path] = (mode, object_id)
+        return manifest
+
+    def site_manifest(self) -> Manifest:
+        """Every file the deploy should contain, with its mode and object id"""
+        manifest = {}
+        for path in sorted(self.site_dir.rglob("*")):
+            if path.is_file():
+                mode = '100755' if os.access(path, os.X_OK) else '100644'
+                manifest[path.relative_to(self.site_dir).as_posix()] = (mode, blob_id(path.read_bytes(), self.object_format))
+        for name, data in self.extra_files.items():
+            manifest.setdefault(name, ('100644', blob_id(data, self.object_format)))
+        return manifest
+
+    def plan(self, deployed: Manifest, site: Manifest) -> Dict[str, List[str]]:
+        """The paths a deploy adds, changes and removes"""
+        return {
+            'added': sorted(path for path in site if path not in deployed),
+            'changed': sorted(path for path in site if path in deployed and deployed[path] != site[path]),
+            'removed': sorted(path for path in deployed if path not in site and path not in PRESERVED_FILES)
+        }
+
+    def commit(self, parent: Optional[str], site: Manifest, plan: Dict[str, List[str]], message: str) -> str:
+        """Stage the planned changes on the parent's tree in a temporary index and commit them"""
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(os.environ, GIT_INDEX_FILE=str(Path(tmp) / "index"))
+            if parent is not None:
+                git(['read-tree', parent], self.repo_dir, env)
+
+            writes = plan['added'] + plan['changed']
+            files = [path for path in writes if (self.site_dir / path).is_file()]
+            if files:
+                stdin = "".join(f"{(self.site_dir / path).resolve()}\n" for path in files)
+                # As is: .gitattributes or core.autocrlf must not make the blobs differ from site_manifest()
+                written = git(['hash-object', '-w', '--no-filters', '--stdin-paths'], self.repo_dir, env, stdin).split()
+                for path, object_id in zip(files, written):
+                    if object_id != site[path][1]:
+                        raise RuntimeError(f"{path} changed while deploying")
+            for path in writes:
+                if path not in files:
+                    git(['hash-object', '-w', '--stdin'], self.repo_dir, env, self.extra_files[path].decode('utf-8'))
+
+            # Mode 0 removes an entry from the index
+            null_id = '0' * (hashlib.new(self.object_format).digest_size * 2)
+            entries = [f"{site[path][0]} {site[path][1]}\t{path}" for path in writes]
+            entries += [f"0 {null_id}\t{path}" for path in plan['removed']]
+            if entries:
+                git(['update-index', '-z', '--index-info'], self.repo_dir, env, "".join(f"{entry}\0" for entry in entries))
+
+            tree = git(['write-tree'], self.repo_dir, env).strip()
+            parents = ['-p', parent] if parent is not None else []
+            return git(['commit-tree', tree, *parents, '-m', message], self.repo_dir, env).strip()
+
+    def push(self, commit: str) -> None:
+        """Move the deployed branch to a commit (a fast-forward, so a concurrent deploy is never overwritten)"""
+        git(['push', '--quiet', self.remote, f"{commit}:refs/heads/{self.branch}"], self.repo_dir)
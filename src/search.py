@@ -0,0 +1,155 @@
+"""
+ClickFix Wiki Search Index
+Builds the compact client-side index script.js filters the tools list against
+"""
+
+import re
+import json
+from typing import Dict, List, Any, Iterable, Iterator
+from .models import Technique
+
+SEARCH_INDEX_VERSION = 2
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase alphanumeric tokens (Markdown markup is dropped)"""
+    if not text:
+        return []
+    return _TOKEN_RE.findall(str(text).lower())
+
+def search_record(entry: Technique) -> Dict[str, Any]:
+    """Reduce a Technique to what the client needs to search and filter it"""
+    tokens = set(tokenize(entry.name))
+    for lure in entry.lures:
+        tokens.update(tokenize(lure.nickname))
+        for step in lure.steps:
+            tokens.update(tokenize(step))
+
+    return {
+        'id': entry.id,
+        'name': entry.name or 'Unnamed Tool',
+        'platform': entry.platform_label if entry.platform else '',
+        'presentation': entry.presentation_label if entry.presentation else '',
+        'capabilities': list(entry.capabilities),
+        'terms': " ".join(sorted(tokens))
+    }
+
+# Facets shown as filter groups, with the order known values are listed in
+FACETS = [
+    ('platform', 'Platform', ['Windows', 'Mac', 'Linux']),
+    ('presentation', 'Interface', ['GUI', 'CLI']),
+    ('capability', 'Capabilities', ['UAC', 'MOTW', 'File Explorer'])
+]
+
+def facet_values(record: Dict[str, Any]) -> Dict[str, List[str]]:
+    """The facet values a search record carries"""
+    return {
+        'platform': [record['platform']] if record['platform'] else [],
+        'presentation': [record['presentation']] if record['presentation'] else [],
+        'capability': record['capabilities']
+    }
+
+def build_facets(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Assign a bit to every facet value present in the corpus and count its tools"""
+    counts = {name: {} for name, _, _ in FACETS}
+    for record in records:
+        for name, values in facet_values(record).items():
+            for value in values:
+                counts[name][value] = counts[name].get(value, 0) + 1
+
+    facets = []
+    bit = 0
+    for name, title, preferred in FACETS:
+        present = counts[name]
+        ordered = [value for value in preferred if value in present]
+        ordered += sorted(value for value in present if value not in preferred)
+        values = []
+        for value in ordered:
+            values.append({'name': value, 'bit': bit, 'count': present[value]})
+            bit += 1
+        facets.append({'name': name, 'title': title, 'values': values})
+    return facets
+
+def to_words(bits: Iterable[int], size: int) -> List[int]:
+    """Encode a set of bit positions as a list of 32-bit words"""
+    words = [0] * ((size + 31) // 32)
+    for bit in bits:
+        words[bit >> 5] |= 1 << (bit & 31)
+    return words
+
+def build_search_index(records: Iterable[Dict[str, Any]], facets: List[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Pack search records into column arrays with facet bitsets
+
+    Every facet value owns one bit. Each tool gets a bitmask of its facet values
+    ("masks", one row of 32-bit words per tool) and each facet value gets a posting
+    list encoded as a bitset over tools ("postings"), so the client can filter with
+    AND and count matches per facet value with popcount.
+    """
+    records = list(records)
+    if facets is None:
+        facets = build_facets(records)
+    bit_of = {(facet['name'], value['name']): value['bit'] for facet in facets for value in facet['values']}
+    bit_count = len(bit_of)
+
+    masks = []
+    postings = [[] for _ in range(bit_count)]
+    for tool, record in enumerate(records):
+        bits = [bit_of[(name, value)] for name, values in facet_values(record).items() for value in values]
+        masks.append(to_words(bits, bit_count))
+        for bit in bits:
+            postings[bit].append(tool)
+
+    return {
+        'version': SEARCH_INDEX_VERSION,
+        'facets': [
+            {'name': facet['name'], 'values': [value['name'] for value in facet['values']],
+             'bits': [value['bit'] for value in facet['values']]}
+            for facet in facets
+        ],
+        'bits': bit_count,
+        'ids': [record['id'] for record in records],
+        'names': [record['name'] for record in records],
+        'terms': [record['terms'] for record in records],
+        'masks': masks,
+        'postings': [to_words(tools, len(records)) for tools in postings]
+    }
+
+def iter_search_index_json(records: Iterable[Dict[str, Any]], facets: List[Dict[str, Any]]) -> Iterator[str]:
+    """The compact JSON of build_search_index(records, facets), one column at a time
+
+    records must be re-iterable (a list or a RecordSpill): it is read once per column, so
+    a streaming build never holds every record, or every tool's terms, at once.
+    """
+    def dump(value: Any) -> str:
+        return json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+
+    bit_of = {(facet['name'], value['name']): value['bit'] for facet in facets for value in facet['values']}
+    bit_count = len(bit_of)
+    tool_count = len(records)
+    header = {
+        'version': SEARCH_INDEX_VERSION,
+        'facets': [
+            {'name': facet['name'], 'values': [value['name'] for value in facet['values']],
+             'bits': [value['bit'] for value in facet['values']]}
+            for facet in facets
+        ],
+        'bits': bit_count
+    }
+    yield dump(header)[:-1]
+
+    for column, field in (('ids', 'id'), ('names', 'name'), ('terms', 'terms')):
+        yield f',"{column}":['
+        for tool, record in enumerate(records):
+            yield ("," if tool else "") + dump(record[field])
+        yield "]"
+
+    # Postings are filled in as bitsets directly, one word per 32 tools for each facet value
+    postings = [to_words((), tool_count) for _ in range(bit_count)]
+    yield ',"masks":['
+    for tool, record in enumerate(records):
+        bits = [bit_of[(name, value)] for name, values in facet_values(record).items() for value in values]
+        yield ("," if tool else "") + dump(to_words(bits, bit_count))
+        for bit in bits:
+            postings[bit][tool >> 5] |= 1 << (tool & 31)
+    yield '],"postings":' + dump(postings) + "}"
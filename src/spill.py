@@ -0,0 +1,50 @@
+"""
+ClickFix Wiki Spill Files
+Per-entry records a streaming build writes to disk while rendering and reads back for the index pages
+"""
+
+import json
+import hashlib
+import tempfile
+from typing import Any, Dict, Iterator
+
+class RecordSpill:
+    """An append-only temporary file of JSON records, readable in order as many times as needed
+
+    Stands in for a list of records (append, len, iteration) without holding them: each
+    iteration reads the file again. hexdigest() hashes every record appended so far, so an
+    output depending on the whole sequence can be checked without reading it back.
+    """
+
+    def __init__(self, prefix: str = "records-"):
+        # Deleted on close(), or when the file object is collected if a build fails first
+        self.file = tempfile.NamedTemporaryFile('w+', encoding='utf-8', prefix=prefix, suffix=".jsonl")
+        self.count = 0
+        self.digest = hashlib.sha256()
+
+    def __enter__(self) -> 'RecordSpill':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.file.close()
+
+    def append(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        self.file.write(line)
+        self.digest.update(line.encode('utf-8'))
+        self.count += 1
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        self.file.flush()
+        with open(self.file.name, 'r', encoding='utf-8') as f:
+            for line in f:
+                yield json.loads(line)
+
+    def hexdigest(self) -> str:
+        return self.digest.hexdigest()
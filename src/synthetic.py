@@ -0,0 +1,115 @@
+"""
+ClickFix Wiki Synthetic Corpus
+Generates technique files shaped like techniques/*.yml for build benchmarks
+"""
+
+import random
+import datetime
+import yaml
+from pathlib import Path
+from typing import Dict, List, Any
+
+try:
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeDumper
+
+PLATFORMS = ['windows', 'windows', 'windows', 'mac', 'linux']
+PRESENTATIONS = ['gui', 'cli']
+CAPABILITIES = ['UAC', 'MOTW', 'File Explorer']
+
+NICKNAMES = [
+    "Activate Windows", "Fix Your Computer Settings", "Fix Your Graphics Driver",
+    "Verify You Are Human", "Your Computers Logs are Corrupted", "Update Your Browser",
+    "Repair Network Connection", "Install Missing Fonts", "Confirm Your Identity"
+]
+
+PREAMBLES = [
+    "Activate Windows for free with these steps:",
+    "Your computer settings are incompatible. To continue you must update to the latest settings.",
+    "Your graphics driver is out of date!",
+    "We need to verify that you are not a robot before you can continue."
+]
+
+EPILOGUES = [
+    "Once you have completed the steps you can continue.",
+    "The page will refresh automatically when the fix has been applied.",
+    "If the problem persists, repeat the steps above."
+]
+
+KEY_STEPS = [
+    "Press **Win-R** on your keyboard.",
+    "Press **Win** on your keyboard.",
+    "Press **Ctrl-L** to focus the new window.",
+    "Press **Ctrl-L** to focus the address bar",
+    "Press **Ctrl-V** to paste the desired configuration.",
+    "Press **Ctrl-V** to paste our configuration",
+    "Click **Yes** when prompted",
+    "Press **Alt-A** to activate the \"Action\" menu.",
+    "Press **Enter** to submit."
+]
+
+MITIGATIONS = [
+    "Disable the **Run** dialog with the `NoRun` group policy.",
+    "Block `{tool}` with an application control policy.",
+    "Alert on `{tool}` spawning `powershell.exe` or `mshta.exe`."
+]
+
+CONTRIBUTORS = [
+    {'name': "John Hammond", 'contacts': {'linkedin': "johnhammond", 'twitter': "_johnhammond",
+                                          'youtube': "@_JohnHammond", 'github': "John Hammond"}},
+    {'name': "Jane Analyst", 'handle': "janeanalyst", 'contacts': {'github': "janeanalyst",
+                                                                   'email': "jane@example.com"}},
+    {'name': "Sam Researcher", 'handle': "samr", 'contacts': {'website': "https://example.com/samr"}}
+]
+
+def generate_lure(rng: random.Random, tool: str) -> Dict[str, Any]:
+    """Generate one lure with the optional fields present at realistic rates"""
+    lure: Dict[str, Any] = {'nickname': rng.choice(NICKNAMES)}
+    if rng.random() < 0.3:
+        lure['added_at'] = str(datetime.date(2025, 1, 1) + datetime.timedelta(days=rng.randrange(365)))
+    if rng.random() < 0.3:
+        lure['contributor'] = rng.choice(CONTRIBUTORS)
+    if rng.random() < 0.7:
+        lure['preamble'] = rng.choice(PREAMBLES) + "\n"
+
+    steps = [rng.choice(KEY_STEPS[:2]), f"Type **`{tool}`** and press **Enter**."]
+    steps.extend(rng.sample(KEY_STEPS[2:], rng.randint(2, 5)))
+    lure['steps'] = steps
+
+    if rng.random() < 0.3:
+        lure['epilogue'] = rng.choice(EPILOGUES) + "\n"
+    if rng.random() < 0.8:
+        lure['capabilities'] = sorted(rng.sample(CAPABILITIES, rng.randint(1, len(CAPABILITIES))))
+    if rng.random() < 0.2:
+        lure['references'] = [f"https://example.com/research/{tool}/{rng.randrange(1000)}"]
+    if rng.random() < 0.2:
+        lure['mitigations'] = [text.format(tool=tool) for text in rng.sample(MITIGATIONS, rng.randint(1, 2))]
+    return lure
+
+def generate_technique(rng: random.Random, index: int) -> Dict[str, Any]:
+    """Generate one technique document"""
+    tool = f"tool{index:06d}.exe"
+    technique: Dict[str, Any] = {
+        'name': tool,
+        'added_at': datetime.date(2025, 1, 1) + datetime.timedelta(days=rng.randrange(365)),
+        'platform': rng.choice(PLATFORMS),
+        'presentation': rng.choice(PRESENTATIONS)
+    }
+    if rng.random() < 0.5:
+        technique['info'] = f"`{tool}` is a built-in system utility. It should automatically run with high privileges.\n"
+    technique['lures'] = [generate_lure(rng, tool) for _ in range(rng.randint(1, 4))]
+    return technique
+
+def generate_corpus(target_dir: Path, count: int, seed: int = 0) -> List[Path]:
+    """Write `count` synthetic technique files to target_dir, deterministically for a given seed"""
+    rng = random.Random(seed)
+    target_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for index in range(count):
+        technique = generate_technique(rng, index)
+        path = target_dir / f"{technique['name']}.yml"
+        with open(path, 'w', encoding='utf-8') as f:
+            yaml.dump(technique, f, Dumper=SafeDumper, sort_keys=False, allow_unicode=True)
+        paths.append(path)
+    return paths
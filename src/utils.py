@@ -3,22 +3,140 @@ ClickFix Wiki Utilities
 Common utility functions used across the build system
 """
 
+import os
+import pickle
+import hashlib
 import markdown
-from typing import Dict, Any
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
 
-# Initialize markdown converter with extensions
-_md = markdown.Markdown(extensions=[
+MARKDOWN_EXTENSIONS = [
     'markdown.extensions.fenced_code',
     'markdown.extensions.tables',
     'markdown.extensions.nl2br',
     'markdown.extensions.sane_lists'
-])
+]
+
+# Persisted caches are only reused when produced by the same converter setup
+MARKDOWN_CACHE_VERSION = f"1:{markdown.__version__}:{','.join(MARKDOWN_EXTENSIONS)}"
+
+class MarkdownCache:
+    """Bounded LRU of rendered HTML fragments keyed on a hash of their Markdown source"""
+
+    # Rough per-entry bookkeeping cost (key digest plus dict slot) counted against the budget
+    ENTRY_OVERHEAD = 64
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[bytes, str]" = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(text: str) -> bytes:
+        """Content address for a Markdown source string"""
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+    def get(self, key: bytes) -> Optional[str]:
+        """Return a cached fragment and mark it most recently used"""
+        html = self.entries.get(key)
+        if html is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return html
+
+    def put(self, key: bytes, html: str) -> None:
+        """Store a fragment, evicting least recently used ones to stay within max_bytes"""
+        cost = len(html) + self.ENTRY_OVERHEAD
+        if cost > self.max_bytes:
+            return
+        if key in self.entries:
+            self.size -= len(self.entries.pop(key)) + self.ENTRY_OVERHEAD
+        self.entries[key] = html
+        self.size += cost
+        while self.size > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted) + self.ENTRY_OVERHEAD
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every cached fragment"""
+        self.entries.clear()
+        self.size = 0
+
+    def load(self, cache_path: Path) -> None:
+        """Merge fragments persisted by a previous build"""
+        try:
+            with open(cache_path, 'rb') as f:
+                data = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get('version') != MARKDOWN_CACHE_VERSION:
+            return
+        for key, html in data.get('entries', []):
+            self.put(key, html)
+
+    def save(self, cache_path: Path) -> None:
+        """Persist the cached fragments, least recently used first"""
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(cache_path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'version': MARKDOWN_CACHE_VERSION, 'entries': list(self.entries.items())},
+                        f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+
+# Initialize markdown converter with extensions
+_md = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+_cache = MarkdownCache()
+
+# Number of Markdown conversions performed by this process
+_conversion_count = 0
+
+def reset_markdown_converter() -> None:
+    """Replace the shared converter with a fresh instance (used by worker processes)"""
+    global _md
+    _md = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+
+def get_markdown_cache() -> MarkdownCache:
+    """The fragment cache in front of render_markdown"""
+    return _cache
+
+def configure_markdown_cache(max_bytes: int) -> MarkdownCache:
+    """Install a fresh fragment cache with the given budget (0 disables caching)"""
+    global _cache
+    _cache = MarkdownCache(max_bytes)
+    return _cache
 
 def render_markdown(text: str) -> str:
-    """Convert markdown text to HTML"""
+    """Convert markdown text to HTML, reusing the rendering of identical fragments"""
+    global _conversion_count
     if not text:
         return ""
-    return _md.convert(text)
+    key = _cache.key(text)
+    html = _cache.get(key)
+    if html is None:
+        _conversion_count += 1
+        html = _md.convert(text)
+        # Reset so state from this document cannot leak into the next conversion
+        _md.reset()
+        _cache.put(key, html)
+    return html
+
+def get_markdown_stats() -> Dict[str, int]:
+    """Report how much Markdown rendering this process has done"""
+    return {
+        'conversions': _conversion_count,
+        'cache_hits': _cache.hits,
+        'cache_misses': _cache.misses,
+        'cache_evictions': _cache.evictions,
+        'cache_entries': len(_cache.entries),
+        'cache_bytes': _cache.size
+    }
 
 def format_platform(platform: str) -> str:
     """Format platform for display (title case)"""
@@ -32,6 +150,9 @@ def format_presentation(presentation: str) -> str:
         return "Unknown"
     return presentation.upper()
 
+# Contact platforms get_contact_url can link to (anything else links to "#")
+CONTACT_PLATFORMS = ('linkedin', 'twitter', 'youtube', 'github', 'email', 'website')
+
 def get_contact_url(platform: str, value: str) -> str:
     """Generate contact URL for different platforms"""
     if platform == 'linkedin':
@@ -48,10 +169,3 @@ def get_contact_url(platform: str, value: str) -> str:
         return value
     else:
         return "#"
-
-def get_all_capabilities(entry: Dict[str, Any]) -> set:
-    """Get all capabilities from all lures in an entry"""
-    all_capabilities = set()
-    for lure in entry.get('lures', []):
-        all_capabilities.update(lure.get('capabilities', []))
-    return all_capabilities 
\ No newline at end of file
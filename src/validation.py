@@ -0,0 +1,233 @@
+"""
+ClickFix Wiki Technique Validation
+Checks technique files against the corpus schema and reports every problem with its file and line
+"""
+
+import os
+import datetime
+import yaml
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+from .cache import ParseCache, SafeLoader, load_yaml
+from .manifest import hash_modules
+from .search import FACETS
+from .utils import CONTACT_PLATFORMS, format_platform, format_presentation
+
+# Changes with the schema, the checks and the values they accept (facets in src/search.py), so cached results are not reused
+VALIDATION_VERSION = hash_modules("validation", "cache", "search", "utils")
+
+# Field -> (accepted types, required); a null value counts as absent
+TECHNIQUE_FIELDS = {
+    'name': (str, True),
+    'added_at': ((datetime.date, str), True),
+    'platform': (str, True),
+    'presentation': (str, True),
+    'info': (str, False),
+    'lures': (list, True)
+}
+LURE_FIELDS = {
+    'nickname': (str, True),
+    'added_at': ((datetime.date, str), False),
+    'contributor': (dict, False),
+    'preamble': (str, False),
+    'steps': (list, True),
+    'epilogue': (str, False),
+    'capabilities': (list, False),
+    'references': (list, False),
+    'mitigations': (list, False)
+}
+CONTRIBUTOR_FIELDS = {
+    'name': (str, True),
+    'handle': (str, False),
+    'contacts': (dict, False)
+}
+
+# Facet values the site has filters (and icons) for, as displayed
+ALLOWED_VALUES = {name: values for name, _, values in FACETS}
+
+# Below this many files, starting worker processes costs more than it saves
+PARALLEL_MIN_FILES = 64
+
+@dataclass(frozen=True, slots=True)
+class Issue:
+    path: str
+    line: int
+    column: int
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.path}:{self.line}:{self.column}: {self.message}"
+
+# A problem found in parsed data: (path of keys and indexes, whether it is about the key itself, message)
+Problem = Tuple[Tuple[Any, ...], bool, str]
+
+def _type_name(types: Any) -> str:
+    names = {str: "a string", list: "a list", dict: "a mapping", datetime.date: "a date (YYYY-MM-DD)"}
+    if isinstance(types, tuple):
+        # Dates may also be written as quoted strings
+        return names[datetime.date] if datetime.date in types else " or ".join(names[t] for t in types)
+    return names[types]
+
+def check_fields(data: Dict[Any, Any], fields: Dict[str, Tuple[Any, bool]], path: Tuple[Any, ...],
+                 problems: List[Problem]) -> Dict[str, Any]:
+    """Report unknown, missing and mistyped fields; return the fields that are present and well typed"""
+    for key in data:
+        if key not in fields:
+            problems.append((path + (key,), True, f"unknown field '{key}'"))
+    present = {}
+    for key, (types, required) in fields.items():
+        value = data.get(key)
+        if value is None or value == '':
+            if required:
+                problems.append((path, False, f"missing required field '{key}'"))
+        elif not isinstance(value, types):
+            problems.append((path + (key,), False, f"'{key}' must be {_type_name(types)}"))
+        else:
+            present[key] = value
+    return present
+
+def check_date(value: Any, path: Tuple[Any, ...], problems: List[Problem]) -> None:
+    if isinstance(value, str):
+        try:
+            datetime.date.fromisoformat(value)
+        except ValueError:
+            problems.append((path, False, f"'{value}' is not a date (YYYY-MM-DD)"))
+
+def check_texts(values: List[Any], path: Tuple[Any, ...], problems: List[Problem],
+                allowed: List[str] = None, label: str = None) -> None:
+    """Every item must be a non-empty string (and, given allowed, one of those labelled values)"""
+    for index, value in enumerate(values):
+        if not isinstance(value, str) or not value.strip():
+            problems.append((path + (index,), False, f"'{path[-1]}' items must be non-empty strings"))
+        elif allowed is not None and value not in allowed:
+            problems.append((path + (index,), False,
+                             f"unknown {label} '{value}' (expected one of: {', '.join(allowed)})"))
+
+def check_contributor(contributor: Dict[Any, Any], path: Tuple[Any, ...], problems: List[Problem]) -> None:
+    fields = check_fields(contributor, CONTRIBUTOR_FIELDS, path, problems)
+    for platform, value in fields.get('contacts', {}).items():
+        if platform not in CONTACT_PLATFORMS:
+            problems.append((path + ('contacts', platform), True,
+                             f"unknown contact platform '{platform}' (expected one of: {', '.join(CONTACT_PLATFORMS)})"))
+        elif not isinstance(value, str) or not value.strip():
+            problems.append((path + ('contacts', platform), False, f"contact '{platform}' must be a non-empty string"))
+
+def check_lure(lure: Any, path: Tuple[Any, ...], problems: List[Problem]) -> None:
+    if not isinstance(lure, dict):
+        problems.append((path, False, "a lure must be a mapping of fields"))
+        return
+    fields = check_fields(lure, LURE_FIELDS, path, problems)
+    if 'added_at' in fields:
+        check_date(fields['added_at'], path + ('added_at',), problems)
+    if 'steps' in fields:
+        check_texts(fields['steps'], path + ('steps',), problems)
+    if 'capabilities' in fields:
+        check_texts(fields['capabilities'], path + ('capabilities',), problems,
+                    ALLOWED_VALUES['capability'], 'capability')
+    for field in ('references', 'mitigations'):
+        if field in fields:
+            check_texts(fields[field], path + (field,), problems)
+    if 'contributor' in fields:
+        check_contributor(fields['contributor'], path + ('contributor',), problems)
+
+def check_technique(data: Any) -> List[Problem]:
+    """Every way a parsed technique document departs from the schema"""
+    problems: List[Problem] = []
+    if not isinstance(data, dict):
+        return [((), False, "a technique must be a mapping of fields")]
+    fields = check_fields(data, TECHNIQUE_FIELDS, (), problems)
+    if 'added_at' in fields:
+        check_date(fields['added_at'], ('added_at',), problems)
+    for field, label in (('platform', format_platform), ('presentation', format_presentation)):
+        if field in fields and label(fields[field]) not in ALLOWED_VALUES[field]:
+            problems.append(((field,), False, f"unknown {field} '{fields[field]}' "
+                                              f"(expected one of: {', '.join(ALLOWED_VALUES[field])})"))
+    for index, lure in enumerate(fields.get('lures', [])):
+        check_lure(lure, ('lures', index), problems)
+    return problems
+
+def locate(node: yaml.Node, path: Tuple[Any, ...], at_key: bool = False) -> yaml.Node:
+    """The node a data path leads to (or its key node), or the deepest node on the way"""
+    for position, part in enumerate(path):
+        if isinstance(node, yaml.MappingNode):
+            for key_node, value_node in node.value:
+                if key_node.value == str(part):
+                    if at_key and position == len(path) - 1:
+                        return key_node
+                    node = value_node
+                    break
+            else:
+                return node
+        elif isinstance(node, yaml.SequenceNode) and isinstance(part, int) and part < len(node.value):
+            node = node.value[part]
+        else:
+            return node
+    return node
+
+def validate_file(file_path: Path) -> List[Issue]:
+    """Check one technique file; problems are located by composing the YAML again, only when there are any"""
+    name = str(file_path)
+    try:
+        with open(file_path, 'rb') as f:
+            data = load_yaml(f)
+    except OSError as e:
+        return [Issue(name, 1, 1, f"cannot read file: {e.strerror or e}")]
+    except yaml.MarkedYAMLError as e:
+        mark = e.problem_mark or e.context_mark
+        return [Issue(name, mark.line + 1, mark.column + 1, f"invalid YAML: {e.problem or e.context}")]
+    except yaml.YAMLError as e:
+        return [Issue(name, 1, 1, f"invalid YAML: {e}")]
+
+    problems = check_technique(data)
+    if not problems:
+        return []
+    with open(file_path, 'rb') as f:
+        root = yaml.compose(f, Loader=SafeLoader)
+    issues = []
+    for path, at_key, message in problems:
+        if root is None:
+            # An empty document has nothing to point at
+            issues.append(Issue(name, 1, 1, message))
+            continue
+        mark = locate(root, path, at_key).start_mark
+        issues.append(Issue(name, mark.line + 1, mark.column + 1, message))
+    return sorted(issues, key=lambda issue: (issue.line, issue.column))
+
+def validate_files(file_paths: Iterable[Path], jobs: int = None, cache: ParseCache = None) -> List[Issue]:
+    """Check technique files across jobs processes (all cores by default); return every issue, by file
+
+    With a cache, files unchanged since they were last checked are not read again.
+    """
+    file_paths = list(file_paths)
+    results: Dict[Path, List[Issue]] = {}
+    pending = []
+    for file_path in file_paths:
+        if cache is None:
+            pending.append((file_path, None))
+            continue
+        try:
+            stat, found, issues = cache.lookup(file_path)
+        except OSError:
+            # Missing or unreadable: reported by validate_file, and never cached
+            results[file_path] = validate_file(file_path)
+            continue
+        if found:
+            results[file_path] = issues
+        else:
+            pending.append((file_path, stat))
+
+    jobs = jobs or os.cpu_count() or 1
+    paths = [file_path for file_path, _ in pending]
+    if jobs <= 1 or len(paths) < PARALLEL_MIN_FILES:
+        checked = [validate_file(file_path) for file_path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            checked = list(executor.map(validate_file, paths, chunksize=max(1, len(paths) // (jobs * 4))))
+    for (file_path, stat), issues in zip(pending, checked):
+        results[file_path] = issues
+        if cache is not None:
+            cache.store(file_path, stat, issues)
+
+    return [issue for file_path in sorted(file_paths) for issue in results[file_path]]
@@ -0,0 +1,172 @@
+"""
+ClickFix Wiki File Watcher
+Reports changed source files via inotify on Linux, falling back to polling elsewhere
+"""
+
+import os
+import time
+import ctypes
+import ctypes.util
+import select
+import struct
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+# inotify event flags (see inotify(7))
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+              IN_CREATE | IN_DELETE | IN_DELETE_SELF)
+
+_EVENT = struct.Struct('iIII')
+
+# (directory, recursive) pairs to watch
+WatchRoots = List[Tuple[Path, bool]]
+
+# Reported instead of paths when changes were missed (the inotify queue overflowed): anything may have changed
+RESCAN = Path("<rescan>")
+
+class InotifyWatcher:
+    """Directory watches through the Linux inotify API, called with ctypes"""
+
+    def __init__(self, roots: WatchRoots):
+        libc_name = ctypes.util.find_library('c')
+        if libc_name is None:
+            raise OSError("libc not found")
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self.libc, 'inotify_init1'):
+            raise OSError("inotify is not available")
+
+        self.fd = self.libc.inotify_init1(IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches: Dict[int, Tuple[Path, bool]] = {}
+        self.roots = roots
+        for directory, recursive in roots:
+            self.add_watch(directory, recursive)
+
+    def add_watch(self, directory: Path, recursive: bool) -> None:
+        """Watch a directory, and every directory below it when recursive"""
+        if not directory.is_dir():
+            return
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(str(directory)), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        self.watches[wd] = (directory, recursive)
+        if recursive:
+            for child in directory.iterdir():
+                if child.is_dir():
+                    self.add_watch(child, True)
+
+    def read(self, timeout: float = None) -> Set[Path]:
+        """Paths changed since the last call, waiting up to timeout seconds (forever if None)
+
+        Includes RESCAN if the kernel dropped events.
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        data = os.read(self.fd, 64 * 1024)
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped, so the paths that did arrive are not the whole story
+                changed.add(RESCAN)
+                continue
+            watch = self.watches.get(wd)
+            if watch is None:
+                continue
+            directory, recursive = watch
+            if mask & IN_DELETE_SELF:
+                del self.watches[wd]
+                continue
+            path = directory / os.fsdecode(name)
+            if mask & IN_ISDIR:
+                if recursive and mask & (IN_CREATE | IN_MOVED_TO):
+                    self.add_watch(path, True)
+                continue
+            changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+class PollingWatcher:
+    """Portable fallback that compares file mtimes and sizes every interval seconds"""
+
+    def __init__(self, roots: WatchRoots, interval: float = 0.5):
+        self.roots = roots
+        self.interval = interval
+        self.snapshot = self.scan()
+
+    def scan(self) -> Dict[Path, Tuple[int, int]]:
+        """Stat every watched file"""
+        snapshot = {}
+        for directory, recursive in self.roots:
+            if not directory.is_dir():
+                continue
+            for path in (directory.rglob("*") if recursive else directory.iterdir()):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                if path.is_file():
+                    snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def read(self, timeout: float = None) -> Set[Path]:
+        """Paths changed since the last call, waiting up to timeout seconds (forever if None)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.interval if deadline is None else min(self.interval, max(0.0, deadline - time.monotonic()))
+            time.sleep(wait)
+            snapshot = self.scan()
+            changed = {path for path in snapshot.keys() | self.snapshot.keys()
+                       if snapshot.get(path) != self.snapshot.get(path)}
+            self.snapshot = snapshot
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self) -> None:
+        pass
+
+def create_watcher(roots: WatchRoots, polling: bool = False):
+    """Watch with inotify where available, polling otherwise"""
+    if not polling:
+        try:
+            return InotifyWatcher(roots)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(roots)
+
+def wait_for_changes(watcher, debounce: float = 0.05) -> Set[Path]:
+    """Block until something changes, then keep collecting until it has been quiet for debounce seconds
+
+    Editors and git checkouts touch several files (or one file several times) in a burst;
+    this turns each burst into a single rebuild.
+    """
+    changed: Set[Path] = set()
+    while not changed:
+        changed = watcher.read(None)
+    while True:
+        more = watcher.read(debounce)
+        if not more:
+            return changed
+        changed |= more